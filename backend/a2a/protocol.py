@@ -3,10 +3,25 @@ Agent-to-Agent (A2A) Messaging Protocol
 """
 
 import uuid
-from datetime import datetime
-from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
 from enum import Enum
-from pydantic import BaseModel
+import orjson
+import ormsgpack
+from pydantic import BaseModel, ConfigDict
+
+
+def _default(obj: Any) -> Any:
+    """Serialize values orjson does not handle natively"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, (Decimal, Path)):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
 
 
 class MessageType(str, Enum):
@@ -18,17 +33,25 @@ class MessageType(str, Enum):
     ERROR = "ERROR"
 
 
+# Messages and payloads are immutable value objects once created
+_FROZEN = ConfigDict(frozen=True, extra="forbid")
+
+
 class A2AMessage(BaseModel):
     """A2A message envelope"""
 
-    message_id: str
+    model_config = _FROZEN
+
+    # UUID/datetime are kept as objects and formatted natively by orjson
+    message_id: uuid.UUID
     type: MessageType
     from_agent: str
     to_agent: str
-    timestamp: str
-    trace_id: str
+    timestamp: datetime
+    trace_id: Union[uuid.UUID, str]
     payload: Dict[str, Any]
     signature: Optional[str] = None
+    encoding: str = "json"  # json or msgpack
 
     @classmethod
     def create(
@@ -38,31 +61,61 @@ class A2AMessage(BaseModel):
         to_agent: str,
         payload: Dict[str, Any],
         trace_id: Optional[str] = None,
+        encoding: str = "json",
     ) -> "A2AMessage":
-        """Create a new A2A message"""
-        return cls(
-            message_id=str(uuid.uuid4()),
+        """Create a new A2A message (fields are trusted, validation is skipped)"""
+        return cls.model_construct(
+            message_id=uuid.uuid4(),
             type=msg_type,
             from_agent=from_agent,
             to_agent=to_agent,
-            timestamp=datetime.utcnow().isoformat() + "Z",
-            trace_id=trace_id or str(uuid.uuid4()),
+            timestamp=datetime.now(timezone.utc),
+            trace_id=trace_id or uuid.uuid4(),
             payload=payload,
+            encoding=encoding,
         )
 
     def to_json(self) -> str:
         """Convert to JSON string"""
-        return self.model_dump_json()
+        return self.to_json_bytes().decode()
+
+    def to_json_bytes(self) -> bytes:
+        """Convert to UTF-8 encoded JSON bytes"""
+        return orjson.dumps(
+            self.model_dump(), default=_default, option=orjson.OPT_UTC_Z
+        )
 
     @classmethod
     def from_json(cls, json_str: str) -> "A2AMessage":
         """Create from JSON string"""
-        return cls.model_validate_json(json_str)
+        return cls.model_validate(orjson.loads(json_str))
+
+    @classmethod
+    def from_json_bytes(cls, raw: bytes) -> "A2AMessage":
+        """Create from UTF-8 encoded JSON bytes without decoding to str"""
+        return cls.model_validate(orjson.loads(raw))
+
+    def encode(self) -> bytes:
+        """Serialize using the message's negotiated encoding"""
+        if self.encoding == "msgpack":
+            return ormsgpack.packb(
+                self.model_dump(), default=_default, option=ormsgpack.OPT_UTC_Z
+            )
+        return self.to_json_bytes()
+
+    @classmethod
+    def decode(cls, raw: bytes, encoding: str = "json") -> "A2AMessage":
+        """Deserialize bytes produced by encode()"""
+        if encoding == "msgpack":
+            return cls.model_validate(ormsgpack.unpackb(raw))
+        return cls.from_json_bytes(raw)
 
 
 class TaskRequest(BaseModel):
     """Payload for TASK_REQUEST"""
 
+    model_config = _FROZEN
+
     task_id: str
     tool_id: str
     inputs: Dict[str, Any]
@@ -72,6 +125,8 @@ class TaskRequest(BaseModel):
 class TaskStatus(BaseModel):
     """Payload for TASK_STATUS"""
 
+    model_config = _FROZEN
+
     task_id: str
     status: str  # queued, running, completed, failed, paused
     progress: Optional[float] = None  # 0.0 to 1.0
@@ -82,6 +137,8 @@ class TaskStatus(BaseModel):
 class TaskResult(BaseModel):
     """Payload for TASK_RESULT"""
 
+    model_config = _FROZEN
+
     task_id: str
     status: str  # completed or failed
     outputs: Optional[Dict[str, Any]] = None
@@ -92,6 +149,8 @@ class TaskResult(BaseModel):
 class ApprovalRequest(BaseModel):
     """Payload for APPROVAL_REQUEST"""
 
+    model_config = _FROZEN
+
     task_id: str
     reason: str
     artifacts: list = []
@@ -102,6 +161,8 @@ class ApprovalRequest(BaseModel):
 class ApprovalResponse(BaseModel):
     """Payload for APPROVAL_RESPONSE"""
 
+    model_config = _FROZEN
+
     task_id: str
     approver_id: str
     decision: bool  # True = approve, False = reject
@@ -117,7 +178,13 @@ def create_task_request(
     trace_id: Optional[str] = None,
 ) -> A2AMessage:
     """Helper to create TASK_REQUEST message"""
-    payload = TaskRequest(task_id=task_id, tool_id=tool_id, inputs=inputs).model_dump()
+    # Plain dict mirroring TaskRequest; avoids a validate/dump cycle per message
+    payload = {
+        "task_id": task_id,
+        "tool_id": tool_id,
+        "inputs": inputs,
+        "metadata": {},
+    }
 
     return A2AMessage.create(
         msg_type=MessageType.TASK_REQUEST,
@@ -138,9 +205,14 @@ def create_task_status(
     trace_id: Optional[str] = None,
 ) -> A2AMessage:
     """Helper to create TASK_STATUS message"""
-    payload = TaskStatus(
-        task_id=task_id, status=status, progress=progress, message=message
-    ).model_dump()
+    # Plain dict mirroring TaskStatus
+    payload = {
+        "task_id": task_id,
+        "status": status,
+        "progress": progress,
+        "message": message,
+        "logs": None,
+    }
 
     return A2AMessage.create(
         msg_type=MessageType.TASK_STATUS,
@@ -159,11 +231,17 @@ def create_task_result(
     outputs: Optional[Dict[str, Any]] = None,
     error: Optional[str] = None,
     trace_id: Optional[str] = None,
+    encoding: str = "json",
 ) -> A2AMessage:
     """Helper to create TASK_RESULT message"""
-    payload = TaskResult(
-        task_id=task_id, status=status, outputs=outputs, error=error
-    ).model_dump()
+    # Plain dict mirroring TaskResult
+    payload = {
+        "task_id": task_id,
+        "status": status,
+        "outputs": outputs,
+        "error": error,
+        "artifacts": [],
+    }
 
     return A2AMessage.create(
         msg_type=MessageType.TASK_RESULT,
@@ -171,4 +249,5 @@ def create_task_result(
         to_agent=to_agent,
         payload=payload,
         trace_id=trace_id,
+        encoding=encoding,
     )
@@ -2,88 +2,536 @@
 Redis Streams Transport for A2A Messages
 """
 
+import asyncio
 import redis
+import redis.asyncio as aioredis
 import logging
-from typing import Callable
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
 from .protocol import A2AMessage
 
 logger = logging.getLogger(__name__)
 
+# Single-byte markers stored next to each envelope so readers know its encoding
+_ENCODING_MARKERS = {"json": b"j", "msgpack": b"m"}
+_MARKER_ENCODINGS = {marker: name for name, marker in _ENCODING_MARKERS.items()}
+
+# Pending entries idle this long are presumed orphaned by a dead consumer and
+# reclaimed. Entries still being handled are kept from going idle, but a
+# synchronous handler can't be, so this must exceed the longest tool run.
+CLAIM_MIN_IDLE_MS = int(os.getenv("A2A_CLAIM_MIN_IDLE_MS", "600000"))
+
+# Entries delivered this many times without an ack are dead-lettered
+MAX_DELIVERIES = int(os.getenv("A2A_MAX_DELIVERIES", "5"))
+
+# Connection pools shared by every transport in the process, keyed by URL
+_POOLS: Dict[str, redis.ConnectionPool] = {}
+
+
+def _get_pool(redis_url: str) -> redis.ConnectionPool:
+    """Return the process-wide connection pool for a Redis URL"""
+    pool = _POOLS.get(redis_url)
+    if pool is None:
+        pool = redis.ConnectionPool.from_url(redis_url, max_connections=64)
+        _POOLS[redis_url] = pool
+    return pool
+
+
+def _exhausted_ids(pending: list, max_deliveries: int, skip=()) -> list:
+    """Ids in an XPENDING range that were delivered max_deliveries times"""
+    return [
+        entry["message_id"]
+        for entry in pending
+        if entry["times_delivered"] >= max_deliveries
+        and entry["message_id"] not in skip
+    ]
+
 
 class RedisA2ATransport:
     """Redis Streams-based A2A message transport"""
 
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
-        self.redis_client = redis.from_url(redis_url, decode_responses=True)
+    _shared: Optional["RedisA2ATransport"] = None
+
+    def __init__(self, redis_url: Optional[str] = None, max_stream_len: int = 100_000):
+        redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379")
+        self.redis_url = redis_url
+        # Streams are trimmed approximately (MAXLEN ~) on every XADD
+        self.max_stream_len = max_stream_len
+        # Envelopes are stored as raw bytes and parsed by orjson directly
+        self.redis_client = redis.Redis(connection_pool=_get_pool(redis_url))
+        # asyncio client for coroutine callers, created on first use in the loop
+        self._aio_client: Optional[aioredis.Redis] = None
         self.running = False
+        self._stream_key_cache: Dict[str, bytes] = {}
+
+    @classmethod
+    def shared(cls) -> "RedisA2ATransport":
+        """Process-wide transport for callers that don't subscribe"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def _key(self, agent_id: str) -> bytes:
+        """Return the (memoized) stream key for an agent"""
+        key = self._stream_key_cache.get(agent_id)
+        if key is None:
+            key = f"agents:{agent_id}".encode()
+            self._stream_key_cache[agent_id] = key
+        return key
+
+    @staticmethod
+    def _fields(message: A2AMessage) -> Dict[bytes, bytes]:
+        """Stream entry fields for a message"""
+        return {
+            b"enc": _ENCODING_MARKERS.get(message.encoding, b"j"),
+            b"message": message.encode(),
+        }
 
     def publish(self, message: A2AMessage) -> bool:
         """Publish message to agent's stream"""
         try:
-            stream_name = f"agents:{message.to_agent}"
-            message_data = {"message": message.to_json()}
+            stream_name = self._key(message.to_agent)
+            self.redis_client.xadd(
+                stream_name,
+                self._fields(message),
+                maxlen=self.max_stream_len,
+                approximate=True,
+            )
+            logger.info(f"Published {message.type} to agents:{message.to_agent}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to publish message: {e}")
+            return False
 
-            self.redis_client.xadd(stream_name, message_data)
-            logger.info(f"Published {message.type} to {stream_name}")
+    async def publish_async(self, message: A2AMessage) -> bool:
+        """publish() for coroutines: the XADD doesn't block the event loop"""
+        try:
+            await self._async_client().xadd(
+                self._key(message.to_agent),
+                self._fields(message),
+                maxlen=self.max_stream_len,
+                approximate=True,
+            )
+            logger.info(f"Published {message.type} to agents:{message.to_agent}")
             return True
         except Exception as e:
             logger.error(f"Failed to publish message: {e}")
             return False
 
+    def _async_client(self) -> aioredis.Redis:
+        """The transport's asyncio client, created on first use in the loop"""
+        if self._aio_client is None:
+            self._aio_client = aioredis.Redis.from_url(self.redis_url)
+        return self._aio_client
+
+    async def stash_message(self, key: str, message: A2AMessage, ttl_s: int):
+        """Park a message under key (shared by every worker) for up to ttl_s"""
+        pipe = self._async_client().pipeline(transaction=True)
+        pipe.hset(key, mapping=self._fields(message))
+        pipe.expire(key, ttl_s)
+        await pipe.execute()
+
+    async def take_message(self, key: str) -> Optional[A2AMessage]:
+        """
+        Atomically fetch and remove a message parked by stash_message
+        Only one caller gets it, whichever worker that is; None if absent.
+        """
+        pipe = self._async_client().pipeline(transaction=True)
+        pipe.hgetall(key)
+        pipe.delete(key)
+        fields, _ = await pipe.execute()
+        return self._decode_entry(fields)
+
+    def publish_many(self, messages: List[A2AMessage]) -> bool:
+        """Publish several messages in a single pipelined round-trip"""
+        if not messages:
+            return True
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for message in messages:
+                pipe.xadd(
+                    self._key(message.to_agent),
+                    self._fields(message),
+                    maxlen=self.max_stream_len,
+                    approximate=True,
+                )
+            pipe.execute()
+            logger.info(f"Published {len(messages)} messages")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to publish messages: {e}")
+            return False
+
     def subscribe(
         self,
         agent_id: str,
         handler: Callable[[A2AMessage], None],
         consumer_group: str = "default",
+        batch_size: int = 256,
+        block_ms: int = 100,
+        noack: bool = False,
+        consumer_name: Optional[str] = None,
+        claim_min_idle_ms: int = CLAIM_MIN_IDLE_MS,
+        max_deliveries: int = MAX_DELIVERIES,
     ):
-        """Subscribe to messages for an agent"""
-        stream_name = f"agents:{agent_id}"
-        consumer_name = f"{agent_id}-consumer"
+        """
+        Subscribe to messages for an agent
+
+        Up to batch_size entries are read per XREADGROUP call and the
+        successfully handled ones are acknowledged in a single pipeline.
+        With noack=True, entries are never added to the pending list, which
+        is only safe for idempotent handlers.
+
+        Several consumers with distinct consumer_name values can share the
+        same consumer_group; Redis hands each of them a disjoint subset of
+        the stream. Entries left pending for longer than claim_min_idle_ms
+        (e.g. by a crashed consumer) are reclaimed with XAUTOCLAIM, and
+        dead-lettered once they have been delivered max_deliveries times.
+        """
+        stream_name = self._key(agent_id)
+        consumer_name = consumer_name or f"{agent_id}-consumer"
 
         # Create consumer group if it doesn't exist
         try:
             self.redis_client.xgroup_create(
-                stream_name, consumer_group, id="0", mkstream=True
+                stream_name, consumer_group, id=b"0", mkstream=True
             )
         except redis.exceptions.ResponseError as e:
             if "BUSYGROUP" not in str(e):
                 logger.error(f"Failed to create consumer group: {e}")
 
-        logger.info(f"Subscribed to {stream_name}")
+        logger.info(f"Subscribed to agents:{agent_id} as {consumer_name}")
         self.running = True
+        claim_interval = claim_min_idle_ms / 1000
+        last_claim = time.monotonic()
+        claim_cursor = b"0-0"
 
         while self.running:
             try:
+                # Reclaim entries stuck with dead consumers, resuming the
+                # scan of the pending list where the last call stopped
+                if not noack and time.monotonic() - last_claim >= claim_interval:
+                    last_claim = time.monotonic()
+                    pending = self.redis_client.xpending_range(
+                        stream_name,
+                        consumer_group,
+                        min=claim_cursor,
+                        max=b"+",
+                        count=batch_size,
+                        idle=claim_min_idle_ms,
+                    )
+                    exhausted = _exhausted_ids(pending, max_deliveries)
+                    if exhausted:
+                        self._dead_letter_ids(stream_name, consumer_group, exhausted)
+                    claimed = self.redis_client.xautoclaim(
+                        stream_name,
+                        consumer_group,
+                        consumer_name,
+                        min_idle_time=claim_min_idle_ms,
+                        start_id=claim_cursor,
+                        count=batch_size,
+                    )
+                    claim_cursor = claimed[0]
+                    if claimed[1]:
+                        logger.info(f"Reclaimed {len(claimed[1])} pending messages")
+                        self._handle_entries(
+                            stream_name,
+                            consumer_group,
+                            consumer_name,
+                            claimed[1],
+                            handler,
+                            noack,
+                            claim_min_idle_ms,
+                        )
+
                 # Read messages
                 messages = self.redis_client.xreadgroup(
                     consumer_group,
                     consumer_name,
                     {stream_name: ">"},
-                    count=10,
-                    block=1000,
+                    count=batch_size,
+                    block=block_ms,
+                    noack=noack,
                 )
 
                 for stream, msg_list in messages:
-                    for msg_id, msg_data in msg_list:
-                        try:
-                            # Parse message
-                            message_json = msg_data.get("message")
-                            if message_json:
-                                message = A2AMessage.from_json(message_json)
-
-                                # Handle message
-                                handler(message)
-
-                                # Acknowledge message
-                                self.redis_client.xack(
-                                    stream_name, consumer_group, msg_id
-                                )
-                        except Exception as e:
-                            logger.error(f"Error processing message: {e}")
+                    self._handle_entries(
+                        stream_name,
+                        consumer_group,
+                        consumer_name,
+                        msg_list,
+                        handler,
+                        noack,
+                        claim_min_idle_ms,
+                    )
 
             except Exception as e:
                 logger.error(f"Error reading from stream: {e}")
 
+    def _handle_entries(
+        self,
+        stream_name: bytes,
+        consumer_group: str,
+        consumer_name: str,
+        entries: list,
+        handler: Callable[[A2AMessage], None],
+        noack: bool,
+        claim_min_idle_ms: int,
+    ):
+        """
+        Decode and handle stream entries, then ack them in one pipeline
+        Entries that can't be decoded are dead-lettered and acked rather than
+        left pending; entries whose handler raised stay pending for a retry.
+        Entries still waiting their turn in the batch are periodically
+        re-claimed (JUSTID) so other consumers don't see them as idle.
+        """
+        acked = []
+        dead = []
+        keepalive_s = claim_min_idle_ms / 3000
+        last_keepalive = time.monotonic()
+        for i, (msg_id, msg_data) in enumerate(entries):
+            if not noack and time.monotonic() - last_keepalive >= keepalive_s:
+                last_keepalive = time.monotonic()
+                self.redis_client.xclaim(
+                    stream_name,
+                    consumer_group,
+                    consumer_name,
+                    min_idle_time=0,
+                    message_ids=[entry_id for entry_id, _ in entries[i:]],
+                    justid=True,
+                )
+            message = self._try_decode(msg_id, msg_data)
+            if message is None:
+                dead.append((msg_id, msg_data))
+                continue
+            try:
+                handler(message)
+                acked.append(msg_id)
+            except Exception as e:
+                logger.error(f"Error processing message: {e}")
+
+        # Acknowledge handled messages in one round-trip
+        if acked or dead:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for _, msg_data in dead:
+                self._queue_dead_letter(pipe, stream_name, msg_data)
+            if not noack:
+                for msg_id in acked + [msg_id for msg_id, _ in dead]:
+                    pipe.xack(stream_name, consumer_group, msg_id)
+            pipe.execute()
+
+    def _try_decode(self, msg_id, msg_data) -> Optional[A2AMessage]:
+        """Decode an entry, logging (and returning None) when it can't be"""
+        try:
+            message = self._decode_entry(msg_data)
+        except Exception as e:
+            logger.error(f"Undecodable message {msg_id!r}: {e}")
+            return None
+        if message is None:
+            logger.warning(f"Dead-lettering empty or trimmed message {msg_id!r}")
+        return message
+
+    def _dead_letter_ids(self, stream_name: bytes, consumer_group: str, msg_ids):
+        """Move entries that exhausted their deliveries to the :dead stream"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for msg_id in msg_ids:
+            pipe.xrange(stream_name, msg_id, msg_id)
+        found = pipe.execute()
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for msg_id, matches in zip(msg_ids, found):
+            if matches:
+                self._queue_dead_letter(pipe, stream_name, matches[0][1])
+            pipe.xack(stream_name, consumer_group, msg_id)
+        pipe.execute()
+        logger.warning(f"Dead-lettered {len(msg_ids)} messages out of retries")
+
+    async def _dead_letter_ids_async(
+        self, client: aioredis.Redis, stream_name: bytes, consumer_group: str, msg_ids
+    ):
+        """_dead_letter_ids for the asyncio subscriber"""
+        pipe = client.pipeline(transaction=False)
+        for msg_id in msg_ids:
+            pipe.xrange(stream_name, msg_id, msg_id)
+        found = await pipe.execute()
+
+        pipe = client.pipeline(transaction=False)
+        for msg_id, matches in zip(msg_ids, found):
+            if matches:
+                self._queue_dead_letter(pipe, stream_name, matches[0][1])
+            pipe.xack(stream_name, consumer_group, msg_id)
+        await pipe.execute()
+        logger.warning(f"Dead-lettered {len(msg_ids)} messages out of retries")
+
+    def _queue_dead_letter(self, pipe, stream_name: bytes, msg_data):
+        """Queue a copy of an undecodable entry on the stream's :dead stream"""
+        if msg_data:
+            pipe.xadd(
+                stream_name + b":dead",
+                msg_data,
+                maxlen=self.max_stream_len,
+                approximate=True,
+            )
+
+    @staticmethod
+    def _decode_entry(msg_data: Dict[bytes, bytes]) -> Optional[A2AMessage]:
+        """Decode a stream entry into a message (None if it carries none)"""
+        # XAUTOCLAIM returns nil fields for entries trimmed by MAXLEN
+        if not msg_data:
+            return None
+        raw_message = msg_data.get(b"message")
+        if not raw_message:
+            return None
+        encoding = _MARKER_ENCODINGS.get(msg_data.get(b"enc"), "json")
+        return A2AMessage.decode(raw_message, encoding)
+
+    async def subscribe_async(
+        self,
+        agent_id: str,
+        handler: Callable[[A2AMessage], Awaitable[None]],
+        consumer_group: str = "default",
+        batch_size: int = 256,
+        block_ms: int = 100,
+        consumer_name: Optional[str] = None,
+        claim_min_idle_ms: int = CLAIM_MIN_IDLE_MS,
+        max_deliveries: int = MAX_DELIVERIES,
+        max_in_flight: int = 32,
+    ):
+        """
+        Asyncio variant of subscribe for coroutine handlers
+
+        Every entry is handled in its own task, with at most max_in_flight
+        running at once, so a slow handler does not stop the loop from
+        reading the stream. Entries are acknowledged as their handler finishes.
+        Entries held locally (queued or running) are re-claimed with JUSTID
+        every claim_min_idle_ms / 3, so no consumer reclaims them mid-run.
+        """
+        client = aioredis.Redis.from_url(self.redis_url)
+        stream_name = self._key(agent_id)
+        consumer_name = consumer_name or f"{agent_id}-consumer"
+
+        # Create consumer group if it doesn't exist
+        try:
+            await client.xgroup_create(
+                stream_name, consumer_group, id=b"0", mkstream=True
+            )
+        except redis.exceptions.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                logger.error(f"Failed to create consumer group: {e}")
+
+        slots = asyncio.Semaphore(max_in_flight)
+        tasks = set()
+        # Ids scheduled here and not yet finished, whether running or queued
+        in_flight = set()
+
+        async def run_entry(msg_id, msg_data):
+            try:
+                message = self._try_decode(msg_id, msg_data)
+                if message is None:
+                    pipe = client.pipeline(transaction=False)
+                    self._queue_dead_letter(pipe, stream_name, msg_data)
+                    pipe.xack(stream_name, consumer_group, msg_id)
+                    await pipe.execute()
+                    return
+                await handler(message)
+                await client.xack(stream_name, consumer_group, msg_id)
+            except Exception as e:
+                logger.error(f"Error processing message: {e}")
+            finally:
+                in_flight.discard(msg_id)
+                slots.release()
+
+        async def schedule(entries):
+            for msg_id, msg_data in entries:
+                if msg_id in in_flight:
+                    continue
+                in_flight.add(msg_id)
+                await slots.acquire()
+                task = asyncio.create_task(run_entry(msg_id, msg_data))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+        async def keep_alive():
+            # Reset the idle time of local entries so XAUTOCLAIM skips them
+            while True:
+                await asyncio.sleep(claim_min_idle_ms / 3000)
+                if not in_flight:
+                    continue
+                try:
+                    await client.xclaim(
+                        stream_name,
+                        consumer_group,
+                        consumer_name,
+                        min_idle_time=0,
+                        message_ids=list(in_flight),
+                        justid=True,
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to refresh pending messages: {e}")
+
+        logger.info(f"Subscribed to agents:{agent_id} as {consumer_name}")
+        self.running = True
+        claim_interval = claim_min_idle_ms / 1000
+        last_claim = time.monotonic()
+        claim_cursor = b"0-0"
+        keeper = asyncio.create_task(keep_alive())
+
+        try:
+            while self.running:
+                try:
+                    # Reclaim entries stuck with dead consumers, resuming the
+                    # scan of the pending list where the last call stopped
+                    if time.monotonic() - last_claim >= claim_interval:
+                        last_claim = time.monotonic()
+                        pending = await client.xpending_range(
+                            stream_name,
+                            consumer_group,
+                            min=claim_cursor,
+                            max=b"+",
+                            count=batch_size,
+                            idle=claim_min_idle_ms,
+                        )
+                        exhausted = _exhausted_ids(pending, max_deliveries, in_flight)
+                        if exhausted:
+                            await self._dead_letter_ids_async(
+                                client, stream_name, consumer_group, exhausted
+                            )
+                        claimed = await client.xautoclaim(
+                            stream_name,
+                            consumer_group,
+                            consumer_name,
+                            min_idle_time=claim_min_idle_ms,
+                            start_id=claim_cursor,
+                            count=batch_size,
+                        )
+                        claim_cursor = claimed[0]
+                        await schedule(claimed[1])
+
+                    messages = await client.xreadgroup(
+                        consumer_group,
+                        consumer_name,
+                        {stream_name: ">"},
+                        count=batch_size,
+                        block=block_ms,
+                    )
+                    for stream, msg_list in messages:
+                        await schedule(msg_list)
+
+                except Exception as e:
+                    logger.error(f"Error reading from stream: {e}")
+
+            # Let in-flight handlers finish before closing the connection
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            keeper.cancel()
+            await client.close()
+            if self._aio_client is not None:
+                await self._aio_client.close()
+                self._aio_client = None
+
     def stop(self):
         """Stop subscribing"""
         self.running = False
@@ -91,8 +539,7 @@ class RedisA2ATransport:
     def get_pending_count(self, agent_id: str, consumer_group: str = "default") -> int:
         """Get count of pending messages"""
         try:
-            stream_name = f"agents:{agent_id}"
-            pending = self.redis_client.xpending(stream_name, consumer_group)
+            pending = self.redis_client.xpending(self._key(agent_id), consumer_group)
             return pending["pending"]
         except Exception as e:
             logger.error(f"Error getting pending count: {e}")
@@ -2,9 +2,12 @@
 Executor Agent - Executes tool calls in sandboxed environment
 """
 
+import asyncio
 import logging
+import os
 import time
-from typing import Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional
 from ..a2a.protocol import (
     A2AMessage,
     MessageType,
@@ -16,6 +19,16 @@ from ..mcp.tool_registry import tool_registry
 
 logger = logging.getLogger(__name__)
 
+# Tools report real progress (0.0-1.0) through this callback when they can
+ProgressCallback = Callable[[float], None]
+ToolHandler = Callable[[Dict, Optional[ProgressCallback]], Dict]
+
+# Minimum spacing between published progress updates for one task
+PROGRESS_INTERVAL_S = 0.5
+
+# How long a task waits in Redis for its approval response
+APPROVAL_TTL_S = 24 * 3600
+
 
 class ExecutorAgent:
     """
@@ -25,18 +38,34 @@ class ExecutorAgent:
     def __init__(self, agent_id: str = "executor.agent.v1"):
         self.agent_id = agent_id
         self.transport = RedisA2ATransport()
-        self.running_tasks = {}
 
-    def handle_message(self, message: A2AMessage):
+        # Dispatch tables; register_tool() adds entries without touching core code
+        self._msg_handlers = {
+            MessageType.TASK_REQUEST: self._handle_task_request,
+            MessageType.APPROVAL_RESPONSE: self._handle_approval_response,
+        }
+        self._tool_handlers: Dict[str, ToolHandler] = {
+            "kaggle.dataset.download": self._execute_kaggle_download,
+            "analyzer.eda": self._execute_eda,
+            "executor.run_code": self._execute_code,
+        }
+
+    def register_tool(self, tool_id: str, handler: ToolHandler):
+        """
+        Register (or replace) the implementation of a tool
+        Handlers are called as handler(inputs, progress_cb)
+        """
+        self._tool_handlers[tool_id] = handler
+
+    async def handle_message(self, message: A2AMessage):
         """Handle incoming A2A messages"""
         logger.info(f"Executor received {message.type} from {message.from_agent}")
 
-        if message.type == MessageType.TASK_REQUEST:
-            self._handle_task_request(message)
-        elif message.type == MessageType.APPROVAL_RESPONSE:
-            self._handle_approval_response(message)
+        handler = self._msg_handlers.get(message.type)
+        if handler:
+            await handler(message)
 
-    def _handle_task_request(self, message: A2AMessage):
+    async def _handle_task_request(self, message: A2AMessage):
         """Handle TASK_REQUEST message"""
         payload = message.payload
         task_id = payload.get("task_id")
@@ -48,25 +77,25 @@ class ExecutorAgent:
         # Get tool manifest
         tool = tool_registry.get_tool(tool_id)
         if not tool:
-            self._send_error(message, f"Tool not found: {tool_id}")
+            await self._send_error(message, f"Tool not found: {tool_id}")
             return
 
         # Validate inputs
         valid, error = tool_registry.validate_inputs(tool_id, inputs)
         if not valid:
-            self._send_error(message, f"Invalid inputs: {error}")
+            await self._send_error(message, f"Invalid inputs: {error}")
             return
 
         # Check if approval required
         if tool.get("approval_required", False):
-            self._request_approval(message, tool)
+            await self._request_approval(message, tool)
             return
 
         # Execute tool
-        self._execute_tool(message, tool, inputs)
+        await self._execute_tool(message, tool, inputs)
 
-    def _execute_tool(self, message: A2AMessage, tool: Dict, inputs: Dict):
-        """Execute the tool"""
+    async def _execute_tool(self, message: A2AMessage, tool: Dict, inputs: Dict):
+        """Execute the tool off the event loop so other messages keep flowing"""
         task_id = message.payload.get("task_id")
         tool_id = tool["tool_id"]
 
@@ -80,33 +109,19 @@ class ExecutorAgent:
             message=f"Starting {tool_id}",
             trace_id=message.trace_id,
         )
-        self.transport.publish(status_msg)
+        await self.transport.publish_async(status_msg)
 
         try:
             # Execute based on tool type
-            if tool_id == "kaggle.dataset.download":
-                outputs = self._execute_kaggle_download(inputs)
-            elif tool_id == "analyzer.eda":
-                outputs = self._execute_eda(inputs)
-            elif tool_id == "executor.run_code":
-                outputs = self._execute_code(inputs)
+            tool_handler = self._tool_handlers.get(tool_id)
+            if tool_handler:
+                outputs = await asyncio.to_thread(
+                    tool_handler, inputs, self._make_progress_cb(message)
+                )
             else:
                 outputs = {"message": f"Tool {tool_id} not implemented yet"}
 
-            # Send progress updates
-            for progress in [0.3, 0.6, 0.9]:
-                status_msg = create_task_status(
-                    from_agent=self.agent_id,
-                    to_agent=message.from_agent,
-                    task_id=task_id,
-                    status="running",
-                    progress=progress,
-                    trace_id=message.trace_id,
-                )
-                self.transport.publish(status_msg)
-                time.sleep(0.5)  # Simulate work
-
-            # Send result
+            # The result doubles as the final progress update
             result_msg = create_task_result(
                 from_agent=self.agent_id,
                 to_agent=message.from_agent,
@@ -115,7 +130,7 @@ class ExecutorAgent:
                 outputs=outputs,
                 trace_id=message.trace_id,
             )
-            self.transport.publish(result_msg)
+            await self.transport.publish_async(result_msg)
 
             logger.info(f"Task {task_id} completed successfully")
 
@@ -129,9 +144,38 @@ class ExecutorAgent:
                 error=str(e),
                 trace_id=message.trace_id,
             )
-            self.transport.publish(result_msg)
+            await self.transport.publish_async(result_msg)
+
+    def _make_progress_cb(self, message: A2AMessage) -> ProgressCallback:
+        """
+        Build a progress callback for a task
+        Updates are throttled to one per PROGRESS_INTERVAL_S; the callback is
+        invoked from the tool's worker thread, so the blocking publish is fine.
+        """
+        task_id = message.payload.get("task_id")
+        last_sent = [0.0]
+
+        def progress_cb(fraction: float):
+            now = time.monotonic()
+            if now - last_sent[0] < PROGRESS_INTERVAL_S:
+                return
+            last_sent[0] = now
+            self.transport.publish(
+                create_task_status(
+                    from_agent=self.agent_id,
+                    to_agent=message.from_agent,
+                    task_id=task_id,
+                    status="running",
+                    progress=min(max(fraction, 0.0), 1.0),
+                    trace_id=message.trace_id,
+                )
+            )
+
+        return progress_cb
 
-    def _execute_kaggle_download(self, inputs: Dict) -> Dict:
+    def _execute_kaggle_download(
+        self, inputs: Dict, progress_cb: Optional[ProgressCallback] = None
+    ) -> Dict:
         """Execute Kaggle dataset download"""
         dataset_ref = inputs.get("dataset_ref")
 
@@ -144,7 +188,9 @@ class ExecutorAgent:
             "size_mb": 10.5,
         }
 
-    def _execute_eda(self, inputs: Dict) -> Dict:
+    def _execute_eda(
+        self, inputs: Dict, progress_cb: Optional[ProgressCallback] = None
+    ) -> Dict:
         """Execute EDA analysis"""
         dataset_path = inputs.get("dataset_path")
 
@@ -159,7 +205,9 @@ class ExecutorAgent:
             "report_path": "/outputs/eda_report.md",
         }
 
-    def _execute_code(self, inputs: Dict) -> Dict:
+    def _execute_code(
+        self, inputs: Dict, progress_cb: Optional[ProgressCallback] = None
+    ) -> Dict:
         """Execute code in sandbox"""
         script_path = inputs.get("script_path")
 
@@ -173,16 +221,15 @@ class ExecutorAgent:
             "exit_code": 0,
         }
 
-    def _request_approval(self, message: A2AMessage, tool: Dict):
+    async def _request_approval(self, message: A2AMessage, tool: Dict):
         """Request approval for dangerous operation"""
         task_id = message.payload.get("task_id")
 
-        # Store task for later
-        self.running_tasks[task_id] = {
-            "message": message,
-            "tool": tool,
-            "status": "awaiting_approval",
-        }
+        # Park the request in Redis: with start_pool, the approval response
+        # may be delivered to any worker in the consumer group
+        await self.transport.stash_message(
+            self._approval_key(task_id), message, APPROVAL_TTL_S
+        )
 
         # Send approval request
         from ..a2a.protocol import ApprovalRequest
@@ -200,47 +247,49 @@ class ExecutorAgent:
             payload=approval_payload,
             trace_id=message.trace_id,
         )
-        self.transport.publish(approval_msg)
+        await self.transport.publish_async(approval_msg)
 
         logger.info(f"Approval requested for task {task_id}")
 
-    def _handle_approval_response(self, message: A2AMessage):
+    async def _handle_approval_response(self, message: A2AMessage):
         """Handle approval response"""
         payload = message.payload
         task_id = payload.get("task_id")
         decision = payload.get("decision")
 
-        if task_id not in self.running_tasks:
+        # Whichever worker takes the parked request handles it (exactly once)
+        request = await self.transport.take_message(self._approval_key(task_id))
+        if request is None:
             logger.warning(f"Unknown task in approval response: {task_id}")
             return
 
-        task_info = self.running_tasks[task_id]
-
         if decision:
             # Approved - execute
             logger.info(f"Task {task_id} approved, executing")
-            self._execute_tool(
-                task_info["message"],
-                task_info["tool"],
-                task_info["message"].payload.get("inputs", {}),
-            )
+            tool_id = request.payload.get("tool_id")
+            tool = tool_registry.get_tool(tool_id)
+            if not tool:
+                await self._send_error(request, f"Tool not found: {tool_id}")
+                return
+            await self._execute_tool(request, tool, request.payload.get("inputs", {}))
         else:
             # Rejected
             logger.info(f"Task {task_id} rejected")
             result_msg = create_task_result(
                 from_agent=self.agent_id,
-                to_agent=task_info["message"].from_agent,
+                to_agent=request.from_agent,
                 task_id=task_id,
                 status="rejected",
                 error="Approval denied",
-                trace_id=task_info["message"].trace_id,
+                trace_id=request.trace_id,
             )
-            self.transport.publish(result_msg)
+            await self.transport.publish_async(result_msg)
 
-        # Clean up
-        del self.running_tasks[task_id]
+    def _approval_key(self, task_id: str) -> str:
+        """Redis key of a task awaiting approval"""
+        return f"approvals:{self.agent_id}:{task_id}"
 
-    def _send_error(self, message: A2AMessage, error: str):
+    async def _send_error(self, message: A2AMessage, error: str):
         """Send error response"""
         task_id = message.payload.get("task_id")
         result_msg = create_task_result(
@@ -251,9 +300,34 @@ class ExecutorAgent:
             error=error,
             trace_id=message.trace_id,
         )
-        self.transport.publish(result_msg)
+        await self.transport.publish_async(result_msg)
 
-    def start(self):
+    def start(self, worker_id: int = 0):
         """Start listening for messages"""
-        logger.info(f"Starting Executor Agent: {self.agent_id}")
-        self.transport.subscribe(self.agent_id, self.handle_message)
+        logger.info(f"Starting Executor Agent: {self.agent_id} (worker {worker_id})")
+        asyncio.run(
+            self.transport.subscribe_async(
+                self.agent_id,
+                self.handle_message,
+                consumer_name=f"{self.agent_id}-w{worker_id}-{os.getpid()}",
+            )
+        )
+
+    @staticmethod
+    def start_pool(n_workers: int, agent_id: str = "executor.agent.v1"):
+        """
+        Run n_workers executor processes sharing the agent's consumer group
+        Blocks until all workers exit
+        """
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [
+                pool.submit(_run_worker, agent_id, worker_id)
+                for worker_id in range(n_workers)
+            ]
+            for future in futures:
+                future.result()
+
+
+def _run_worker(agent_id: str, worker_id: int):
+    """Process entry point for ExecutorAgent.start_pool"""
+    ExecutorAgent(agent_id=agent_id).start(worker_id)
@@ -2,9 +2,9 @@
 Planner Agent - LLM-based query understanding and planning
 """
 
-import json
 import google.generativeai as genai
 import logging
+import orjson
 from typing import Dict, List, Optional
 from ..a2a.protocol import create_task_request, A2AMessage
 from ..a2a.redis_transport import RedisA2ATransport
@@ -13,6 +13,71 @@ from ..mcp.tool_registry import tool_registry
 logger = logging.getLogger(__name__)
 
 
+# Query-independent part of the planning prompt; filled once per tool registry
+# version (doubled braces are literal JSON braces)
+_PLANNING_PROMPT_PREFIX = """You are a Planner Agent for a data science research assistant.
+
+Your task is to create an execution plan to answer the user's query.
+
+Available Tools:
+{tools_summary}
+
+Create a JSON plan with the following structure:
+{{
+  "plan_id": "unique-id",
+  "description": "brief description of the plan",
+  "steps": [
+    {{
+      "step_id": "s1",
+      "tool_id": "tool.id.here",
+      "description": "what this step does",
+      "inputs": {{
+        "param1": "value1"
+      }},
+      "depends_on": []
+    }}
+  ]
+}}
+
+Rules:
+1. Use only tools from the available tools list
+2. Each step must have a unique step_id
+3. Steps can depend on previous steps (use depends_on)
+4. Provide realistic input values based on the query
+5. Keep the plan simple and efficient
+"""
+
+
+def _iter_json_objects(text: str):
+    """
+    Yield each top-level balanced {...} span in text, in a single pass
+    Braces inside JSON string literals are ignored
+    """
+    depth = 0
+    start = None
+    in_string = False
+    escaped = False
+
+    for i, c in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif c == "\\":
+                escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = depth > 0
+        elif c == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif c == "}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                yield text[start : i + 1]
+
+
 class PlannerAgent:
     """
     Planner Agent uses LLM to understand user queries and create execution plans
@@ -21,10 +86,17 @@ class PlannerAgent:
     def __init__(self, agent_id: str = "planner.agent.v1", gemini_api_key: str = None):
         self.agent_id = agent_id
         self.transport = RedisA2ATransport()
+        # Static prompt prefix (with tool list), rebuilt when the registry changes
+        self._prompt_prefix = None
+        self._tools_version = None
 
         if gemini_api_key:
             genai.configure(api_key=gemini_api_key)
-            self.model = genai.GenerativeModel("models/gemini-2.0-flash")
+            # Ask for strict JSON so the happy path needs no extraction heuristics
+            self.model = genai.GenerativeModel(
+                "models/gemini-2.0-flash",
+                generation_config={"response_mime_type": "application/json"},
+            )
         else:
             self.model = None
 
@@ -36,12 +108,8 @@ class PlannerAgent:
             "steps": [{"step_id": str, "tool_id": str, "inputs": dict}]
         }
         """
-        # Get available tools
-        tools = tool_registry.list_tools()
-        tools_summary = self._format_tools_for_prompt(tools)
-
         # Build prompt
-        prompt = self._build_planning_prompt(user_query, tools_summary, context)
+        prompt = self._build_planning_prompt(user_query, context)
 
         # Call LLM
         if self.model:
@@ -55,50 +123,28 @@ class PlannerAgent:
         else:
             return self._create_fallback_plan(user_query)
 
-    def _build_planning_prompt(
-        self, user_query: str, tools_summary: str, context: Optional[Dict]
-    ) -> str:
-        """Build prompt for LLM planner"""
-        context_str = json.dumps(context, indent=2) if context else "No context"
-
-        return f"""You are a Planner Agent for a data science research assistant.
-
-Your task is to create an execution plan to answer the user's query.
-
-Available Tools:
-{tools_summary}
+    def _build_planning_prompt(self, user_query: str, context: Optional[Dict]) -> str:
+        """Build prompt for LLM planner: cached static prefix + per-query suffix"""
+        context_str = orjson.dumps(context).decode() if context else "No context"
 
+        return f"""{self._get_prompt_prefix()}
 User Query: {user_query}
 
 Context: {context_str}
 
-Create a JSON plan with the following structure:
-{{
-  "plan_id": "unique-id",
-  "description": "brief description of the plan",
-  "steps": [
-    {{
-      "step_id": "s1",
-      "tool_id": "tool.id.here",
-      "description": "what this step does",
-      "inputs": {{
-        "param1": "value1"
-      }},
-      "depends_on": []
-    }}
-  ]
-}}
-
-Rules:
-1. Use only tools from the available tools list
-2. Each step must have a unique step_id
-3. Steps can depend on previous steps (use depends_on)
-4. Provide realistic input values based on the query
-5. Keep the plan simple and efficient
-
 Return ONLY the JSON plan, no other text.
 """
 
+    def _get_prompt_prefix(self) -> str:
+        """Return the query-independent prompt prefix, cached per registry version"""
+        if self._tools_version != tool_registry.version:
+            tools_summary = self._format_tools_for_prompt(tool_registry.list_tools())
+            self._prompt_prefix = _PLANNING_PROMPT_PREFIX.format(
+                tools_summary=tools_summary
+            )
+            self._tools_version = tool_registry.version
+        return self._prompt_prefix
+
     def _format_tools_for_prompt(self, tools: List[Dict]) -> str:
         """Format tools list for prompt"""
         lines = []
@@ -111,16 +157,23 @@ Return ONLY the JSON plan, no other text.
 
     def _parse_plan_response(self, response_text: str) -> Dict:
         """Parse LLM response to extract plan"""
+        # Happy path: the model was asked for a bare JSON document
         try:
-            # Try to find JSON in response
-            start = response_text.find("{")
-            end = response_text.rfind("}") + 1
-            if start >= 0 and end > start:
-                json_str = response_text[start:end]
-                plan = json.loads(json_str)
+            plan = orjson.loads(response_text)
+            if isinstance(plan, dict):
+                return plan
+        except orjson.JSONDecodeError:
+            pass
+
+        # Otherwise take the first balanced JSON object that parses
+        for candidate in _iter_json_objects(response_text):
+            try:
+                plan = orjson.loads(candidate)
+            except orjson.JSONDecodeError as e:
+                logger.error(f"Error parsing plan: {e}")
+                continue
+            if isinstance(plan, dict):
                 return plan
-        except Exception as e:
-            logger.error(f"Error parsing plan: {e}")
 
         return {"plan_id": "error", "steps": []}
 
@@ -165,28 +218,31 @@ Return ONLY the JSON plan, no other text.
         Execute plan by sending TASK_REQUEST messages to executor
         Returns list of task IDs
         """
+        import uuid
+
         task_ids = []
+        messages = []
 
         for step in plan.get("steps", []):
-            import uuid
-
             task_id = str(uuid.uuid4())
 
             # Create TASK_REQUEST message
-            message = create_task_request(
-                from_agent=self.agent_id,
-                to_agent="executor.agent.v1",
-                task_id=task_id,
-                tool_id=step["tool_id"],
-                inputs=step["inputs"],
-                trace_id=trace_id,
+            messages.append(
+                create_task_request(
+                    from_agent=self.agent_id,
+                    to_agent="executor.agent.v1",
+                    task_id=task_id,
+                    tool_id=step["tool_id"],
+                    inputs=step["inputs"],
+                    trace_id=trace_id,
+                )
             )
-
-            # Publish message
-            self.transport.publish(message)
             task_ids.append(task_id)
 
-            logger.info(f"Published task {task_id} for step {step['step_id']}")
+            logger.info(f"Queued task {task_id} for step {step['step_id']}")
+
+        # Publish all steps in a single round-trip
+        self.transport.publish_many(messages)
 
         return task_ids
 
@@ -0,0 +1,42 @@
+"""popular datasets materialized view
+
+Revision ID: 3f9a2c71d4e8
+Revises: 5d2e1b7a9c04
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a2c71d4e8'
+down_revision = '5d2e1b7a9c04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Materialized views are Postgres-only; other databases read the table
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS mv_popular_datasets AS
+        SELECT dataset_id, title, access_count
+        FROM datasets
+        ORDER BY access_count DESC
+        LIMIT 1000
+        """
+    )
+    # REFRESH ... CONCURRENTLY requires a unique index on the view
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_popular_datasets_dataset_id "
+        "ON mv_popular_datasets (dataset_id)"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_popular_datasets")
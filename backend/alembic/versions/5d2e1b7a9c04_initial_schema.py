@@ -0,0 +1,121 @@
+"""initial schema
+
+Revision ID: 5d2e1b7a9c04
+Revises:
+Create Date: 2026-10-16 08:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e1b7a9c04'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _created_at():
+    return sa.Column(
+        "created_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+    )
+
+
+def _tables():
+    """Table name -> (columns, [(index name, column, unique)])"""
+    return {
+        "queries": (
+            [
+                sa.Column("id", sa.Integer(), primary_key=True),
+                sa.Column("session_id", sa.String(255)),
+                sa.Column("user_id", sa.String(255), nullable=True),
+                sa.Column("query_text", sa.Text(), nullable=False),
+                sa.Column("dataset_id", sa.String(255), nullable=True),
+                sa.Column("status", sa.String(50)),
+                sa.Column("plan", sa.Text()),
+                sa.Column("code", sa.Text()),
+                sa.Column("results", sa.JSON()),
+                sa.Column("explanation", sa.Text()),
+                sa.Column("execution_time", sa.Float()),
+                _created_at(),
+                sa.Column("updated_at", sa.DateTime(timezone=True)),
+            ],
+            [
+                ("ix_queries_id", "id", False),
+                ("ix_queries_session_id", "session_id", False),
+                ("ix_queries_user_id", "user_id", False),
+            ],
+        ),
+        "datasets": (
+            [
+                sa.Column("id", sa.Integer(), primary_key=True),
+                sa.Column("dataset_id", sa.String(255)),
+                sa.Column("title", sa.String(500)),
+                sa.Column("description", sa.Text()),
+                sa.Column("size", sa.Integer()),
+                sa.Column("columns", sa.JSON()),
+                sa.Column("url", sa.String(500)),
+                sa.Column("last_accessed", sa.DateTime(timezone=True)),
+                sa.Column("access_count", sa.Integer()),
+                _created_at(),
+            ],
+            [
+                ("ix_datasets_id", "id", False),
+                ("ix_datasets_dataset_id", "dataset_id", True),
+            ],
+        ),
+        "api_logs": (
+            [
+                sa.Column("id", sa.Integer(), primary_key=True),
+                sa.Column("endpoint", sa.String(255)),
+                sa.Column("method", sa.String(10)),
+                sa.Column("status_code", sa.Integer()),
+                sa.Column("request_body", sa.JSON()),
+                sa.Column("response_body", sa.JSON()),
+                sa.Column("duration_ms", sa.Float()),
+                sa.Column("session_id", sa.String(255)),
+                sa.Column("user_id", sa.String(255), nullable=True),
+                sa.Column("ip_address", sa.String(50)),
+                _created_at(),
+            ],
+            [
+                ("ix_api_logs_id", "id", False),
+                ("ix_api_logs_session_id", "session_id", False),
+                ("ix_api_logs_user_id", "user_id", False),
+            ],
+        ),
+        "sessions": (
+            [
+                sa.Column("id", sa.Integer(), primary_key=True),
+                sa.Column("session_id", sa.String(255)),
+                sa.Column("user_id", sa.String(255), nullable=True),
+                sa.Column("current_dataset", sa.String(255)),
+                sa.Column("context", sa.JSON()),
+                _created_at(),
+                sa.Column("last_activity", sa.DateTime(timezone=True)),
+            ],
+            [
+                ("ix_sessions_id", "id", False),
+                ("ix_sessions_session_id", "session_id", True),
+                ("ix_sessions_user_id", "user_id", False),
+            ],
+        ),
+    }
+
+
+def upgrade() -> None:
+    # init_db() runs create_all on startup, so a database the app has already
+    # touched has these tables; only the missing ones are created
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for name, (columns, indexes) in _tables().items():
+        if name in existing:
+            continue
+        op.create_table(name, *columns)
+        for index_name, column, unique in indexes:
+            op.create_index(index_name, name, [column], unique=unique)
+
+
+def downgrade() -> None:
+    for name in reversed(list(_tables())):
+        op.drop_table(name)
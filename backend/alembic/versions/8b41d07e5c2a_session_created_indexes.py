@@ -0,0 +1,37 @@
+"""session_id, created_at composite indexes
+
+Revision ID: 8b41d07e5c2a
+Revises: 3f9a2c71d4e8
+Create Date: 2026-10-16 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b41d07e5c2a'
+down_revision = '3f9a2c71d4e8'
+branch_labels = None
+depends_on = None
+
+_INDEXES = {
+    "ix_queries_session_created": "queries",
+    "ix_api_logs_session_created": "api_logs",
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY avoids locking writes but cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table in _INDEXES.items():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON {table} (session_id, created_at DESC)"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in _INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -1,14 +1,20 @@
 """Enhanced Query API with AutoEDA and AutoML"""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from typing import Optional
 
 from app.services.enhanced_agent_service import EnhancedAgentService
+from app.utils.orjson_response import ORJSONResponse
 
 router = APIRouter()
 
 
+async def get_enhanced_agent(request: Request) -> EnhancedAgentService:
+    """Return the app-wide EnhancedAgentService built in the lifespan"""
+    return request.app.state.enhanced_agent
+
+
 class EnhancedQueryRequest(BaseModel):
     session_id: str
     query: str
@@ -28,14 +34,12 @@ class AutoAnalysisRequest(BaseModel):
 
 
 @router.post("/query/enhanced")
-async def enhanced_query(request: EnhancedQueryRequest):
+async def enhanced_query(
+    request: EnhancedQueryRequest,
+    agent: EnhancedAgentService = Depends(get_enhanced_agent),
+):
     """Enhanced query with AutoEDA and AutoML"""
     try:
-        from app.main import app
-
-        redis_service = app.state.redis
-        agent = EnhancedAgentService(redis_service)
-
         result = await agent.handle_comprehensive_query(
             session_id=request.session_id,
             query=request.query,
@@ -44,20 +48,19 @@ async def enhanced_query(request: EnhancedQueryRequest):
             auto_ml=request.auto_ml,
         )
 
-        return result
+        # Large EDA/ML payload: render directly, bypassing jsonable_encoder
+        return ORJSONResponse(content=result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/datasets/search")
-async def search_datasets(request: DatasetSearchRequest):
+async def search_datasets(
+    request: DatasetSearchRequest,
+    agent: EnhancedAgentService = Depends(get_enhanced_agent),
+):
     """Search Kaggle datasets"""
     try:
-        from app.main import app
-
-        redis_service = app.state.redis
-        agent = EnhancedAgentService(redis_service)
-
         results = await agent.kaggle_tool.search_datasets(request.query)
         return {"datasets": results}
     except Exception as e:
@@ -65,14 +68,12 @@ async def search_datasets(request: DatasetSearchRequest):
 
 
 @router.post("/analysis/auto")
-async def auto_analysis(request: AutoAnalysisRequest):
+async def auto_analysis(
+    request: AutoAnalysisRequest,
+    agent: EnhancedAgentService = Depends(get_enhanced_agent),
+):
     """Automatic comprehensive analysis"""
     try:
-        from app.main import app
-
-        redis_service = app.state.redis
-        agent = EnhancedAgentService(redis_service)
-
         query = f"Perform {request.analysis_type} analysis on this dataset"
 
         result = await agent.handle_comprehensive_query(
@@ -83,6 +84,6 @@ async def auto_analysis(request: AutoAnalysisRequest):
             auto_ml=(request.analysis_type in ["full", "ml"]),
         )
 
-        return result
+        return ORJSONResponse(content=result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -3,19 +3,20 @@ LangChain-powered query endpoint
 """
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import time
 
 from app.schemas.query import QueryRequest, QueryResponse
 from app.services.langchain_agent import LangChainAgent
 from app.db.database import get_db
 from app.db.repository import QueryRepository
+from app.utils.orjson_response import ORJSONResponse
 
 router = APIRouter()
 
 
 @router.post("/query/langchain", response_model=QueryResponse)
-async def query_with_langchain(req: QueryRequest, db: Session = Depends(get_db)):
+async def query_with_langchain(req: QueryRequest, db: AsyncSession = Depends(get_db)):
     """
     Handle query using LangChain orchestration
     This provides more sophisticated multi-tool reasoning
@@ -23,7 +24,7 @@ async def query_with_langchain(req: QueryRequest, db: Session = Depends(get_db))
     start_time = time.time()
 
     # Create query record
-    query_record = QueryRepository.create_query(
+    query_record = await QueryRepository.create_query(
         db=db,
         session_id=req.session_id,
         query_text=req.query,
@@ -41,7 +42,7 @@ async def query_with_langchain(req: QueryRequest, db: Session = Depends(get_db))
         execution_time = time.time() - start_time
 
         # Update query record
-        QueryRepository.update_query_result(
+        await QueryRepository.update_query_result(
             db=db,
             query_id=query_record.id,
             status=result["status"],
@@ -49,15 +50,22 @@ async def query_with_langchain(req: QueryRequest, db: Session = Depends(get_db))
             execution_time=execution_time,
         )
 
-        return QueryResponse(
-            job_id=str(query_record.id),
-            status=result["status"],
-            explanation=result.get("output", ""),
-            error=result.get("error"),
+        # Rendered directly: the fields below already match QueryResponse
+        return ORJSONResponse(
+            content={
+                "job_id": str(query_record.id),
+                "status": result["status"],
+                "plan": None,
+                "code": None,
+                "results": None,
+                "artifacts": None,
+                "explanation": result.get("output", ""),
+                "error": result.get("error"),
+            }
         )
 
     except Exception as e:
-        QueryRepository.update_query_result(
+        await QueryRepository.update_query_result(
             db=db, query_id=query_record.id, status="error", explanation=str(e)
         )
         raise HTTPException(status_code=500, detail=str(e))
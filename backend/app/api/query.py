@@ -1,15 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from app.schemas.query import QueryRequest, QueryResponse
 from app.services.agent_service import AgentService
 from app.services.redis_service import RedisService
+from app.utils.orjson_response import ORJSONResponse
 
 router = APIRouter()
 
 
-def get_redis_service():
-    from app.main import app
-
-    return app.state.redis
+async def get_redis_service(request: Request) -> RedisService:
+    return request.app.state.redis
 
 
 @router.post("/query", response_model=QueryResponse)
@@ -17,4 +16,5 @@ async def query(req: QueryRequest, redis: RedisService = Depends(get_redis_servi
     """Handle user query and orchestrate analysis"""
     agent = AgentService(redis)
     result = await agent.handle_query(req.session_id, req.query, req.dataset_id)
-    return QueryResponse(**result)
+    # response_model documents the schema; returning a Response skips revalidation
+    return ORJSONResponse(content=result)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from datetime import datetime
 import uuid
 from app.schemas.query import SessionCreate, SessionResponse
@@ -7,10 +7,8 @@ from app.services.redis_service import RedisService
 router = APIRouter()
 
 
-def get_redis_service():
-    from app.main import app
-
-    return app.state.redis
+async def get_redis_service(request: Request) -> RedisService:
+    return request.app.state.redis
 
 
 @router.post("/sessions", response_model=SessionResponse)
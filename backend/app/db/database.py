@@ -2,9 +2,9 @@
 Database configuration supporting PostgreSQL and Firebase
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from typing import Optional
 import logging
 
@@ -12,40 +12,67 @@ from app.utils.config import settings
 
 logger = logging.getLogger(__name__)
 
-# SQLAlchemy setup for PostgreSQL
+# SQLAlchemy setup for PostgreSQL (asyncpg driver)
 engine = None
-SessionLocal = None
+async_session_maker = None
 Base = declarative_base()
 
 
-def init_db():
+# Driverless URL schemes and the async driver each one maps to
+_ASYNC_DRIVERS = {
+    "postgresql://": "postgresql+asyncpg://",
+    "postgres://": "postgresql+asyncpg://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
+
+def _async_url(database_url: str) -> str:
+    """Point a plain postgresql:// or sqlite:// URL at its async driver"""
+    for prefix, async_prefix in _ASYNC_DRIVERS.items():
+        if database_url.startswith(prefix):
+            return async_prefix + database_url[len(prefix) :]
+    return database_url
+
+
+async def init_db():
     """Initialize database connection"""
-    global engine, SessionLocal
+    global engine, async_session_maker
 
     if settings.database_url:
         logger.info("Initializing PostgreSQL database")
-        engine = create_engine(
-            settings.database_url, pool_pre_ping=True, pool_size=10, max_overflow=20
+        engine = create_async_engine(
+            _async_url(settings.database_url),
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=10,
+            max_overflow=20,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+        )
+        async_session_maker = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
         )
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
         # Create tables
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
         logger.info("Database initialized successfully")
     else:
         logger.warning("No database URL configured")
 
 
-def get_db():
+async def close_db():
+    """Dispose of the connection pool"""
+    if engine is not None:
+        await engine.dispose()
+
+
+async def get_db():
     """Dependency for getting DB session"""
-    if SessionLocal is None:
-        init_db()
+    if async_session_maker is None:
+        await init_db()
 
-    db = SessionLocal()
-    try:
+    async with async_session_maker() as db:
         yield db
-    finally:
-        db.close()
 
 
 # Firebase setup (optional)
@@ -2,7 +2,19 @@
 SQLAlchemy models for PostgreSQL
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Float
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    DateTime,
+    JSON,
+    Float,
+    Index,
+    column,
+    table,
+    text,
+)
 from sqlalchemy.sql import func
 from app.db.database import Base
 
@@ -11,6 +23,10 @@ class Query(Base):
     """Store user queries and responses"""
 
     __tablename__ = "queries"
+    # Serves "latest N queries for a session" without a sort
+    __table_args__ = (
+        Index("ix_queries_session_created", "session_id", text("created_at DESC")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(String(255), index=True)
@@ -54,6 +70,9 @@ class APILog(Base):
     """Log all API requests"""
 
     __tablename__ = "api_logs"
+    __table_args__ = (
+        Index("ix_api_logs_session_created", "session_id", text("created_at DESC")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     endpoint = Column(String(255))
@@ -92,3 +111,13 @@ class Session(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_activity = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+# Materialized view maintained by migrations and refreshed periodically;
+# declared outside Base.metadata so create_all never tries to create it
+mv_popular_datasets = table(
+    "mv_popular_datasets",
+    column("dataset_id"),
+    column("title"),
+    column("access_count"),
+)
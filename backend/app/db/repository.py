@@ -2,22 +2,39 @@
 Database repository layer for queries and logs
 """
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict
 from datetime import datetime
+import asyncio
 import logging
 
-from app.db.models import Query, Dataset, APILog, Session as SessionModel
+from app.db import database
+from app.db.models import (
+    Query,
+    Dataset,
+    APILog,
+    Session as SessionModel,
+    mv_popular_datasets,
+)
 
 logger = logging.getLogger(__name__)
 
+# API log rows waiting to be batch-inserted by APILogRepository.run_flusher
+_log_queue: "asyncio.Queue[Dict]" = asyncio.Queue()
+
+# Set by DatasetRepository.detect_popular_datasets_view once the engine is up;
+# without the view (SQLite, or no migrations run) popularity reads the table
+_popular_view_available = False
+
 
 class QueryRepository:
     """Repository for query operations"""
 
     @staticmethod
-    def create_query(
-        db: Session,
+    async def create_query(
+        db: AsyncSession,
         session_id: str,
         query_text: str,
         dataset_id: Optional[str] = None,
@@ -32,13 +49,13 @@ class QueryRepository:
             status="pending",
         )
         db.add(query)
-        db.commit()
-        db.refresh(query)
+        await db.commit()
+        await db.refresh(query)
         return query
 
     @staticmethod
-    def update_query_result(
-        db: Session,
+    async def update_query_result(
+        db: AsyncSession,
         query_id: int,
         status: str,
         plan: str = None,
@@ -48,7 +65,8 @@ class QueryRepository:
         execution_time: float = None,
     ):
         """Update query with results"""
-        query = db.query(Query).filter(Query.id == query_id).first()
+        result = await db.execute(select(Query).where(Query.id == query_id))
+        query = result.scalar_one_or_none()
         if query:
             query.status = status
             query.plan = plan
@@ -56,28 +74,28 @@ class QueryRepository:
             query.results = results
             query.explanation = explanation
             query.execution_time = execution_time
-            db.commit()
+            await db.commit()
 
     @staticmethod
-    def get_session_queries(
-        db: Session, session_id: str, limit: int = 10
+    async def get_session_queries(
+        db: AsyncSession, session_id: str, limit: int = 10
     ) -> List[Query]:
         """Get recent queries for a session"""
-        return (
-            db.query(Query)
-            .filter(Query.session_id == session_id)
+        result = await db.execute(
+            select(Query)
+            .where(Query.session_id == session_id)
             .order_by(Query.created_at.desc())
             .limit(limit)
-            .all()
         )
+        return list(result.scalars().all())
 
 
 class DatasetRepository:
     """Repository for dataset metadata"""
 
     @staticmethod
-    def upsert_dataset(
-        db: Session,
+    async def upsert_dataset(
+        db: AsyncSession,
         dataset_id: str,
         title: str,
         description: str = None,
@@ -85,48 +103,109 @@ class DatasetRepository:
         columns: List = None,
         url: str = None,
     ) -> Dataset:
-        """Create or update dataset metadata"""
-        dataset = db.query(Dataset).filter(Dataset.dataset_id == dataset_id).first()
-
-        if dataset:
-            dataset.title = title
-            dataset.description = description
-            dataset.size = size
-            dataset.columns = columns
-            dataset.url = url
-            dataset.last_accessed = datetime.utcnow()
-            dataset.access_count += 1
-        else:
-            dataset = Dataset(
-                dataset_id=dataset_id,
-                title=title,
-                description=description,
-                size=size,
-                columns=columns,
-                url=url,
-                last_accessed=datetime.utcnow(),
-                access_count=1,
-            )
-            db.add(dataset)
+        """Create or update dataset metadata in a single atomic statement"""
+        stmt = pg_insert(Dataset).values(
+            dataset_id=dataset_id,
+            title=title,
+            description=description,
+            size=size,
+            columns=columns,
+            url=url,
+            last_accessed=func.now(),
+            access_count=1,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Dataset.dataset_id],
+            set_={
+                "title": stmt.excluded.title,
+                "description": stmt.excluded.description,
+                "size": stmt.excluded.size,
+                "columns": stmt.excluded.columns,
+                "url": stmt.excluded.url,
+                "last_accessed": func.now(),
+                "access_count": Dataset.access_count + 1,
+            },
+        ).returning(Dataset)
 
-        db.commit()
-        db.refresh(dataset)
+        result = await db.execute(stmt)
+        dataset = result.scalar_one()
+        await db.commit()
         return dataset
 
     @staticmethod
-    def get_popular_datasets(db: Session, limit: int = 10) -> List[Dataset]:
-        """Get most accessed datasets"""
-        return (
-            db.query(Dataset).order_by(Dataset.access_count.desc()).limit(limit).all()
+    async def get_popular_datasets(db: AsyncSession, limit: int = 10) -> List[Dict]:
+        """
+        Get most accessed datasets
+        Reads the mv_popular_datasets view when it exists, so counts lag by up
+        to one refresh; otherwise the datasets table is queried directly.
+        """
+        source = mv_popular_datasets if _popular_view_available else Dataset.__table__
+        result = await db.execute(
+            select(source.c.dataset_id, source.c.title, source.c.access_count)
+            .order_by(source.c.access_count.desc())
+            .limit(limit)
+        )
+        return [dict(row) for row in result.mappings().all()]
+
+    @staticmethod
+    async def detect_popular_datasets_view() -> bool:
+        """
+        Check for mv_popular_datasets, which only the Postgres migrations create
+        Call after init_db(); the result also picks get_popular_datasets' source.
+        """
+        global _popular_view_available
+        engine = database.engine
+        if engine is None or engine.dialect.name != "postgresql":
+            _popular_view_available = False
+            return False
+
+        try:
+            async with engine.connect() as conn:
+                found = await conn.scalar(
+                    text(
+                        "SELECT 1 FROM pg_matviews "
+                        "WHERE matviewname = 'mv_popular_datasets'"
+                    )
+                )
+        except Exception as e:
+            logger.error(f"Failed to look up materialized views: {e}")
+            found = None
+
+        _popular_view_available = found is not None
+        if not _popular_view_available:
+            logger.info("mv_popular_datasets not found; run `alembic upgrade head`")
+        return _popular_view_available
+
+    @staticmethod
+    async def refresh_popular_datasets(db: AsyncSession):
+        """Refresh the popular datasets view without blocking readers"""
+        await db.execute(
+            text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_popular_datasets")
         )
+        await db.commit()
+
+    @staticmethod
+    async def run_view_refresher(interval_s: float = 300):
+        """
+        Refresh materialized views every interval_s seconds until cancelled
+        Only start it when detect_popular_datasets_view() found the view.
+        """
+        while True:
+            await asyncio.sleep(interval_s)
+            if database.async_session_maker is None:
+                continue
+            try:
+                async with database.async_session_maker() as db:
+                    await DatasetRepository.refresh_popular_datasets(db)
+            except Exception as e:
+                logger.error(f"Failed to refresh materialized views: {e}")
 
 
 class APILogRepository:
     """Repository for API logging"""
 
     @staticmethod
-    def log_request(
-        db: Session,
+    async def log_request(
         endpoint: str,
         method: str,
         status_code: int,
@@ -137,48 +216,98 @@ class APILogRepository:
         request_body: Dict = None,
         response_body: Dict = None,
     ):
-        """Log API request"""
-        log = APILog(
-            endpoint=endpoint,
-            method=method,
-            status_code=status_code,
-            duration_ms=duration_ms,
-            session_id=session_id,
-            user_id=user_id,
-            ip_address=ip_address,
-            request_body=request_body,
-            response_body=response_body,
+        """Queue an API request log; rows are written in batches by run_flusher"""
+        await _log_queue.put(
+            dict(
+                endpoint=endpoint,
+                method=method,
+                status_code=status_code,
+                duration_ms=duration_ms,
+                session_id=session_id,
+                user_id=user_id,
+                ip_address=ip_address,
+                request_body=request_body,
+                response_body=response_body,
+            )
         )
-        db.add(log)
-        db.commit()
+
+    @staticmethod
+    async def run_flusher(batch_size: int = 500, flush_interval_s: float = 0.1):
+        """
+        Drain queued log rows into multi-row INSERTs until cancelled
+        A batch is written once it holds batch_size rows or flush_interval_s
+        has passed since its first row; on cancellation the queue is drained.
+        """
+        loop = asyncio.get_running_loop()
+        rows: List[Dict] = []
+        try:
+            while True:
+                rows.append(await _log_queue.get())
+                deadline = loop.time() + flush_interval_s
+                while len(rows) < batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        rows.append(await asyncio.wait_for(_log_queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                await APILogRepository._insert_logs(rows)
+                rows = []
+        except asyncio.CancelledError:
+            while not _log_queue.empty():
+                rows.append(_log_queue.get_nowait())
+            if rows:
+                await APILogRepository._insert_logs(rows)
+            raise
+
+    @staticmethod
+    async def _insert_logs(rows: List[Dict]):
+        """Write a batch of log rows with a single INSERT and commit"""
+        if database.async_session_maker is None:
+            await database.init_db()
+        if database.async_session_maker is None:
+            logger.debug(f"Dropping {len(rows)} API log rows: no database")
+            return
+
+        try:
+            async with database.async_session_maker() as db:
+                await db.execute(insert(APILog), rows)
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Failed to write {len(rows)} API log rows: {e}")
 
 
 class SessionRepository:
     """Repository for session management"""
 
     @staticmethod
-    def create_session(
-        db: Session, session_id: str, user_id: Optional[str] = None
+    async def create_session(
+        db: AsyncSession, session_id: str, user_id: Optional[str] = None
     ) -> SessionModel:
         """Create new session"""
         session = SessionModel(session_id=session_id, user_id=user_id, context={})
         db.add(session)
-        db.commit()
-        db.refresh(session)
+        await db.commit()
+        await db.refresh(session)
         return session
 
     @staticmethod
-    def update_session(
-        db: Session, session_id: str, current_dataset: str = None, context: Dict = None
+    async def update_session(
+        db: AsyncSession,
+        session_id: str,
+        current_dataset: str = None,
+        context: Dict = None,
     ):
         """Update session data"""
-        session = (
-            db.query(SessionModel).filter(SessionModel.session_id == session_id).first()
+        result = await db.execute(
+            select(SessionModel).where(SessionModel.session_id == session_id)
         )
+        session = result.scalar_one_or_none()
         if session:
             if current_dataset:
                 session.current_dataset = current_dataset
             if context:
                 session.context = context
             session.last_activity = datetime.utcnow()
-            db.commit()
+            await db.commit()
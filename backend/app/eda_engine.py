@@ -3,8 +3,11 @@ Advanced EDA Engine
 Statistical analysis, tests, and data quality assessment
 """
 
+import os
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional, Tuple
 from scipy import stats
 from scipy.stats import (
@@ -14,39 +17,87 @@ from scipy.stats import (
 )
 import warnings
 
+from app.utils.kernels import correlation_matrix, count_outliers
+
 warnings.filterwarnings('ignore')
 
+# Above this many rows, duplicate rows are counted with Arrow's hash grouping
+ARROW_DUPLICATES_MIN_ROWS = 10_000
+
+# |r| at or above this is reported as a strong correlation
+STRONG_CORRELATION = 0.7
+
+# Columns missing more than this share of values are flagged for dropping
+HIGH_MISSING_RATIO = 0.5
+
+# Categorical columns with more distinct values than this are high-cardinality
+HIGH_CARDINALITY = 50
+
+# Most frequent values reported per categorical column
+TOP_CATEGORIES = 10
+
+# Bins of the per-column histograms in the distribution analysis
+HISTOGRAM_BINS = 20
+
+# Shapiro-Wilk runs on at most this many values per column (its valid range)
+NORMALITY_MAX_SAMPLE = 5000
+NORMALITY_ALPHA = 0.05
+
+
+def _names(cols, limit: int = 10) -> str:
+    """Comma-separated column names for a message, truncated past limit"""
+    cols = [str(col) for col in cols]
+    more = f" (+{len(cols) - limit} more)" if len(cols) > limit else ""
+    return ", ".join(cols[:limit]) + more
+
 
 class EDAEngine:
     """Comprehensive Exploratory Data Analysis Engine"""
     
-    def __init__(self):
-        pass
+    def __init__(self, max_workers: Optional[int] = None):
+        # The sub-analyses are independent and spend most of their time in
+        # NumPy/pandas/Arrow kernels that release the GIL
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count())
     
-    def full_analysis(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Run complete EDA analysis"""
-        
-        results = {
-            "summary": self._get_summary(df),
-            "data_types": self._analyze_data_types(df),
-            "missing_data": self._analyze_missing(df),
-            "statistics": self._get_statistics(df),
-            "distributions": self._analyze_distributions(df),
-            "correlations": self._analyze_correlations(df),
-            "categorical_analysis": self._analyze_categorical(df),
-            "outliers": self._detect_outliers(df),
-            "data_quality": self._assess_data_quality(df),
-            "normality_tests": self._test_normality(df),
-            "recommendations": self._generate_recommendations(df)
+    def full_analysis(self, df: pd.DataFrame,
+                      correlations: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """
+        Run complete EDA analysis
+        A correlation matrix precomputed at upload time can be passed in
+        """
+        # Resolve column groups once and share them across the analyses
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        categorical_cols = df.select_dtypes(include=['object', 'category']).columns
+        datetime_cols = df.select_dtypes(include=['datetime64']).columns
+        
+        analyses = {
+            "summary": (self._get_summary, df, numeric_cols, categorical_cols, datetime_cols),
+            "data_types": (self._analyze_data_types, df),
+            "missing_data": (self._analyze_missing, df),
+            "statistics": (self._get_statistics, df, numeric_cols),
+            "distributions": (self._analyze_distributions, df, numeric_cols),
+            "correlations": (self._analyze_correlations, df, numeric_cols, correlations),
+            "categorical_analysis": (self._analyze_categorical, df, categorical_cols),
+            "outliers": (self._detect_outliers, df, numeric_cols),
+            "data_quality": (self._assess_data_quality, df),
+            "normality_tests": (self._test_normality, df, numeric_cols),
+            "recommendations": (self._generate_recommendations, df, numeric_cols,
+                                categorical_cols)
+        }
+        
+        # Run them concurrently; the report keeps the order above
+        futures = {
+            key: self._pool.submit(fn, *args)
+            for key, (fn, *args) in analyses.items()
         }
+        results = {key: future.result() for key, future in futures.items()}
         
         return results
     
-    def _get_summary(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _get_summary(self, df: pd.DataFrame, numeric_cols: pd.Index,
+                     categorical_cols: pd.Index, datetime_cols: pd.Index) -> Dict[str, Any]:
         """Get dataset summary"""
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
-        datetime_cols = df.select_dtypes(include=['datetime64']).columns.tolist()
+        missing_cells = int(df.isnull().to_numpy().sum())
         
         return {
             "rows": len(df),
@@ -55,31 +106,304 @@ class EDAEngine:
             "categorical_columns": len(categorical_cols),
             "datetime_columns": len(datetime_cols),
             "memory_usage": f"{df.memory_usage(deep=True).sum() / 1024 / 1024:.2f} MB",
-            "duplicates": int(df.duplicated().sum()),
-            "missing_cells": int(df.isnull().sum().sum()),
-            "missing_percentage": round(df.isnull().sum().sum() / (df.shape[0] * df.shape[1]) * 100, 2)
+            "duplicates": self._count_duplicates(df),
+            "missing_cells": missing_cells,
+            "missing_percentage": round(missing_cells / (df.shape[0] * df.shape[1]) * 100, 2)
+        }
+    
+    def _analyze_missing(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Missing-value counts of the columns that have any, worst first"""
+        missing = df.isnull().sum()
+        missing = missing[missing > 0].sort_values(ascending=False)
+        denom = max(len(df), 1)
+        
+        return {
+            "total_missing": int(missing.sum()),
+            "columns_with_missing": len(missing),
+            "columns": [
+                {
+                    "column": str(col),
+                    "count": int(count),
+                    "percentage": round(float(count) / denom * 100, 2)
+                }
+                for col, count in missing.items()
+            ]
         }
     
+    def _get_statistics(self, df: pd.DataFrame, numeric_cols: pd.Index) -> Dict[str, Any]:
+        """Descriptive statistics, skewness and kurtosis of the numeric columns"""
+        if len(numeric_cols) == 0:
+            return {}
+        
+        numeric = df[numeric_cols]
+        table = numeric.describe().T
+        table["skewness"] = numeric.skew().to_numpy()
+        table["kurtosis"] = numeric.kurt().to_numpy()
+        values = table.to_numpy(dtype=np.float64).round(4)
+        
+        return {
+            str(col): dict(zip(table.columns, map(float, values[i])))
+            for i, col in enumerate(numeric_cols)
+        }
+    
+    def _analyze_distributions(self, df: pd.DataFrame,
+                               numeric_cols: pd.Index) -> Dict[str, Any]:
+        """Histogram and skew-based shape of every numeric column"""
+        if len(numeric_cols) == 0:
+            return {}
+        
+        A = df[numeric_cols].to_numpy(dtype=np.float64)
+        skew = df[numeric_cols].skew().to_numpy()
+        results = {}
+        for j, col in enumerate(numeric_cols):
+            values = A[:, j]
+            values = values[np.isfinite(values)]
+            if len(values) == 0:
+                continue
+            
+            counts, edges = np.histogram(values, bins=HISTOGRAM_BINS)
+            if np.isnan(skew[j]):
+                shape = "unknown"
+            elif abs(skew[j]) < 0.5:
+                shape = "symmetric"
+            else:
+                shape = "right_skewed" if skew[j] > 0 else "left_skewed"
+            
+            results[str(col)] = {
+                "skewness": round(float(skew[j]), 4),
+                "shape": shape,
+                "histogram": {
+                    "counts": counts.tolist(),
+                    "bin_edges": edges.round(6).tolist()
+                }
+            }
+        
+        return results
+    
+    def _analyze_categorical(self, df: pd.DataFrame,
+                             categorical_cols: pd.Index) -> Dict[str, Any]:
+        """Cardinality and most frequent values of the categorical columns"""
+        results = {}
+        categorical = df[categorical_cols]
+        for j, col in enumerate(categorical_cols):
+            counts = categorical.iloc[:, j].value_counts()
+            results[str(col)] = {
+                "unique_values": len(counts),
+                "mode": str(counts.index[0]) if len(counts) else None,
+                "top_values": {
+                    str(value): int(count)
+                    for value, count in counts.head(TOP_CATEGORIES).items()
+                }
+            }
+        
+        return results
+    
+    def _assess_data_quality(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Completeness and column-level issues, folded into a 0-100 score"""
+        n = len(df)
+        missing = df.isnull().sum().to_numpy()
+        high_missing = missing > HIGH_MISSING_RATIO * n
+        constant = df.nunique().to_numpy() <= 1
+        
+        completeness = 1 - missing.sum() / max(df.size, 1)
+        clean_columns = 1 - (high_missing | constant).sum() / max(len(df.columns), 1)
+        
+        return {
+            "completeness": round(float(completeness) * 100, 2),
+            "quality_score": round(float(completeness + clean_columns) / 2 * 100, 1),
+            "issues": (
+                [{"column": str(col), "issue": "high_missing"}
+                 for col in df.columns[high_missing]]
+                + [{"column": str(col), "issue": "constant"}
+                   for col in df.columns[constant]]
+            )
+        }
+    
+    def _test_normality(self, df: pd.DataFrame, numeric_cols: pd.Index) -> Dict[str, Any]:
+        """Shapiro-Wilk test per numeric column, on a fixed-seed sample if large"""
+        if len(numeric_cols) == 0:
+            return {}
+        
+        rng = np.random.default_rng(0)
+        A = df[numeric_cols].to_numpy(dtype=np.float64)
+        results = {}
+        for j, col in enumerate(numeric_cols):
+            values = A[:, j]
+            values = values[np.isfinite(values)]
+            # The test is undefined for fewer than 3 values or a constant column
+            if len(values) < 3 or np.ptp(values) == 0:
+                continue
+            if len(values) > NORMALITY_MAX_SAMPLE:
+                values = rng.choice(values, NORMALITY_MAX_SAMPLE, replace=False)
+            
+            statistic, p_value = shapiro(values)
+            results[str(col)] = {
+                "test": "shapiro",
+                "sample_size": len(values),
+                "statistic": round(float(statistic), 4),
+                "p_value": float(p_value),
+                "is_normal": bool(p_value > NORMALITY_ALPHA)
+            }
+        
+        return results
+    
+    def _generate_recommendations(self, df: pd.DataFrame, numeric_cols: pd.Index,
+                                  categorical_cols: pd.Index) -> List[str]:
+        """Preprocessing suggestions derived from the frame's contents"""
+        recommendations = []
+        
+        missing = df.isnull().mean()
+        drop = missing[missing > HIGH_MISSING_RATIO].index
+        impute = missing[(missing > 0) & (missing <= HIGH_MISSING_RATIO)].index
+        if len(drop):
+            recommendations.append(
+                f"Consider dropping columns missing over {HIGH_MISSING_RATIO:.0%} "
+                f"of their values: {_names(drop)}"
+            )
+        if len(impute):
+            recommendations.append(f"Impute missing values in: {_names(impute)}")
+        
+        constant = df.columns[df.nunique().to_numpy() <= 1]
+        if len(constant):
+            recommendations.append(f"Drop constant columns: {_names(constant)}")
+        
+        if len(numeric_cols):
+            skew = df[numeric_cols].skew()
+            skewed = skew[skew.abs() > 1].index
+            if len(skewed):
+                recommendations.append(
+                    f"Apply a log or power transform to skewed columns: {_names(skewed)}"
+                )
+            
+            std = df[numeric_cols].std().to_numpy()
+            std = std[np.isfinite(std) & (std > 0)]
+            if len(std) > 1 and std.max() / std.min() > 100:
+                recommendations.append(
+                    "Scale numeric features; their spreads differ by orders of magnitude"
+                )
+        
+        if len(categorical_cols):
+            nunique = df[categorical_cols].nunique()
+            high = nunique[nunique > HIGH_CARDINALITY].index
+            if len(high):
+                recommendations.append(
+                    f"Use frequency or target encoding for high-cardinality columns: "
+                    f"{_names(high)}"
+                )
+        
+        return recommendations
+    
+    def compute_correlations(self, df: pd.DataFrame,
+                             numeric_cols: Optional[pd.Index] = None) -> pd.DataFrame:
+        """Pearson correlation matrix of the numeric columns"""
+        if numeric_cols is None:
+            numeric_cols = df.select_dtypes(include=[np.number]).columns
+        return correlation_matrix(df[numeric_cols])
+    
+    def _analyze_correlations(self, df: pd.DataFrame, numeric_cols: pd.Index,
+                              corr: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """Correlation matrix and strongly correlated column pairs"""
+        if corr is None:
+            corr = self.compute_correlations(df, numeric_cols)
+        
+        values = corr.to_numpy()
+        rows, cols = np.triu_indices(len(corr), k=1)
+        strong = np.abs(values[rows, cols]) >= STRONG_CORRELATION
+        
+        return {
+            "matrix": corr.round(3).astype(float).to_dict(),
+            "strong_correlations": [
+                {
+                    "column1": str(corr.index[i]),
+                    "column2": str(corr.columns[j]),
+                    "correlation": round(float(values[i, j]), 3)
+                }
+                for i, j in zip(rows[strong], cols[strong])
+            ]
+        }
+    
+    def _detect_outliers(self, df: pd.DataFrame, numeric_cols: pd.Index) -> Dict[str, Any]:
+        """IQR outlier bounds and counts for every numeric column"""
+        if len(numeric_cols) == 0 or len(df) == 0:
+            return {}
+        
+        # Column-major float32 block: one quantile call, then a single scan
+        A = np.asfortranarray(df[numeric_cols].to_numpy(dtype=np.float32))
+        q1, q3 = np.nanquantile(A, [0.25, 0.75], axis=0)
+        iqr = q3 - q1
+        lo = (q1 - 1.5 * iqr).astype(np.float32)
+        hi = (q3 + 1.5 * iqr).astype(np.float32)
+        counts = count_outliers(A, lo, hi)
+        
+        return {
+            str(col): {
+                "lower_bound": float(lo[j]),
+                "upper_bound": float(hi[j]),
+                "count": int(counts[j]),
+                "percentage": round(float(counts[j]) / len(df) * 100, 2)
+            }
+            for j, col in enumerate(numeric_cols)
+        }
+    
+    def _count_duplicates(self, df: pd.DataFrame) -> int:
+        """Count duplicate rows, hashing in Arrow for large frames"""
+        if len(df) > ARROW_DUPLICATES_MIN_ROWS and len(df.columns) > 0:
+            try:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                # Positional names: labels may be non-string or repeated
+                table = table.rename_columns([f"c{i}" for i in range(table.num_columns)])
+                distinct = table.group_by(table.column_names).aggregate([])
+                return len(df) - distinct.num_rows
+            except (pa.ArrowException, TypeError, ValueError):
+                # Mixed-type object columns and nested values stay on pandas
+                pass
+        
+        return int(df.duplicated().sum())
+    
     def _analyze_data_types(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """Analyze data types for each column"""
-        results = []
+        # One vectorized pass per statistic instead of per-column loops
+        n = len(df)
+        denom = max(n, 1)
+        nunique = df.nunique().to_numpy()
+        missing = df.isnull().sum().to_numpy()
+        dtypes = df.dtypes
+        kinds = np.array([dtype.kind for dtype in dtypes])
         
-        for col in df.columns:
-            col_info = {
+        # Infer semantic type
+        is_numeric = np.isin(kinds, ['i', 'u', 'f'])
+        is_textual = kinds == 'O'
+        semantic_types = np.select(
+            [
+                is_numeric & (nunique <= 10),
+                is_numeric & (nunique == n),
+                is_numeric,
+                kinds == 'b',
+                kinds == 'M',
+                is_textual & (nunique / denom < 0.5),
+                is_textual,
+            ],
+            [
+                "categorical_numeric",
+                "identifier",
+                "continuous",
+                "boolean",
+                "datetime",
+                "categorical",
+                "text",
+            ],
+            default="other"
+        )
+        
+        return [
+            {
                 "name": col,
-                "dtype": str(df[col].dtype),
-                "unique_values": int(df[col].nunique()),
-                "unique_percentage": round(df[col].nunique() / len(df) * 100, 2),
-                "missing": int(df[col].isnull().sum()),
-                "missing_percentage": round(df[col].isnull().sum() / len(df) * 100, 2)
+                "dtype": str(dtypes.iloc[i]),
+                "unique_values": int(nunique[i]),
+                "unique_percentage": round(float(nunique[i]) / denom * 100, 2),
+                "missing": int(missing[i]),
+                "missing_percentage": round(float(missing[i]) / denom * 100, 2),
+                "semantic_type": str(semantic_types[i])
             }
-            
-            # Infer semantic type
-            if df[col].dtype in ['int64', 'float64']:
-                if df[col].nunique() <= 10:
-                    col_info["semantic_type"] = "categorical_numeric"
-                elif df[col].nunique() == len(df):
-                    col_info["semantic_type"] = "identifier"
-                else:
-                    col_info["semantic_type"] = "continuous"
-            elif df[col].dtype
\ No newline at end of file
+            for i, col in enumerate(df.columns)
+        ]
@@ -3,14 +3,19 @@ AI Data Science Research Assistant - FastAPI Backend
 GPU-Accelerated ML Training with Full Feature Set
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
+from contextlib import asynccontextmanager
+from cachetools import LRUCache
 import pandas as pd
 import numpy as np
+import pyarrow.csv as pacsv
+import asyncio
 import json
-import io
+import logging
+import orjson
 import os
 
 # Import our modules
@@ -18,8 +23,52 @@ from app.ml_engine import MLEngine
 from app.preprocessing import DataPreprocessor
 from app.eda_engine import EDAEngine
 from app.explainability import ModelExplainer
-
-app = FastAPI(title="AI Data Science Assistant API", version="2.0.0")
+from app.utils.orjson_response import ORJSONResponse
+from app.db.database import close_db, init_db
+from app.db.repository import APILogRepository, DatasetRepository
+from app.services.dataset_store import DatasetStore, downcast_dtypes
+from app.services.redis_service import RedisService
+from app.services.enhanced_agent_service import EnhancedAgentService
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared clients and run background workers for the lifetime of the app"""
+    # One RedisService per process; route dependencies just read it off app.state
+    app.state.redis = RedisService()
+    await app.state.redis.connect()
+    # Built once: it holds the Gemini model and the tool instances
+    app.state.enhanced_agent = EnhancedAgentService(app.state.redis)
+    # The refresher and flusher read the engine, so it must exist before they start
+    await init_db()
+    
+    log_flusher = asyncio.create_task(APILogRepository.run_flusher())
+    # The materialized view only exists on migrated Postgres databases
+    view_refresher = None
+    if await DatasetRepository.detect_popular_datasets_view():
+        view_refresher = asyncio.create_task(DatasetRepository.run_view_refresher())
+    yield
+    if view_refresher is not None:
+        view_refresher.cancel()
+    # Write out queued API logs before the connection pool is disposed
+    log_flusher.cancel()
+    try:
+        await log_flusher
+    except asyncio.CancelledError:
+        pass
+    await close_db()
+    await app.state.redis.close()
+    ml_engine.close()
+
+
+app = FastAPI(
+    title="AI Data Science Assistant API",
+    version="2.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 # CORS
 app.add_middleware(
@@ -30,10 +79,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage
-datasets: Dict[str, pd.DataFrame] = {}
-trained_models: Dict[str, Any] = {}
-preprocessors: Dict[str, DataPreprocessor] = {}
+class EvictingLRUCache(LRUCache):
+    """LRUCache that reports the key of every entry it evicts"""
+    
+    def __init__(self, maxsize: int, on_evict=None):
+        super().__init__(maxsize=maxsize)
+        self.on_evict = on_evict
+    
+    def popitem(self):
+        key, value = super().popitem()
+        if self.on_evict:
+            self.on_evict(key)
+        return key, value
+
+
+def _drop_models_for_dataset(dataset_id: str):
+    """Models trained on a preprocessed dataset can't predict without its preprocessor"""
+    prefix = f"model_{dataset_id}_"
+    for model_id in [k for k in trained_models if k.startswith(prefix)]:
+        del trained_models[model_id]
+
+
+# Datasets live in Arrow files shared by all workers; models and fitted
+# preprocessors stay in memory, bounded so old entries are evicted
+MAX_TRAINED_MODELS = int(os.getenv("MAX_TRAINED_MODELS", "16"))
+MAX_PREPROCESSORS = int(os.getenv("MAX_PREPROCESSORS", "32"))
+
+dataset_store = DatasetStore()
+trained_models: LRUCache = LRUCache(maxsize=MAX_TRAINED_MODELS)
+preprocessors: EvictingLRUCache = EvictingLRUCache(
+    maxsize=MAX_PREPROCESSORS, on_evict=_drop_models_for_dataset
+)
 
 # Initialize engines
 ml_engine = MLEngine()
@@ -82,62 +158,84 @@ def health():
 # ==================== DATASET ENDPOINTS ====================
 
 @app.post("/api/dataset/upload")
-async def upload_dataset(file: UploadFile = File(...)):
+def upload_dataset(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     try:
-        content = await file.read()
-        
+        # Parse straight from the spooled upload instead of copying it into bytes
         if file.filename.endswith('.csv'):
-            df = pd.read_csv(io.BytesIO(content))
+            table = pacsv.read_csv(
+                file.file,
+                read_options=pacsv.ReadOptions(use_threads=True, block_size=1 << 24)
+            )
+            # Release Arrow buffers column by column while converting
+            df = table.to_pandas(split_blocks=True, self_destruct=True)
+            del table
         elif file.filename.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(io.BytesIO(content))
+            df = pd.read_excel(file.file)
         else:
             raise HTTPException(400, "Unsupported file format")
         
-        dataset_id = f"ds_{len(datasets)}_{file.filename.split('.')[0]}"
-        datasets[dataset_id] = df
+        df = downcast_dtypes(df)
+        dataset_id = f"ds_{dataset_store.next_id()}_{file.filename.split('.')[0]}"
+        dataset_store.save(dataset_id, df)
+        background_tasks.add_task(precompute_eda, dataset_id, df)
         
-        return {
+        # Returned as a Response so the pre-encoded rows skip jsonable_encoder
+        return ORJSONResponse(content={
             "id": dataset_id,
             "name": file.filename,
             "headers": df.columns.tolist(),
-            "rows": df.head(100).to_dict('records'),
+            "rows": records_json(df.head(100)),
             "rowCount": len(df),
             "colCount": len(df.columns),
             "dtypes": df.dtypes.astype(str).to_dict()
-        }
+        })
     except Exception as e:
         raise HTTPException(500, str(e))
 
+def load_dataset(dataset_id: str, rows: Optional[int] = None) -> pd.DataFrame:
+    """Load a stored dataset or raise 404, with a single Redis lookup"""
+    try:
+        return dataset_store.load(dataset_id, rows=rows)
+    except KeyError:
+        raise HTTPException(404, "Dataset not found")
+
+def records_json(df: pd.DataFrame) -> orjson.Fragment:
+    """Rows encoded by pandas' JSON writer, embedded as-is by orjson"""
+    return orjson.Fragment(df.to_json(orient="records", date_format="iso"))
+
+def precompute_eda(dataset_id: str, df: pd.DataFrame):
+    """Compute the correlation matrix after the upload response is sent"""
+    try:
+        dataset_store.cache_frame("corr", dataset_id, eda_engine.compute_correlations(df))
+    except Exception as e:
+        logger.error(f"Correlation precompute failed for {dataset_id}: {e}")
+
 @app.get("/api/dataset/{dataset_id}")
 def get_dataset(dataset_id: str, rows: int = 100):
-    if dataset_id not in datasets:
+    meta = dataset_store.meta(dataset_id)
+    if meta is None:
         raise HTTPException(404, "Dataset not found")
     
-    df = datasets[dataset_id]
-    return {
+    # Only the requested prefix is converted out of the memory-mapped file
+    head = dataset_store.load(dataset_id, rows=rows, path=meta["path"])
+    return ORJSONResponse(content={
         "id": dataset_id,
-        "headers": df.columns.tolist(),
-        "rows": df.head(rows).to_dict('records'),
-        "rowCount": len(df),
-        "colCount": len(df.columns)
-    }
+        "headers": meta["columns"],
+        "rows": records_json(head),
+        "rowCount": meta["nrows"],
+        "colCount": meta["ncols"]
+    })
 
 @app.get("/api/dataset/list")
 def list_datasets():
-    return [
-        {"id": k, "rows": len(v), "cols": len(v.columns)}
-        for k, v in datasets.items()
-    ]
+    return dataset_store.list()
 
 # ==================== PREPROCESSING ENDPOINTS ====================
 
 @app.post("/api/preprocess")
 def preprocess_data(request: PreprocessRequest):
-    if request.dataset_id not in datasets:
-        raise HTTPException(404, "Dataset not found")
-    
-    df = datasets[request.dataset_id].copy()
-    preprocessor = DataPreprocessor()
+    df = load_dataset(request.dataset_id)
+    preprocessor = DataPreprocessor(cache_dir=os.getenv("PREPROCESS_CACHE_DIR"))
     
     result = preprocessor.fit_transform(
         df,
@@ -150,7 +248,7 @@ def preprocess_data(request: PreprocessRequest):
     
     # Store preprocessed data
     new_id = f"{request.dataset_id}_processed"
-    datasets[new_id] = result['data']
+    dataset_store.save(new_id, result['data'])
     preprocessors[new_id] = preprocessor
     
     return {
@@ -177,19 +275,20 @@ def get_preprocessing_options():
 
 @app.post("/api/eda/analyze")
 def run_eda(dataset_id: str):
-    if dataset_id not in datasets:
-        raise HTTPException(404, "Dataset not found")
+    df = load_dataset(dataset_id)
     
-    df = datasets[dataset_id]
-    results = eda_engine.full_analysis(df)
-    return results
+    # Identical data always yields the same report; serve it from Redis
+    digest = dataset_store.content_hash(df)
+    cached = dataset_store.get_cached_result("eda", digest)
+    if cached is None:
+        correlations = dataset_store.get_cached_frame("corr", dataset_id)
+        results = eda_engine.full_analysis(df, correlations=correlations)
+        cached = dataset_store.cache_result("eda", digest, results)
+    return Response(content=cached, media_type="application/json")
 
 @app.post("/api/eda/statistical-tests")
 def statistical_tests(dataset_id: str, column1: str, column2: Optional[str] = None):
-    if dataset_id not in datasets:
-        raise HTTPException(404, "Dataset not found")
-    
-    df = datasets[dataset_id]
+    df = load_dataset(dataset_id)
     results = eda_engine.statistical_tests(df, column1, column2)
     return results
 
@@ -197,10 +296,7 @@ def statistical_tests(dataset_id: str, column1: str, column2: Optional[str] = No
 
 @app.post("/api/ml/train")
 def train_models(request: TrainRequest):
-    if request.dataset_id not in datasets:
-        raise HTTPException(404, "Dataset not found")
-    
-    df = datasets[request.dataset_id]
+    df = load_dataset(request.dataset_id)
     
     if request.target_column not in df.columns:
         raise HTTPException(400, f"Target column '{request.target_column}' not found")
@@ -232,14 +328,12 @@ def gpu_status():
 def get_shap_values(dataset_id: str, model_id: str, num_samples: int = 100):
     if model_id not in trained_models:
         raise HTTPException(404, "Model not found")
-    if dataset_id not in datasets:
-        raise HTTPException(404, "Dataset not found")
     
     model = trained_models[model_id]
-    df = datasets[dataset_id]
+    df = load_dataset(dataset_id, rows=num_samples)
     
     explainer = ModelExplainer(model)
-    shap_results = explainer.compute_shap(df.head(num_samples))
+    shap_results = explainer.compute_shap(df)
     
     return shap_results
 
@@ -263,9 +357,19 @@ def predict(request: PredictRequest):
     model_data = trained_models[request.model_id]
     df = pd.DataFrame(request.data)
     
+    # Reapply the ingest categoricals the model (or its preprocessor) was fit
+    # on; numeric columns keep their parsed dtype, since casting user input to
+    # a downcast int32 would silently wrap out-of-range values
+    meta = dataset_store.meta(request.dataset_id.removesuffix("_processed"))
+    if meta:
+        df = df.astype({
+            c: t for c, t in meta["dtypes"].items()
+            if c in df.columns and t == "category"
+        })
+    
     # Apply preprocessing if available
     if request.dataset_id in preprocessors:
-        df = preprocessors[request.dataset_id].transform(df)
+        df = preprocessors[request.dataset_id].compiled_transform()(df)
     
     predictions = model_data['model'].predict(df)
     
@@ -3,29 +3,481 @@ GPU-Accelerated Machine Learning Engine
 Supports 40+ models with hyperparameter tuning
 """
 
+import os
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Optional, Tuple
-from sklearn.model_selection import train_test_split, cross_val_score, StratifiedKFold, KFold
-from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score,
-    r2_score, mean_squared_error, mean_absolute_error,
+from scipy import sparse
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+# On CUDA hosts with RAPIDS installed, cuml.accel routes the estimators it
+# supports to GPU kernels (falling back to CPU otherwise). Like sklearnex it
+# hooks sklearn imports, so both have to run before the imports below.
+CUML_ACCEL_ENABLED = False
+try:
+    from cuml.accel import install as install_cuml_accel
+    install_cuml_accel()
+    CUML_ACCEL_ENABLED = True
+except (ImportError, RuntimeError):
+    pass
+
+# Intel's scikit-learn extension swaps in oneDAL (SIMD/MKL) implementations of
+# SVM, KNN, forests and linear models; it must patch before sklearn imports.
+# Set ML_DISABLE_SKLEARNEX=1 to compare against stock scikit-learn.
+SKLEARNEX_ENABLED = False
+if not CUML_ACCEL_ENABLED and os.getenv("ML_DISABLE_SKLEARNEX", "0") != "1":
+    try:
+        from sklearnex import patch_sklearn
+        patch_sklearn(verbose=False)
+        SKLEARNEX_ENABLED = True
+    except ImportError:
+        pass
+
+from sklearn.model_selection import (  # noqa: E402
+    cross_validate, StratifiedKFold, KFold, StratifiedShuffleSplit, ShuffleSplit
+)
+from sklearn.metrics import (  # noqa: E402
+    accuracy_score, precision_recall_fscore_support, r2_score,
     confusion_matrix, classification_report, roc_auc_score, roc_curve
 )
-from sklearn.preprocessing import LabelEncoder, StandardScaler
-import warnings
-import time
-import joblib
+from sklearn.preprocessing import StandardScaler  # noqa: E402
+from sklearn.base import clone  # noqa: E402
+from sklearn.linear_model import (  # noqa: E402
+    LogisticRegression, RidgeClassifier, SGDClassifier,
+    PassiveAggressiveClassifier, Perceptron,
+    LinearRegression, Ridge, Lasso, ElasticNet, BayesianRidge,
+    SGDRegressor, PassiveAggressiveRegressor, Lars, LassoLars,
+    OrthogonalMatchingPursuit, HuberRegressor, RANSACRegressor, TheilSenRegressor
+)
+from sklearn.ensemble import (  # noqa: E402
+    RandomForestClassifier, ExtraTreesClassifier,
+    GradientBoostingClassifier, AdaBoostClassifier,
+    BaggingClassifier, HistGradientBoostingClassifier,
+    RandomForestRegressor, ExtraTreesRegressor,
+    GradientBoostingRegressor, AdaBoostRegressor,
+    BaggingRegressor, HistGradientBoostingRegressor
+)
+from sklearn.svm import SVC, NuSVC, SVR, NuSVR  # noqa: E402
+from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor  # noqa: E402
+from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor  # noqa: E402
+from sklearn.naive_bayes import GaussianNB, BernoulliNB  # noqa: E402
+from sklearn.discriminant_analysis import LinearDiscriminantAnalysis, QuadraticDiscriminantAnalysis  # noqa: E402
+from sklearn.neural_network import MLPClassifier, MLPRegressor  # noqa: E402
+from sklearn.kernel_ridge import KernelRidge  # noqa: E402
+import functools  # noqa: E402
+import math  # noqa: E402
+import warnings  # noqa: E402
+import time  # noqa: E402
+import joblib  # noqa: E402
+from joblib import Parallel, delayed  # noqa: E402
 
 warnings.filterwarnings('ignore')
 
+# Optional gradient boosting libraries
+try:
+    import xgboost as xgb
+except ImportError:
+    xgb = None
+
+try:
+    import lightgbm as lgb
+except ImportError:
+    lgb = None
+
+try:
+    from catboost import CatBoostClassifier, CatBoostRegressor
+except ImportError:
+    CatBoostClassifier = CatBoostRegressor = None
+
+
+# Estimator factories, built once at import; instances are created per training run
+_CLASSIFIER_FACTORIES: Dict[str, Callable[[], Any]] = {
+    # Boosting
+    "Gradient Boosting": lambda: GradientBoostingClassifier(n_estimators=100, random_state=42),
+    "Histogram Gradient Boosting": lambda: HistGradientBoostingClassifier(random_state=42),
+    "AdaBoost": lambda: AdaBoostClassifier(n_estimators=100, random_state=42),
+    
+    # Ensemble
+    "Random Forest": lambda: RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1),
+    "Extra Trees": lambda: ExtraTreesClassifier(n_estimators=100, random_state=42, n_jobs=-1),
+    "Bagging Classifier": lambda: BaggingClassifier(n_estimators=50, random_state=42, n_jobs=-1),
+    
+    # Linear
+    "Logistic Regression": lambda: LogisticRegression(max_iter=1000, random_state=42, n_jobs=-1),
+    "Ridge Classifier": lambda: RidgeClassifier(random_state=42),
+    "SGD Classifier": lambda: SGDClassifier(max_iter=1000, random_state=42, n_jobs=-1),
+    "Passive Aggressive": lambda: PassiveAggressiveClassifier(max_iter=1000, random_state=42, n_jobs=-1),
+    "Perceptron": lambda: Perceptron(max_iter=1000, random_state=42, n_jobs=-1),
+    
+    # SVM
+    "SVM (RBF)": lambda: SVC(kernel='rbf', probability=True, random_state=42),
+    "SVM (Linear)": lambda: SVC(kernel='linear', probability=True, random_state=42),
+    "SVM (Polynomial)": lambda: SVC(kernel='poly', probability=True, random_state=42),
+    "NuSVC": lambda: NuSVC(probability=True, random_state=42),
+    
+    # Neural Network
+    "Neural Network (MLP)": lambda: MLPClassifier(hidden_layer_sizes=(100, 50), max_iter=500, random_state=42),
+    
+    # Tree
+    "Decision Tree": lambda: DecisionTreeClassifier(random_state=42),
+    
+    # Distance
+    "K-Nearest Neighbors": lambda: KNeighborsClassifier(n_neighbors=5, n_jobs=-1),
+    
+    # Probabilistic
+    "Gaussian Naive Bayes": lambda: GaussianNB(),
+    "Bernoulli Naive Bayes": lambda: BernoulliNB(),
+    
+    # Discriminant
+    "Linear Discriminant Analysis": lambda: LinearDiscriminantAnalysis(),
+    "Quadratic Discriminant Analysis": lambda: QuadraticDiscriminantAnalysis(),
+}
+
+_REGRESSOR_FACTORIES: Dict[str, Callable[[], Any]] = {
+    # Boosting
+    "Gradient Boosting": lambda: GradientBoostingRegressor(n_estimators=100, random_state=42),
+    "Histogram Gradient Boosting": lambda: HistGradientBoostingRegressor(random_state=42),
+    "AdaBoost": lambda: AdaBoostRegressor(n_estimators=100, random_state=42),
+    
+    # Ensemble
+    "Random Forest": lambda: RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1),
+    "Extra Trees": lambda: ExtraTreesRegressor(n_estimators=100, random_state=42, n_jobs=-1),
+    "Bagging Regressor": lambda: BaggingRegressor(n_estimators=50, random_state=42, n_jobs=-1),
+    
+    # Linear
+    "Linear Regression": lambda: LinearRegression(n_jobs=-1),
+    "Ridge Regression": lambda: Ridge(random_state=42),
+    "Lasso Regression": lambda: Lasso(random_state=42),
+    "ElasticNet": lambda: ElasticNet(random_state=42),
+    "Bayesian Ridge": lambda: BayesianRidge(),
+    "SGD Regressor": lambda: SGDRegressor(max_iter=1000, random_state=42),
+    "Passive Aggressive Regressor": lambda: PassiveAggressiveRegressor(max_iter=1000, random_state=42),
+    "LARS": lambda: Lars(random_state=42),
+    "LARS Lasso": lambda: LassoLars(random_state=42),
+    "Orthogonal Matching Pursuit": lambda: OrthogonalMatchingPursuit(),
+    
+    # Robust
+    "Huber Regressor": lambda: HuberRegressor(max_iter=1000),
+    "RANSAC Regressor": lambda: RANSACRegressor(random_state=42),
+    "Theil-Sen Regressor": lambda: TheilSenRegressor(random_state=42, n_jobs=-1),
+    
+    # Kernel
+    "Kernel Ridge": lambda: KernelRidge(kernel='rbf'),
+    
+    # SVM
+    "SVR (RBF)": lambda: SVR(kernel='rbf'),
+    "SVR (Linear)": lambda: SVR(kernel='linear'),
+    "SVR (Polynomial)": lambda: SVR(kernel='poly'),
+    "NuSVR": lambda: NuSVR(),
+    
+    # Neural Network
+    "Neural Network (MLP)": lambda: MLPRegressor(hidden_layer_sizes=(100, 50), max_iter=500, random_state=42),
+    
+    # Tree
+    "Decision Tree": lambda: DecisionTreeRegressor(random_state=42),
+    
+    # Distance
+    "K-Nearest Neighbors": lambda: KNeighborsRegressor(n_neighbors=5, n_jobs=-1),
+}
+
+
+# Keyword lists per category; the first category with a matching keyword wins
+_CATEGORY_KEYWORDS = {
+    "Boosting": ["XGBoost", "LightGBM", "CatBoost", "Gradient Boosting", "AdaBoost", "Histogram"],
+    "Ensemble": ["Random Forest", "Extra Trees", "Bagging", "Voting", "Stacking"],
+    "Linear": ["Linear", "Ridge", "Lasso", "Elastic", "Bayesian", "SGD", "Passive", "Perceptron", "LARS", "Orthogonal"],
+    "SVM": ["SVM", "SVR", "NuSV"],
+    "Neural Network": ["Neural Network", "MLP"],
+    "Tree": ["Decision Tree"],
+    "Distance": ["Neighbor", "KNN"],
+    "Probabilistic": ["Naive Bayes", "Gaussian NB", "Bernoulli", "Multinomial", "Complement"],
+    "Discriminant": ["Discriminant", "LDA", "QDA"],
+    "Robust": ["Huber", "RANSAC", "Theil"],
+    "Kernel": ["Kernel Ridge"],
+    "Gaussian Process": ["Gaussian Process"]
+}
+_CATEGORY_KEYWORDS_LOWER = [
+    (category, [keyword.lower() for keyword in keywords])
+    for category, keywords in _CATEGORY_KEYWORDS.items()
+]
+
+
+def _match_category(model_name: str) -> str:
+    """Category of a model name by keyword scan"""
+    name = model_name.lower()
+    for category, keywords in _CATEGORY_KEYWORDS_LOWER:
+        for keyword in keywords:
+            if keyword in name:
+                return category
+    return "Other"
+
+
+# Categories of every model this engine can train, resolved once at import
+_MODEL_CATEGORY = {
+    name: _match_category(name)
+    for name in [*_CLASSIFIER_FACTORIES, *_REGRESSOR_FACTORIES, "XGBoost", "LightGBM", "CatBoost"]
+}
+
+
+@functools.lru_cache(maxsize=2)
+def _classifier_factories(gpu: bool) -> Dict[str, Callable[[], Any]]:
+    """All classifier factories, with boosting libraries on GPU when requested"""
+    factories = dict(_CLASSIFIER_FACTORIES)
+    
+    if xgb is not None:
+        if gpu:
+            factories["XGBoost"] = lambda: xgb.XGBClassifier(
+                n_estimators=100, device='cuda', tree_method='hist', max_bin=64,
+                random_state=42, eval_metric='logloss'
+            )
+        else:
+            factories["XGBoost"] = lambda: xgb.XGBClassifier(n_estimators=100, random_state=42)
+    
+    if lgb is not None:
+        if gpu:
+            factories["LightGBM"] = lambda: lgb.LGBMClassifier(
+                n_estimators=100, device='gpu', max_bin=63, gpu_use_dp=False,
+                random_state=42, verbose=-1
+            )
+        else:
+            factories["LightGBM"] = lambda: lgb.LGBMClassifier(n_estimators=100, random_state=42, verbose=-1)
+    
+    if CatBoostClassifier is not None:
+        if gpu:
+            factories["CatBoost"] = lambda: CatBoostClassifier(
+                iterations=100, task_type='GPU', devices='0',
+                random_state=42, verbose=False
+            )
+        else:
+            factories["CatBoost"] = lambda: CatBoostClassifier(iterations=100, random_state=42, verbose=False)
+    
+    return factories
+
+
+@functools.lru_cache(maxsize=2)
+def _regressor_factories(gpu: bool) -> Dict[str, Callable[[], Any]]:
+    """All regressor factories, with boosting libraries on GPU when requested"""
+    factories = dict(_REGRESSOR_FACTORIES)
+    
+    if xgb is not None:
+        if gpu:
+            factories["XGBoost"] = lambda: xgb.XGBRegressor(
+                n_estimators=100, device='cuda', tree_method='hist', max_bin=64, random_state=42
+            )
+        else:
+            factories["XGBoost"] = lambda: xgb.XGBRegressor(n_estimators=100, random_state=42)
+    
+    if lgb is not None:
+        if gpu:
+            factories["LightGBM"] = lambda: lgb.LGBMRegressor(
+                n_estimators=100, device='gpu', max_bin=63, gpu_use_dp=False,
+                random_state=42, verbose=-1
+            )
+        else:
+            factories["LightGBM"] = lambda: lgb.LGBMRegressor(n_estimators=100, random_state=42, verbose=-1)
+    
+    if CatBoostRegressor is not None:
+        if gpu:
+            factories["CatBoost"] = lambda: CatBoostRegressor(
+                iterations=100, task_type='GPU', devices='0', random_state=42, verbose=False
+            )
+        else:
+            factories["CatBoost"] = lambda: CatBoostRegressor(iterations=100, random_state=42, verbose=False)
+    
+    return factories
+
+
+# Models that cuml.accel runs on the GPU
+_CUML_ACCELERATED = {
+    "Random Forest", "K-Nearest Neighbors", "Logistic Regression",
+    "Linear Regression", "Ridge Regression", "Lasso Regression", "ElasticNet",
+    "SVM (RBF)", "SVM (Linear)", "SVM (Polynomial)", "SVR (RBF)", "SVR (Linear)", "SVR (Polynomial)",
+}
+
+# Kernel/robust estimators with O(N^2)+ training cost, only fitted on up to
+# MAX_KERNEL_SAMPLES rows
+MAX_KERNEL_SAMPLES = 10_000
+_KERNEL_MODEL_PREFIXES = ("SVM", "SVR", "NuSV", "Kernel Ridge", "Theil-Sen")
+
+# Estimators with per-feature covariance work, only fitted up to
+# MAX_COVARIANCE_FEATURES features
+MAX_COVARIANCE_FEATURES = 5000
+_COVARIANCE_MODELS = {"Quadratic Discriminant Analysis", "Gaussian Naive Bayes"}
+
+
+def _estimator_is_tractable(name: str, n_samples: int, n_features: int) -> bool:
+    """Whether a model is cheap enough to fit on data of this shape"""
+    if n_samples > MAX_KERNEL_SAMPLES and name.startswith(_KERNEL_MODEL_PREFIXES):
+        return False
+    if n_features > MAX_COVARIANCE_FEATURES and name in _COVARIANCE_MODELS:
+        return False
+    return True
+
+
+# Tree-based models, unaffected by feature scaling
+_SCALE_INSENSITIVE = {
+    "Random Forest", "Extra Trees", "Gradient Boosting", "Histogram Gradient Boosting",
+    "AdaBoost", "Bagging Classifier", "Bagging Regressor", "Decision Tree",
+    "XGBoost", "LightGBM", "CatBoost",
+}
+
+# Estimators trained on float64 features; everything else takes float32
+_FLOAT64_ESTIMATORS = (MLPClassifier, MLPRegressor)
+
+# Features are stored as CSR once more than this share of values is zero
+SPARSE_MIN_ZERO_RATIO = 0.5
+
+# Estimators that reject sparse input and get a dense copy instead
+_DENSE_ONLY_ESTIMATORS = (
+    GaussianNB, LinearDiscriminantAnalysis, QuadraticDiscriminantAnalysis,
+    HistGradientBoostingClassifier, HistGradientBoostingRegressor,
+    BayesianRidge, Lars, LassoLars, OrthogonalMatchingPursuit, TheilSenRegressor,
+)
+
+
+def _cross_val_scores(model, X, y, cv_splits, scoring, data_key):
+    """
+    Cross-validated scores of an unfitted estimator, plus the estimator
+    fitted on the first fold
+    Cached through MLEngine.memory: X and y are excluded from the cache key
+    and identified by data_key, so large arrays aren't re-hashed per model.
+    """
+    cv_results = cross_validate(
+        model, X, y, cv=cv_splits, scoring=scoring, return_estimator=True
+    )
+    return cv_results["test_score"], cv_results["estimator"][0]
+
+
+def _xgb_cv_scores(model, X, y, cv_splits, scoring, data_key):
+    """
+    Cross-validated scores of an XGBoost estimator on one shared DMatrix
+    The training data is converted once and each fold is a slice of it,
+    instead of cross_validate rebuilding a DMatrix from NumPy per fold.
+    Cached like _cross_val_scores; the fold boosters aren't sklearn models,
+    so no fitted estimator is returned.
+    """
+    params = model.get_xgb_params()
+    n_classes = len(np.unique(y)) if scoring == 'accuracy' else 0
+    if n_classes > 2:
+        params.update(objective='multi:softmax', num_class=n_classes)
+    num_rounds = model.n_estimators or 100
+    
+    dall = xgb.DMatrix(X, label=y)
+    scores = []
+    for train_idx, test_idx in cv_splits:
+        booster = xgb.train(params, dall.slice(train_idx), num_boost_round=num_rounds)
+        y_pred = booster.predict(dall.slice(test_idx))
+        if scoring == 'accuracy':
+            if n_classes <= 2:
+                y_pred = y_pred > 0.5
+            scores.append(accuracy_score(y[test_idx], y_pred.astype(y.dtype)))
+        else:
+            scores.append(r2_score(y[test_idx], y_pred))
+    return np.array(scores), None
+
+
+def _training_view(model, X):
+    """A feature matrix in the layout and precision an estimator needs"""
+    if sparse.issparse(X) and isinstance(model, _DENSE_ONLY_ESTIMATORS):
+        X = X.toarray()
+    
+    # Features arrive as float32; only the MLPs get a float64 copy
+    if isinstance(model, _FLOAT64_ESTIMATORS):
+        X = X.astype(np.float64)
+    return X
+
+
+def _fit_and_score(model, X_train, y_train, X_test, y_test, task_type, cv_splits, with_proba, cv_scorer):
+    """
+    Fit one estimator, score it on the holdout set and cross-validate it
+    Module-level so joblib can run it in worker processes. with_proba adds
+    ROC AUC (binary tasks, models with predict_proba).
+    Returns (fitted_model, metrics, score, train_time, error).
+    """
+    try:
+        # Monotonic, high-resolution clock for the per-model timing
+        t0 = time.perf_counter_ns()
+        
+        X_train = _training_view(model, X_train)
+        X_test = _training_view(model, X_test)
+        
+        # Cross-validation; the first fold's estimator doubles as the holdout
+        # model, saving a separate fit on the whole training split per
+        # candidate (train_all_models refits only the winner on all of it)
+        scoring = 'accuracy' if task_type == "classification" else 'r2'
+        fitted = None
+        try:
+            cv_scores, fitted = cv_scorer(clone(model), X_train, y_train, cv_splits, scoring)
+            cv_mean = float(cv_scores.mean())
+            cv_std = float(cv_scores.std())
+        except:
+            cv_mean = None
+            cv_std = None
+        
+        # Train (only when CV didn't leave a fitted estimator)
+        if fitted is None:
+            model.fit(X_train, y_train)
+        else:
+            model = fitted
+        
+        # Predict
+        y_pred = model.predict(X_test)
+        
+        # Calculate metrics
+        if task_type == "classification":
+            # One validation/confusion pass for all three weighted scores
+            precision, recall, f1, _ = precision_recall_fscore_support(
+                y_test, y_pred, average='weighted', zero_division=0
+            )
+            metrics = {
+                "accuracy": float(np.mean(y_test == y_pred)),
+                "precision": float(precision),
+                "recall": float(recall),
+                "f1": float(f1),
+            }
+            
+            # ROC AUC for binary classification
+            if with_proba:
+                y_proba = model.predict_proba(X_test)[:, 1]
+                metrics["roc_auc"] = float(roc_auc_score(y_test, y_proba))
+            
+            score = metrics["accuracy"]
+        else:
+            # Residuals are materialized once and shared by every metric
+            resid = np.asarray(y_test, dtype=np.float64) - np.asarray(y_pred, dtype=np.float64)
+            mse = float(np.mean(resid * resid))
+            var = float(np.var(y_test))
+            metrics = {
+                # Same edge cases as r2_score for a constant target
+                "r2": 1 - mse / var if var > 0 else float(mse == 0),
+                "rmse": math.sqrt(mse),
+                "mae": float(np.mean(np.abs(resid))),
+            }
+            score = metrics["r2"]
+        
+        metrics["cv_mean"] = cv_mean
+        metrics["cv_std"] = cv_std
+        
+        # Training time
+        train_time = (time.perf_counter_ns() - t0) * 1e-9
+        
+        return model, metrics, score, train_time, None
+    
+    except Exception as e:
+        return None, None, None, None, str(e)
+
+
 class MLEngine:
     def __init__(self):
         self.gpu_available = False
         self.gpu_name = "CPU Only"
+        self.sklearnex_enabled = SKLEARNEX_ENABLED
+        self.gpu_memory_pool = None
         self._check_gpu()
         self.models = {}
         self.best_model = None
+        # On-disk cache of cross-validation scores, reused across training runs
+        self.memory = joblib.Memory(location=os.getenv("ML_CACHE_DIR", ".ml_cache"), verbose=0)
+        self.memory.reduce_size(bytes_limit="2G")
         
     def _check_gpu(self):
         """Check for GPU availability"""
@@ -36,6 +488,7 @@ class MLEngine:
                 self.gpu_available = True
                 self.gpu_name = torch.cuda.get_device_name(0)
                 print(f"✅ GPU Found: {self.gpu_name}")
+                self._init_gpu_memory(torch)
                 return
         except ImportError:
             pass
@@ -54,6 +507,29 @@ class MLEngine:
         
         print("⚠️ No GPU detected, using CPU")
     
+    def _init_gpu_memory(self, torch):
+        """
+        Share one pooled allocator across all GPU model fits
+        CuPy (used by cuML) otherwise pays a synchronous cudaMalloc/cudaFree per
+        array; freed blocks now stay in the pool until close(). PyTorch keeps
+        its caching allocator but is capped so both pools fit on the device.
+        """
+        torch.cuda.set_per_process_memory_fraction(0.8)
+        if xgb is not None:
+            # Only takes effect when XGBoost is built with RMM
+            xgb.set_config(verbosity=0, use_rmm=True)
+        try:
+            import cupy
+            self.gpu_memory_pool = cupy.cuda.MemoryPool(cupy.cuda.malloc_managed)
+            cupy.cuda.set_allocator(self.gpu_memory_pool.malloc)
+        except ImportError:
+            pass
+    
+    def close(self):
+        """Release pooled GPU memory back to the driver"""
+        if self.gpu_memory_pool is not None:
+            self.gpu_memory_pool.free_all_blocks()
+    
     def get_gpu_status(self) -> Dict[str, Any]:
         """Get detailed GPU status"""
         status = {
@@ -61,7 +537,9 @@ class MLEngine:
             "gpu_name": self.gpu_name,
             "cuda_version": None,
             "memory_total": None,
-            "memory_used": None
+            "memory_used": None,
+            "sklearnex_enabled": self.sklearnex_enabled,
+            "cuml_accel_enabled": CUML_ACCEL_ENABLED
         }
         
         try:
@@ -75,235 +553,23 @@ class MLEngine:
         
         return status
     
-    def _get_classification_models(self, use_gpu: bool = True) -> Dict[str, Any]:
-        """Get all classification models"""
-        from sklearn.linear_model import (
-            LogisticRegression, RidgeClassifier, SGDClassifier,
-            PassiveAggressiveClassifier, Perceptron
-        )
-        from sklearn.ensemble import (
-            RandomForestClassifier, ExtraTreesClassifier, 
-            GradientBoostingClassifier, AdaBoostClassifier,
-            BaggingClassifier, VotingClassifier, StackingClassifier,
-            HistGradientBoostingClassifier
-        )
-        from sklearn.svm import SVC, NuSVC, LinearSVC
-        from sklearn.neighbors import KNeighborsClassifier, RadiusNeighborsClassifier
-        from sklearn.tree import DecisionTreeClassifier
-        from sklearn.naive_bayes import GaussianNB, MultinomialNB, BernoulliNB, ComplementNB
-        from sklearn.discriminant_analysis import LinearDiscriminantAnalysis, QuadraticDiscriminantAnalysis
-        from sklearn.neural_network import MLPClassifier
-        from sklearn.gaussian_process import GaussianProcessClassifier
-        
-        models = {
-            # Boosting
-            "Gradient Boosting": GradientBoostingClassifier(n_estimators=100, random_state=42),
-            "Histogram Gradient Boosting": HistGradientBoostingClassifier(random_state=42),
-            "AdaBoost": AdaBoostClassifier(n_estimators=100, random_state=42),
-            
-            # Ensemble
-            "Random Forest": RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1),
-            "Extra Trees": ExtraTreesClassifier(n_estimators=100, random_state=42, n_jobs=-1),
-            "Bagging Classifier": BaggingClassifier(n_estimators=50, random_state=42, n_jobs=-1),
-            
-            # Linear
-            "Logistic Regression": LogisticRegression(max_iter=1000, random_state=42, n_jobs=-1),
-            "Ridge Classifier": RidgeClassifier(random_state=42),
-            "SGD Classifier": SGDClassifier(max_iter=1000, random_state=42, n_jobs=-1),
-            "Passive Aggressive": PassiveAggressiveClassifier(max_iter=1000, random_state=42, n_jobs=-1),
-            "Perceptron": Perceptron(max_iter=1000, random_state=42, n_jobs=-1),
-            
-            # SVM
-            "SVM (RBF)": SVC(kernel='rbf', probability=True, random_state=42),
-            "SVM (Linear)": SVC(kernel='linear', probability=True, random_state=42),
-            "SVM (Polynomial)": SVC(kernel='poly', probability=True, random_state=42),
-            "NuSVC": NuSVC(probability=True, random_state=42),
-            
-            # Neural Network
-            "Neural Network (MLP)": MLPClassifier(hidden_layer_sizes=(100, 50), max_iter=500, random_state=42),
-            
-            # Tree
-            "Decision Tree": DecisionTreeClassifier(random_state=42),
-            
-            # Distance
-            "K-Nearest Neighbors": KNeighborsClassifier(n_neighbors=5, n_jobs=-1),
-            
-            # Probabilistic
-            "Gaussian Naive Bayes": GaussianNB(),
-            "Bernoulli Naive Bayes": BernoulliNB(),
-            
-            # Discriminant
-            "Linear Discriminant Analysis": LinearDiscriminantAnalysis(),
-            "Quadratic Discriminant Analysis": QuadraticDiscriminantAnalysis(),
+    def _get_classification_models(self, use_gpu: bool = True,
+                                   names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get classification models (all, or only those in names)"""
+        factories = _classifier_factories(use_gpu and self.gpu_available)
+        return {
+            name: factory() for name, factory in factories.items()
+            if names is None or name in names
         }
-        
-        # Add GPU-accelerated models
-        if use_gpu and self.gpu_available:
-            try:
-                import xgboost as xgb
-                models["XGBoost"] = xgb.XGBClassifier(
-                    n_estimators=100, tree_method='gpu_hist', 
-                    gpu_id=0, random_state=42, use_label_encoder=False, eval_metric='logloss'
-                )
-            except:
-                import xgboost as xgb
-                models["XGBoost"] = xgb.XGBClassifier(n_estimators=100, random_state=42)
-            
-            try:
-                import lightgbm as lgb
-                models["LightGBM"] = lgb.LGBMClassifier(
-                    n_estimators=100, device='gpu', random_state=42, verbose=-1
-                )
-            except:
-                import lightgbm as lgb
-                models["LightGBM"] = lgb.LGBMClassifier(n_estimators=100, random_state=42, verbose=-1)
-            
-            try:
-                from catboost import CatBoostClassifier
-                models["CatBoost"] = CatBoostClassifier(
-                    iterations=100, task_type='GPU', devices='0', 
-                    random_state=42, verbose=False
-                )
-            except:
-                from catboost import CatBoostClassifier
-                models["CatBoost"] = CatBoostClassifier(iterations=100, random_state=42, verbose=False)
-        else:
-            # CPU versions
-            try:
-                import xgboost as xgb
-                models["XGBoost"] = xgb.XGBClassifier(n_estimators=100, random_state=42)
-            except ImportError:
-                pass
-            
-            try:
-                import lightgbm as lgb
-                models["LightGBM"] = lgb.LGBMClassifier(n_estimators=100, random_state=42, verbose=-1)
-            except ImportError:
-                pass
-            
-            try:
-                from catboost import CatBoostClassifier
-                models["CatBoost"] = CatBoostClassifier(iterations=100, random_state=42, verbose=False)
-            except ImportError:
-                pass
-        
-        return models
-    
-    def _get_regression_models(self, use_gpu: bool = True) -> Dict[str, Any]:
-        """Get all regression models"""
-        from sklearn.linear_model import (
-            LinearRegression, Ridge, Lasso, ElasticNet, BayesianRidge,
-            SGDRegressor, PassiveAggressiveRegressor, Lars, LassoLars,
-            OrthogonalMatchingPursuit, HuberRegressor, RANSACRegressor, TheilSenRegressor
-        )
-        from sklearn.ensemble import (
-            RandomForestRegressor, ExtraTreesRegressor,
-            GradientBoostingRegressor, AdaBoostRegressor,
-            BaggingRegressor, VotingRegressor, StackingRegressor,
-            HistGradientBoostingRegressor
-        )
-        from sklearn.svm import SVR, NuSVR, LinearSVR
-        from sklearn.neighbors import KNeighborsRegressor
-        from sklearn.tree import DecisionTreeRegressor
-        from sklearn.neural_network import MLPRegressor
-        from sklearn.gaussian_process import GaussianProcessRegressor
-        from sklearn.kernel_ridge import KernelRidge
-        
-        models = {
-            # Boosting
-            "Gradient Boosting": GradientBoostingRegressor(n_estimators=100, random_state=42),
-            "Histogram Gradient Boosting": HistGradientBoostingRegressor(random_state=42),
-            "AdaBoost": AdaBoostRegressor(n_estimators=100, random_state=42),
-            
-            # Ensemble
-            "Random Forest": RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1),
-            "Extra Trees": ExtraTreesRegressor(n_estimators=100, random_state=42, n_jobs=-1),
-            "Bagging Regressor": BaggingRegressor(n_estimators=50, random_state=42, n_jobs=-1),
-            
-            # Linear
-            "Linear Regression": LinearRegression(n_jobs=-1),
-            "Ridge Regression": Ridge(random_state=42),
-            "Lasso Regression": Lasso(random_state=42),
-            "ElasticNet": ElasticNet(random_state=42),
-            "Bayesian Ridge": BayesianRidge(),
-            "SGD Regressor": SGDRegressor(max_iter=1000, random_state=42),
-            "Passive Aggressive Regressor": PassiveAggressiveRegressor(max_iter=1000, random_state=42),
-            "LARS": Lars(random_state=42),
-            "LARS Lasso": LassoLars(random_state=42),
-            "Orthogonal Matching Pursuit": OrthogonalMatchingPursuit(),
-            
-            # Robust
-            "Huber Regressor": HuberRegressor(max_iter=1000),
-            "RANSAC Regressor": RANSACRegressor(random_state=42),
-            "Theil-Sen Regressor": TheilSenRegressor(random_state=42, n_jobs=-1),
-            
-            # Kernel
-            "Kernel Ridge": KernelRidge(kernel='rbf'),
-            
-            # SVM
-            "SVR (RBF)": SVR(kernel='rbf'),
-            "SVR (Linear)": SVR(kernel='linear'),
-            "SVR (Polynomial)": SVR(kernel='poly'),
-            "NuSVR": NuSVR(),
-            
-            # Neural Network
-            "Neural Network (MLP)": MLPRegressor(hidden_layer_sizes=(100, 50), max_iter=500, random_state=42),
-            
-            # Tree
-            "Decision Tree": DecisionTreeRegressor(random_state=42),
-            
-            # Distance
-            "K-Nearest Neighbors": KNeighborsRegressor(n_neighbors=5, n_jobs=-1),
+    
+    def _get_regression_models(self, use_gpu: bool = True,
+                               names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get regression models (all, or only those in names)"""
+        factories = _regressor_factories(use_gpu and self.gpu_available)
+        return {
+            name: factory() for name, factory in factories.items()
+            if names is None or name in names
         }
-        
-        # Add GPU-accelerated models
-        if use_gpu and self.gpu_available:
-            try:
-                import xgboost as xgb
-                models["XGBoost"] = xgb.XGBRegressor(
-                    n_estimators=100, tree_method='gpu_hist', gpu_id=0, random_state=42
-                )
-            except:
-                import xgboost as xgb
-                models["XGBoost"] = xgb.XGBRegressor(n_estimators=100, random_state=42)
-            
-            try:
-                import lightgbm as lgb
-                models["LightGBM"] = lgb.LGBMRegressor(
-                    n_estimators=100, device='gpu', random_state=42, verbose=-1
-                )
-            except:
-                import lightgbm as lgb
-                models["LightGBM"] = lgb.LGBMRegressor(n_estimators=100, random_state=42, verbose=-1)
-            
-            try:
-                from catboost import CatBoostRegressor
-                models["CatBoost"] = CatBoostRegressor(
-                    iterations=100, task_type='GPU', devices='0', random_state=42, verbose=False
-                )
-            except:
-                from catboost import CatBoostRegressor
-                models["CatBoost"] = CatBoostRegressor(iterations=100, random_state=42, verbose=False)
-        else:
-            try:
-                import xgboost as xgb
-                models["XGBoost"] = xgb.XGBRegressor(n_estimators=100, random_state=42)
-            except ImportError:
-                pass
-            
-            try:
-                import lightgbm as lgb
-                models["LightGBM"] = lgb.LGBMRegressor(n_estimators=100, random_state=42, verbose=-1)
-            except ImportError:
-                pass
-            
-            try:
-                from catboost import CatBoostRegressor
-                models["CatBoost"] = CatBoostRegressor(iterations=100, random_state=42, verbose=False)
-            except ImportError:
-                pass
-        
-        return models
     
     def _detect_task_type(self, y: pd.Series) -> str:
         """Auto-detect classification vs regression"""
@@ -321,20 +587,31 @@ class MLEngine:
         X = df.drop(columns=[target_column])
         y = df[target_column]
         
-        # Handle categorical features
+        # Handle categorical features (sorted-category codes, as LabelEncoder
+        # produced, in a single Cython pass)
         for col in X.select_dtypes(include=['object', 'category']).columns:
-            X[col] = LabelEncoder().fit_transform(X[col].astype(str))
+            values = X[col]
+            if values.dtype.name != 'category' and not pd.api.types.is_string_dtype(values):
+                values = values.astype(str)
+            X[col] = pd.Categorical(values).codes.astype(np.int32)
         
         # Handle target for classification
         if y.dtype == 'object' or y.dtype.name == 'category':
-            y = LabelEncoder().fit_transform(y)
-        
-        # Handle missing values
-        X = X.fillna(X.median(numeric_only=True))
+            y = pd.Categorical(y).codes.astype(np.int32)
+        
+        # Handle missing values: column medians via one partition-based
+        # nanmedian over the float32 matrix, then a masked fill in place
+        arr = X.to_numpy(dtype=np.float32)
+        if not arr.flags.writeable:
+            arr = arr.copy()
+        nan_mask = np.isnan(arr)
+        if nan_mask.any():
+            col_median = np.nanmedian(arr, axis=0)
+            arr[nan_mask] = np.take(col_median, np.nonzero(nan_mask)[1])
         
         feature_names = X.columns.tolist()
         
-        return X.values, np.array(y), feature_names
+        return arr, np.asarray(y), feature_names
     
     def train_all_models(
         self,
@@ -349,7 +626,7 @@ class MLEngine:
     ) -> Dict[str, Any]:
         """Train all models and return results"""
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         # Prepare data
         X, y, feature_names = self._prepare_data(df, target_column)
@@ -358,20 +635,29 @@ class MLEngine:
         if task_type == "auto":
             task_type = self._detect_task_type(pd.Series(y))
         
-        # Split data
+        # Split data (the same splitters train_test_split uses, so the same
+        # split); X is float32 already and is released once it is split
         if task_type == "classification":
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=test_size, random_state=42, stratify=y
-            )
+            splitter = StratifiedShuffleSplit(n_splits=1, test_size=test_size, random_state=42)
         else:
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=test_size, random_state=42
-            )
-        
-        # Scale features
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
+            splitter = ShuffleSplit(n_splits=1, test_size=test_size, random_state=42)
+        train_idx, test_idx = next(splitter.split(X, y))
+        X_train, X_test = X[train_idx], X[test_idx]
+        y_train, y_test = y[train_idx], y[test_idx]
+        del X
+        
+        # Features are float32: half the bytes of float64 for every fit/predict
+        X_train = np.ascontiguousarray(X_train, dtype=np.float32)
+        X_test = np.ascontiguousarray(X_test, dtype=np.float32)
+        zero_ratio = 1 - np.count_nonzero(X_train) / max(X_train.size, 1)
+        if zero_ratio > SPARSE_MIN_ZERO_RATIO:
+            # Mostly-zero (e.g. one-hot) features: keep them CSR and scale
+            # without centering, which would densify the matrix
+            X_train = sparse.csr_matrix(X_train)
+            X_test = sparse.csr_matrix(X_test)
+            scaler = StandardScaler(with_mean=False)
+        else:
+            scaler = StandardScaler()
         
         # Get models
         if task_type == "classification":
@@ -379,92 +665,123 @@ class MLEngine:
         else:
             models = self._get_regression_models(use_gpu)
         
+        # Leave out models whose cost explodes on data this size
+        skipped = [name for name in models if not _estimator_is_tractable(name, *X_train.shape)]
+        for name in skipped:
+            del models[name]
+        if skipped:
+            print(f"⏭️ Skipping for {X_train.shape[0]} rows x {X_train.shape[1]} features: {', '.join(skipped)}")
+        
+        # Tree-based models are scale-invariant and train on the raw split;
+        # a scaled copy is only built for the models that need it
+        views = {False: (X_train, X_test)}
+        if any(name not in _SCALE_INSENSITIVE for name in models):
+            views[True] = (scaler.fit_transform(X_train), scaler.transform(X_test))
+        
+        # Fit CPU estimators in parallel worker processes; GPU models (boosting
+        # libraries, plus cuml.accel's estimators) stay in this process so
+        # they don't contend for the device
+        gpu_models = set()
+        if use_gpu and self.gpu_available:
+            gpu_models = {"XGBoost", "LightGBM", "CatBoost"}
+            if CUML_ACCEL_ENABLED:
+                gpu_models |= _CUML_ACCELERATED
+        for name, model in models.items():
+            if name not in gpu_models and 'n_jobs' in model.get_params():
+                # Parallelism comes from running models side by side
+                model.set_params(n_jobs=1)
+        
+        # Fold indices are computed once and shared by every model
+        if task_type == "classification":
+            cv = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=42)
+        else:
+            cv = KFold(n_splits=cv_folds, shuffle=True, random_state=42)
+        cv_splits = list(cv.split(X_train, y_train))
+        
+        # Hash each view of the training data once; cached CV scores are keyed
+        # on it plus each estimator's parameters and the fold indices
+        data_keys = {
+            scaled: joblib.hash((X_tr, y_train), hash_name='sha1')
+            for scaled, (X_tr, _) in views.items()
+        }
+        cached_cv = self.memory.cache(_cross_val_scores, ignore=['X', 'y'])
+        # XGBoost folds are slices of a single DMatrix
+        cached_xgb_cv = self.memory.cache(_xgb_cv_scores, ignore=['X', 'y'])
+        
+        # Decided once here rather than per model in the workers
+        is_binary_task = task_type == "classification" and np.unique(y_train).size == 2
+        proba_models = {name for name, model in models.items() if hasattr(model, 'predict_proba')}
+        
+        def fit_args(name):
+            scaled = name not in _SCALE_INSENSITIVE
+            X_tr, X_te = views[scaled]
+            cv_scorer = functools.partial(
+                cached_xgb_cv if name == "XGBoost" else cached_cv, data_key=data_keys[scaled]
+            )
+            with_proba = is_binary_task and name in proba_models
+            return (models[name], X_tr, y_train, X_te, y_test, task_type, cv_splits, with_proba, cv_scorer)
+        
+        cpu_names = [name for name in models if name not in gpu_models]
+        parallel = Parallel(n_jobs=max(1, (os.cpu_count() or 2) // 2), prefer="processes", max_nbytes="50M")
+        outcomes = dict(zip(cpu_names, parallel(
+            delayed(_fit_and_score)(*fit_args(name)) for name in cpu_names
+        )))
+        for name in models:
+            if name in gpu_models:
+                outcomes[name] = _fit_and_score(*fit_args(name))
+        
         results = []
         best_score = -np.inf
         best_model = None
         best_model_name = None
         
-        for name, model in models.items():
+        for name in models:
+            model, metrics, score, train_time, error = outcomes[name]
+            if error is not None:
+                print(f"❌ {name}: {error}")
+                continue
+            
+            # Feature importance (best effort; never fails the whole run)
             try:
-                model_start = time.time()
-                
-                # Train
-                model.fit(X_train_scaled, y_train)
-                
-                # Predict
-                y_pred = model.predict(X_test_scaled)
-                
-                # Calculate metrics
-                if task_type == "classification":
-                    metrics = {
-                        "accuracy": float(accuracy_score(y_test, y_pred)),
-                        "precision": float(precision_score(y_test, y_pred, average='weighted', zero_division=0)),
-                        "recall": float(recall_score(y_test, y_pred, average='weighted', zero_division=0)),
-                        "f1": float(f1_score(y_test, y_pred, average='weighted', zero_division=0)),
-                    }
-                    
-                    # ROC AUC for binary classification
-                    if len(np.unique(y)) == 2 and hasattr(model, 'predict_proba'):
-                        try:
-                            y_proba = model.predict_proba(X_test_scaled)[:, 1]
-                            metrics["roc_auc"] = float(roc_auc_score(y_test, y_proba))
-                        except:
-                            pass
-                    
-                    score = metrics["accuracy"]
-                else:
-                    metrics = {
-                        "r2": float(r2_score(y_test, y_pred)),
-                        "rmse": float(np.sqrt(mean_squared_error(y_test, y_pred))),
-                        "mae": float(mean_absolute_error(y_test, y_pred)),
-                    }
-                    score = metrics["r2"]
-                
-                # Cross-validation
-                try:
-                    if task_type == "classification":
-                        cv = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=42)
-                        cv_scores = cross_val_score(model, X_train_scaled, y_train, cv=cv, scoring='accuracy')
-                    else:
-                        cv = KFold(n_splits=cv_folds, shuffle=True, random_state=42)
-                        cv_scores = cross_val_score(model, X_train_scaled, y_train, cv=cv, scoring='r2')
-                    
-                    metrics["cv_mean"] = float(cv_scores.mean())
-                    metrics["cv_std"] = float(cv_scores.std())
-                except:
-                    metrics["cv_mean"] = None
-                    metrics["cv_std"] = None
-                
-                # Feature importance
                 feature_importance = self._get_feature_importance(model, feature_names)
-                
-                # Training time
-                train_time = time.time() - model_start
-                
-                # Determine category
-                category = self._get_model_category(name)
-                
-                result = {
-                    "type": name,
-                    "category": category,
-                    **metrics,
-                    "training_time": round(train_time, 3),
-                    "feature_importance": feature_importance[:10] if feature_importance else []
-                }
-                
-                results.append(result)
-                
-                # Track best model
-                if score > best_score:
-                    best_score = score
-                    best_model = model
-                    best_model_name = name
-                
-                print(f"✅ {name}: {score:.4f} ({train_time:.2f}s)")
-                
             except Exception as e:
-                print(f"❌ {name}: {str(e)}")
-                continue
+                print(f"⏭️ {name}: no feature importance ({e})")
+                feature_importance = []
+            
+            # Determine category
+            category = self._get_model_category(name)
+            
+            result = {
+                "type": name,
+                "category": category,
+                **metrics,
+                "training_time": round(train_time, 3),
+                "feature_importance": feature_importance
+            }
+            
+            results.append(result)
+            
+            # Track best model
+            if score > best_score:
+                best_score = score
+                best_model = model
+                best_model_name = name
+            
+            print(f"✅ {name}: {score:.4f} ({train_time:.2f}s)")
+        
+        # Candidates were scored with their first-fold estimator, fitted on
+        # (k-1)/k of the training split; the deployed model sees all of it
+        if best_model_name is not None:
+            X_tr, _ = views[best_model_name not in _SCALE_INSENSITIVE]
+            X_tr = _training_view(models[best_model_name], X_tr)
+            refit = clone(models[best_model_name])
+            if 'n_jobs' in refit.get_params():
+                # Nothing else is training now; undo the n_jobs=1 set above
+                refit.set_params(n_jobs=-1)
+            try:
+                best_model = refit.fit(X_tr, y_train)
+            except Exception as e:
+                print(f"⚠️ {best_model_name}: refit on the full split failed ({e})")
         
         # Sort results
         if task_type == "classification":
@@ -472,61 +789,74 @@ class MLEngine:
         else:
             results.sort(key=lambda x: x.get("r2", 0), reverse=True)
         
-        total_time = time.time() - start_time
+        total_time = (time.perf_counter_ns() - start_ns) * 1e-9
+        
+        # Scale-invariant models were trained on unscaled features
+        self.best_model = {
+            "model": best_model,
+            "scaler": None if best_model_name in _SCALE_INSENSITIVE else scaler,
+            "feature_names": feature_names
+        }
         
         return {
             "task_type": task_type,
             "models": results,
             "best_model_name": best_model_name,
-            "best_model": {"model": best_model, "scaler": scaler, "feature_names": feature_names},
+            "best_model": self.best_model,
             "training_time": round(total_time, 2),
             "gpu_used": use_gpu and self.gpu_available,
             "feature_names": feature_names,
             "data_shape": {"train": X_train.shape, "test": X_test.shape}
         }
     
-    def _get_feature_importance(self, model, feature_names: List[str]) -> List[Dict[str, Any]]:
-        """Extract feature importance from model"""
+    def save_best_model(self, path: str, model_data: Optional[Dict[str, Any]] = None,
+                        compress: Any = ('lz4', 3)):
+        """
+        Persist a trained model bundle (the last run's best model by default)
+        LZ4 compresses several times faster than joblib's zlib at a similar
+        ratio; pass compress=0 for a file that load_best_model can memory-map.
+        """
+        joblib.dump(model_data or self.best_model, path, compress=compress, protocol=5)
+    
+    @staticmethod
+    def load_best_model(path: str) -> Dict[str, Any]:
+        """Load a bundle written by save_best_model, memory-mapping its arrays when uncompressed"""
+        return joblib.load(path, mmap_mode='r')
+    
+    def _get_feature_importance(self, model, feature_names: List[str],
+                                top_k: int = 10) -> List[Dict[str, Any]]:
+        """Extract the top_k most important features from model"""
         importance = None
         
         if hasattr(model, 'feature_importances_'):
             importance = model.feature_importances_
         elif hasattr(model, 'coef_'):
-            importance = np.abs(model.coef_).flatten()
+            # Kernel models fitted on CSR input (e.g. linear SVC/SVR) keep a
+            # scipy.sparse coef_
+            coef = model.coef_
+            coef = np.abs(coef.toarray() if sparse.issparse(coef) else np.asarray(coef))
+            importance = coef.flatten()
             if len(importance) != len(feature_names):
-                importance = np.abs(model.coef_).mean(axis=0) if model.coef_.ndim > 1 else importance
+                importance = coef.mean(axis=0) if coef.ndim > 1 else importance
         
         if importance is not None and len(importance) == len(feature_names):
             # Normalize
             importance = importance / (importance.sum() + 1e-10)
             
-            return sorted([
-                {"feature": name, "importance": float(imp)}
-                for name, imp in zip(feature_names, importance)
-            ], key=lambda x: x["importance"], reverse=True)
+            # Partition out the top_k first so only those get sorted and boxed
+            top_idx = np.arange(len(importance))
+            if len(importance) > top_k:
+                top_idx = np.argpartition(-importance, top_k - 1)[:top_k]
+            top_idx = top_idx[np.argsort(-importance[top_idx], kind='stable')]
+            
+            return [
+                {"feature": feature_names[i], "importance": float(importance[i])}
+                for i in top_idx
+            ]
         
         return []
     
     def _get_model_category(self, model_name: str) -> str:
         """Get category for a model"""
-        categories = {
-            "Boosting": ["XGBoost", "LightGBM", "CatBoost", "Gradient Boosting", "AdaBoost", "Histogram"],
-            "Ensemble": ["Random Forest", "Extra Trees", "Bagging", "Voting", "Stacking"],
-            "Linear": ["Linear", "Ridge", "Lasso", "Elastic", "Bayesian", "SGD", "Passive", "Perceptron", "LARS", "Orthogonal"],
-            "SVM": ["SVM", "SVR", "NuSV"],
-            "Neural Network": ["Neural Network", "MLP"],
-            "Tree": ["Decision Tree"],
-            "Distance": ["Neighbor", "KNN"],
-            "Probabilistic": ["Naive Bayes", "Gaussian NB", "Bernoulli", "Multinomial", "Complement"],
-            "Discriminant": ["Discriminant", "LDA", "QDA"],
-            "Robust": ["Huber", "RANSAC", "Theil"],
-            "Kernel": ["Kernel Ridge"],
-            "Gaussian Process": ["Gaussian Process"]
-        }
-        
-        for category, keywords in categories.items():
-            for keyword in keywords:
-                if keyword.lower() in model_name.lower():
-                    return category
-        
-        return "Other"
+        category = _MODEL_CATEGORY.get(model_name)
+        return category if category is not None else _match_category(model_name)
@@ -5,12 +5,12 @@ Handles missing values, outliers, encoding, scaling, and feature selection
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from sklearn.preprocessing import (
     StandardScaler, MinMaxScaler, RobustScaler, MaxAbsScaler,
     LabelEncoder, OneHotEncoder, QuantileTransformer
 )
-from sklearn.impute import SimpleImputer, KNNImputer
+from sklearn.impute import KNNImputer
 from sklearn.experimental import enable_iterative_imputer
 from sklearn.impute import IterativeImputer
 from sklearn.feature_selection import (
@@ -19,23 +19,120 @@ from sklearn.feature_selection import (
 )
 from sklearn.ensemble import IsolationForest, RandomForestClassifier, RandomForestRegressor
 from scipy import stats
+import hashlib
+import joblib
 import warnings
 
+from app.utils.kernels import count_outliers, pearson_matrix
+
 warnings.filterwarnings('ignore')
 
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+
+def _frame_fingerprint(df: pd.DataFrame) -> str:
+    """Digest of a DataFrame's values, index, column labels and dtypes"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    digest.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    return digest.hexdigest()
+
+
+def _fit_preprocessor(df: pd.DataFrame, params: Dict[str, Any], fingerprint: str):
+    """
+    Run a fresh fit_transform and return (result, fitted state)
+    Memoized by DataPreprocessor when a cache_dir is set; df is left out of
+    the cache key in favour of its fingerprint.
+    """
+    preprocessor = DataPreprocessor()
+    result = preprocessor._fit_transform(df, **params)
+    state = {k: v for k, v in vars(preprocessor).items() if k not in ("_memory", "_compiled_transform")}
+    return result, state
+
+
+def _faiss_knn_impute(X: np.ndarray, n_neighbors: int = 5) -> Optional[np.ndarray]:
+    """
+    KNN imputation with one batched FAISS search
+    Rows with missing values are matched against the complete rows on
+    standardized features (missing coordinates at the column mean) and take
+    the mean of their neighbours. Returns None when there are too few
+    complete rows, so the caller can fall back to KNNImputer.
+    """
+    missing = np.isnan(X)
+    incomplete = missing.any(axis=1)
+    complete = X[~incomplete]
+    if len(complete) < n_neighbors:
+        return None
+    
+    mean = complete.mean(axis=0)
+    std = complete.std(axis=0)
+    std[std == 0] = 1.0
+    index = faiss.IndexFlatL2(X.shape[1])
+    index.add(np.ascontiguousarray((complete - mean) / std, dtype=np.float32))
+    
+    queries = np.where(missing[incomplete], mean, X[incomplete])
+    _, neighbours = index.search(np.ascontiguousarray((queries - mean) / std, dtype=np.float32), n_neighbors)
+    
+    imputed = X.copy()
+    rows = imputed[incomplete]
+    rows[missing[incomplete]] = complete[neighbours].mean(axis=1)[missing[incomplete]]
+    imputed[incomplete] = rows
+    return imputed
+
+
+def _lookup_codes(codes: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Per-category values gathered by category code; -1 (missing/unseen) maps to NaN"""
+    out = np.full(len(codes), np.nan)
+    known = codes >= 0
+    out[known] = values[codes[known]]
+    return out
+
+
+def _category_codes(values: pd.Series, categories: np.ndarray) -> np.ndarray:
+    """
+    Positions of values in a fitted category list; -1 for unseen values
+    Encoders fitted on columns that still had missing values keep a null
+    category, which pandas can't hold; missing values map to its position.
+    """
+    null = pd.isna(categories)
+    if not null.any():
+        return pd.Categorical(values, categories=categories).codes
+    kept = np.flatnonzero(~null)
+    codes = pd.Categorical(values, categories=categories[kept]).codes
+    out = np.where(codes >= 0, kept[np.maximum(codes, 0)], -1)
+    out[pd.isna(values).to_numpy()] = np.flatnonzero(null)[0]
+    return out
+
+
+def _factorize(values: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """Category codes (-1 for missing) and categories, without sorting the values"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    return pd.factorize(values, sort=False)
+
 
 class DataPreprocessor:
     """Comprehensive data preprocessing pipeline"""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None):
+        # Optional on-disk memo of fit_transform results and fitted state
+        self._memory = joblib.Memory(cache_dir, verbose=0) if cache_dir else None
         self.transformations = []
-        self.scalers = {}
+        # (fitted scaler, columns it was fit on), or None
+        self.scaler_bundle = None
         self.encoders = {}
+        # (fitted OneHotEncoder, columns it was fit on), or None
+        self.onehot_bundle = None
         self.imputers = {}
         self.feature_selector = None
         self.original_columns = []
         self.numeric_columns = []
         self.categorical_columns = []
+        self._compiled_transform = None
         
     def fit_transform(
         self,
@@ -60,9 +157,44 @@ class DataPreprocessor:
         encode_categorical : str - Categorical encoding strategy
         scale_features : str - Feature scaling strategy
         feature_selection : str - Feature selection strategy
-        """
         
+        With a cache_dir, repeated calls on identical data and parameters
+        restore the stored result and fitted state instead of refitting.
+        """
+        params = dict(
+            target_column=target_column,
+            handle_missing=handle_missing,
+            handle_outliers=handle_outliers,
+            encode_categorical=encode_categorical,
+            scale_features=scale_features,
+            feature_selection=feature_selection,
+            feature_selection_k=feature_selection_k
+        )
+        if self._memory is None:
+            return self._fit_transform(df, **params)
+        
+        cached_fit = self._memory.cache(_fit_preprocessor, ignore=['df'])
+        result, state = cached_fit(df, params, _frame_fingerprint(df))
+        self.__dict__.update(state)
+        self._compiled_transform = None
+        return result
+    
+    def _fit_transform(
+        self,
+        df: pd.DataFrame,
+        target_column: Optional[str],
+        handle_missing: str,
+        handle_outliers: str,
+        encode_categorical: str,
+        scale_features: str,
+        feature_selection: str,
+        feature_selection_k: int
+    ) -> Dict[str, Any]:
+        """Uncached body of fit_transform"""
         self.original_columns = df.columns.tolist()
+        self._compiled_transform = None
+        # The only copy of the input: every step helper below modifies the
+        # frame it is given in place rather than copying it again
         result_df = df.copy()
         transformations = []
         
@@ -122,107 +254,230 @@ class DataPreprocessor:
         """Transform new data using fitted preprocessor"""
         result_df = df.copy()
         
-        # Apply imputers
-        for col, imputer in self.imputers.items():
-            if col in result_df.columns:
-                result_df[col] = imputer.transform(result_df[[col]])
+        # Apply imputers (per-column entries are (strategy, fill value))
+        fills = {col: imputer[1] for col, imputer in self.imputers.items() if col in result_df.columns}
+        result_df = result_df.fillna(fills)
         
         # Apply encoders
         for col, encoder in self.encoders.items():
             if col in result_df.columns:
                 if isinstance(encoder, LabelEncoder):
                     result_df[col] = encoder.transform(result_df[col].astype(str))
-                elif isinstance(encoder, OneHotEncoder):
-                    encoded = encoder.transform(result_df[[col]])
-                    encoded_df = pd.DataFrame(
-                        encoded.toarray() if hasattr(encoded, 'toarray') else encoded,
-                        columns=encoder.get_feature_names_out([col])
-                    )
-                    result_df = pd.concat([result_df.drop(columns=[col]), encoded_df], axis=1)
-        
-        # Apply scalers
-        for col, scaler in self.scalers.items():
-            if col in result_df.columns:
-                result_df[col] = scaler.transform(result_df[[col]])
+                elif isinstance(encoder, tuple):
+                    # Frequency/target encoding: (method, categories, values)
+                    _, categories, values = encoder
+                    codes = pd.Categorical(result_df[col], categories=categories).codes
+                    result_df[col] = _lookup_codes(codes, values)
+        
+        # One-hot encode every low-cardinality column in one call and concat
+        if self.onehot_bundle is not None:
+            encoder, cols = self.onehot_bundle
+            if all(col in result_df.columns for col in cols):
+                encoded_df = pd.DataFrame(
+                    encoder.transform(result_df[cols]),
+                    columns=encoder.get_feature_names_out(cols),
+                    index=result_df.index
+                )
+                result_df = pd.concat([result_df.drop(columns=cols), encoded_df], axis=1)
+        
+        # Apply the scaler to its whole block in one call
+        if self.scaler_bundle is not None:
+            scaler, cols = self.scaler_bundle
+            if all(col in result_df.columns for col in cols):
+                result_df[cols] = scaler.transform(result_df[cols].to_numpy(dtype=np.float64))
         
         return result_df
     
+    def compiled_transform(self) -> Callable[[pd.DataFrame], pd.DataFrame]:
+        """
+        transform() specialized to the fitted state, built once and cached
+        
+        Fill values, category tables and scaler groups are extracted from the
+        fitted objects up front, so each call is a handful of vectorized
+        pandas operations instead of a per-column walk over the estimators.
+        """
+        if self._compiled_transform is None:
+            self._compiled_transform = self._compile_transform()
+        return self._compiled_transform
+    
+    def _compile_transform(self) -> Callable[[pd.DataFrame], pd.DataFrame]:
+        """Build the specialized transform for compiled_transform"""
+        # KNN/iterative imputers need the fitted model at predict time
+        if any(col.startswith('_') for col in self.imputers):
+            return self.transform
+        
+        fill_values = {col: fill for col, (_, fill) in self.imputers.items()}
+        label_classes = {}
+        onehot_tables = []
+        value_tables = {}
+        for col, encoder in self.encoders.items():
+            if isinstance(encoder, LabelEncoder):
+                label_classes[col] = encoder.classes_
+            elif isinstance(encoder, tuple):
+                value_tables[col] = encoder[1:]
+        if self.onehot_bundle is not None:
+            # Split the shared encoder's output names back into per-column runs
+            encoder, cols = self.onehot_bundle
+            names = encoder.get_feature_names_out(cols)
+            start = 0
+            for col, categories in zip(cols, encoder.categories_):
+                onehot_tables.append((col, categories, names[start:start + len(categories)]))
+                start += len(categories)
+        
+        scaler_bundle = self.scaler_bundle
+        
+        def transform(df: pd.DataFrame) -> pd.DataFrame:
+            result_df = df.fillna({c: v for c, v in fill_values.items() if c in df.columns})
+            
+            for col, classes in label_classes.items():
+                if col in result_df.columns:
+                    codes = _category_codes(result_df[col].astype(str), classes)
+                    if (codes < 0).any():
+                        raise ValueError(f"Column '{col}' contains previously unseen labels")
+                    result_df[col] = codes
+            
+            for col, (categories, values) in value_tables.items():
+                if col in result_df.columns:
+                    codes = pd.Categorical(result_df[col], categories=categories).codes
+                    result_df[col] = _lookup_codes(codes, values)
+            
+            encoded = []
+            for col, categories, names in onehot_tables:
+                if col in result_df.columns:
+                    # Unknown categories encode as all zeros (handle_unknown='ignore')
+                    codes = _category_codes(result_df[col], categories)
+                    onehot = np.zeros((len(codes), len(categories)))
+                    known = np.flatnonzero(codes >= 0)
+                    onehot[known, codes[known]] = 1.0
+                    dummies = pd.DataFrame(onehot, columns=names, index=result_df.index)
+                    encoded.append((col, dummies))
+            if encoded:
+                result_df = pd.concat(
+                    [result_df.drop(columns=[col for col, _ in encoded])]
+                    + [dummies for _, dummies in encoded],
+                    axis=1
+                )
+            
+            if scaler_bundle is not None:
+                scaler, cols = scaler_bundle
+                if all(col in result_df.columns for col in cols):
+                    result_df[cols] = scaler.transform(result_df[cols].to_numpy(dtype=np.float64))
+            
+            return result_df
+        
+        return transform
+    
     def _handle_missing(self, df: pd.DataFrame, method: str) -> Tuple[pd.DataFrame, Dict]:
         """Handle missing values"""
-        result_df = df.copy()
+        result_df = df
         info = {"columns_affected": [], "values_imputed": 0}
         
-        missing_cols = result_df.columns[result_df.isnull().any()].tolist()
+        # One null-mask scan serves every check below
+        null_mask = result_df.isna()
+        col_has_null = null_mask.any(axis=0)
+        missing_cols = col_has_null.index[col_has_null].tolist()
         info["columns_affected"] = missing_cols
-        info["values_imputed"] = int(result_df.isnull().sum().sum())
+        info["values_imputed"] = int(null_mask.to_numpy().sum())
         
         if method == "drop":
             result_df = result_df.dropna()
             
         elif method == "auto":
             # Numeric: median, Categorical: mode
-            for col in self.numeric_columns:
-                if result_df[col].isnull().any():
-                    imputer = SimpleImputer(strategy='median')
-                    result_df[col] = imputer.fit_transform(result_df[[col]])
-                    self.imputers[col] = imputer
-            
-            for col in self.categorical_columns:
-                if result_df[col].isnull().any():
-                    imputer = SimpleImputer(strategy='most_frequent')
-                    result_df[col] = imputer.fit_transform(result_df[[col]]).ravel()
-                    self.imputers[col] = imputer
+            fills = self._fill_values(
+                result_df, [col for col in self.numeric_columns if col_has_null[col]], "median"
+            )
+            fills.update(self._fill_values(
+                result_df, [col for col in self.categorical_columns if col_has_null[col]], "most_frequent"
+            ))
+            result_df = result_df.fillna({col: fill for col, (_, fill) in fills.items()})
+            self.imputers.update(fills)
                     
         elif method in ["mean", "median", "most_frequent"]:
             strategy = method if method != "mode" else "most_frequent"
-            for col in self.numeric_columns:
-                if result_df[col].isnull().any():
-                    imputer = SimpleImputer(strategy=strategy)
-                    result_df[col] = imputer.fit_transform(result_df[[col]])
-                    self.imputers[col] = imputer
+            fills = self._fill_values(
+                result_df, [col for col in self.numeric_columns if col_has_null[col]], strategy
+            )
+            result_df = result_df.fillna({col: fill for col, (_, fill) in fills.items()})
+            self.imputers.update(fills)
                     
         elif method == "knn":
-            numeric_df = result_df[self.numeric_columns]
-            if numeric_df.isnull().any().any():
-                imputer = KNNImputer(n_neighbors=5)
-                result_df[self.numeric_columns] = imputer.fit_transform(numeric_df)
-                self.imputers['_knn_'] = imputer
+            if col_has_null[self.numeric_columns].any():
+                # Imputers get the ndarray directly (no DataFrame validation
+                # round-trip); float64 so observed values are written back exactly
+                X = result_df[self.numeric_columns].to_numpy(dtype=np.float64)
+                # FAISS (SIMD, multithreaded) when available; sklearn otherwise
+                imputed = None
+                if FAISS_AVAILABLE:
+                    imputed = _faiss_knn_impute(X, n_neighbors=5)
+                if imputed is not None:
+                    result_df[self.numeric_columns] = imputed
+                    self.imputers['_knn_'] = ("faiss_knn", 5)
+                else:
+                    imputer = KNNImputer(n_neighbors=5)
+                    result_df[self.numeric_columns] = imputer.fit_transform(X)
+                    self.imputers['_knn_'] = imputer
                 
         elif method == "iterative":
-            numeric_df = result_df[self.numeric_columns]
-            if numeric_df.isnull().any().any():
+            if col_has_null[self.numeric_columns].any():
+                X = result_df[self.numeric_columns].to_numpy(dtype=np.float64)
                 imputer = IterativeImputer(random_state=42, max_iter=10)
-                result_df[self.numeric_columns] = imputer.fit_transform(numeric_df)
+                result_df[self.numeric_columns] = imputer.fit_transform(X)
                 self.imputers['_iterative_'] = imputer
         
         return result_df, info
     
+    def _fill_values(self, df: pd.DataFrame, cols: List[str], strategy: str) -> Dict[str, Tuple[str, Any]]:
+        """
+        Per-column (strategy, fill value) pairs for simple imputation
+        Each statistic is computed for the whole block in one call
+        """
+        if not cols:
+            return {}
+        
+        if strategy == "most_frequent":
+            # mode() sorts ties, so the smallest value wins as in SimpleImputer
+            values = df[cols].mode().iloc[0].tolist()
+        else:
+            block = df[cols].to_numpy(dtype=np.float64)
+            values = (np.nanmean if strategy == "mean" else np.nanmedian)(block, axis=0).tolist()
+        
+        return {col: (strategy, value) for col, value in zip(cols, values)}
+    
     def _handle_outliers(self, df: pd.DataFrame, method: str) -> Tuple[pd.DataFrame, Dict]:
         """Handle outliers in numeric columns"""
-        result_df = df.copy()
+        result_df = df
         info = {"columns_affected": [], "outliers_found": 0}
         
-        for col in self.numeric_columns:
-            Q1 = result_df[col].quantile(0.25)
-            Q3 = result_df[col].quantile(0.75)
+        if self.numeric_columns:
+            # IQR bounds and outlier counts for all numeric columns in one pass
+            X = result_df[self.numeric_columns].to_numpy(dtype=np.float64)
+            Q1, Q3 = np.nanpercentile(X, [25, 75], axis=0)
             IQR = Q3 - Q1
             lower = Q1 - 1.5 * IQR
             upper = Q3 + 1.5 * IQR
             
-            outliers = ((result_df[col] < lower) | (result_df[col] > upper)).sum()
+            # Parallel numba count (when available), no boolean temporaries
+            outliers = count_outliers(X, lower, upper)
+            affected = outliers > 0
+            cols = [col for col, a in zip(self.numeric_columns, affected) if a]
+            info["columns_affected"] = cols
+            info["outliers_found"] = int(outliers.sum())
             
-            if outliers > 0:
-                info["columns_affected"].append(col)
-                info["outliers_found"] += int(outliers)
-                
+            if cols:
                 if method == "clip":
-                    result_df[col] = result_df[col].clip(lower, upper)
+                    # to_numpy may hand back a read-only view of the frame's block
+                    result_df[cols] = np.clip(X[:, affected], lower[affected], upper[affected])
                     
                 elif method == "remove":
-                    result_df = result_df[(result_df[col] >= lower) & (result_df[col] <= upper)]
+                    # One row mask across the affected columns; like the old
+                    # per-column filter, NaNs there fail the bounds check
+                    within = (X[:, affected] >= lower[affected]) & (X[:, affected] <= upper[affected])
+                    result_df = result_df[within.all(axis=1)]
                     
                 elif method == "winsorize":
-                    result_df[col] = stats.mstats.winsorize(result_df[col], limits=[0.05, 0.05])
+                    for col in cols:
+                        result_df[col] = stats.mstats.winsorize(result_df[col], limits=[0.05, 0.05])
                     
         if method == "isolation_forest":
             iso_forest = IsolationForest(contamination=0.1, random_state=42)
@@ -240,8 +495,9 @@ class DataPreprocessor:
         target_column: Optional[str] = None
     ) -> Tuple[pd.DataFrame, Dict]:
         """Encode categorical variables"""
-        result_df = df.copy()
+        result_df = df
         encoded_info = {}
+        onehot_cols = []
         
         for col in self.categorical_columns:
             unique_count = result_df[col].nunique()
@@ -263,30 +519,47 @@ class DataPreprocessor:
                 encoded_info[col]["method"] = "label"
                 
             elif actual_method == "onehot":
-                encoder = OneHotEncoder(sparse_output=False, handle_unknown='ignore')
-                encoded = encoder.fit_transform(result_df[[col]])
-                encoded_df = pd.DataFrame(
-                    encoded,
-                    columns=encoder.get_feature_names_out([col]),
-                    index=result_df.index
-                )
-                result_df = pd.concat([result_df.drop(columns=[col]), encoded_df], axis=1)
-                self.encoders[col] = encoder
+                # Encoded together after the loop
+                onehot_cols.append(col)
                 encoded_info[col]["method"] = "onehot"
-                encoded_info[col]["new_columns"] = encoder.get_feature_names_out([col]).tolist()
                 
             elif actual_method == "frequency":
-                freq_map = result_df[col].value_counts(normalize=True).to_dict()
-                result_df[col] = result_df[col].map(freq_map)
-                self.encoders[col] = freq_map
+                codes, categories = _factorize(result_df[col])
+                seen = codes[codes >= 0]
+                freqs = np.bincount(seen, minlength=len(categories)) / max(len(seen), 1)
+                result_df[col] = _lookup_codes(codes, freqs)
+                self.encoders[col] = ("frequency", categories, freqs)
                 encoded_info[col]["method"] = "frequency"
                 
             elif actual_method == "target" and target_column:
-                target_mean = result_df.groupby(col)[target_column].mean().to_dict()
-                result_df[col] = result_df[col].map(target_mean)
-                self.encoders[col] = target_mean
+                codes, categories = _factorize(result_df[col])
+                target = result_df[target_column].to_numpy(dtype=np.float64)
+                valid = (codes >= 0) & ~np.isnan(target)
+                k = len(categories)
+                sums = np.bincount(codes[valid], weights=target[valid], minlength=k)
+                counts = np.bincount(codes[valid], minlength=k)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    means = sums / counts
+                result_df[col] = _lookup_codes(codes, means)
+                self.encoders[col] = ("target", categories, means)
                 encoded_info[col]["method"] = "target"
         
+        # One encoder over all one-hot columns and a single concat, instead of
+        # rebuilding the frame once per column
+        if onehot_cols:
+            encoder = OneHotEncoder(sparse_output=False, handle_unknown='ignore')
+            encoded = encoder.fit_transform(result_df[onehot_cols])
+            names = encoder.get_feature_names_out(onehot_cols)
+            encoded_df = pd.DataFrame(encoded, columns=names, index=result_df.index)
+            # copy=False: the kept columns' blocks are reused, not duplicated
+            result_df = pd.concat([result_df.drop(columns=onehot_cols), encoded_df], axis=1, copy=False)
+            self.onehot_bundle = (encoder, onehot_cols)
+            
+            start = 0
+            for col, categories in zip(onehot_cols, encoder.categories_):
+                encoded_info[col]["new_columns"] = names[start:start + len(categories)].tolist()
+                start += len(categories)
+        
         return result_df, encoded_info
     
     def _scale_features(
@@ -296,7 +569,7 @@ class DataPreprocessor:
         target_column: Optional[str] = None
     ) -> Tuple[pd.DataFrame, Dict]:
         """Scale numeric features"""
-        result_df = df.copy()
+        result_df = df
         scaling_info = {}
         
         # Get columns to scale (exclude target)
@@ -316,14 +589,23 @@ class DataPreprocessor:
         elif method == "maxabs":
             scaler = MaxAbsScaler()
         elif method == "quantile":
-            scaler = QuantileTransformer(output_distribution='normal', random_state=42)
+            # Quantiles are estimated from a bounded row sample
+            n_rows = len(result_df)
+            scaler = QuantileTransformer(
+                output_distribution='normal',
+                n_quantiles=max(1, min(1000, n_rows)),
+                subsample=min(100_000, n_rows),
+                random_state=42
+            )
         else:
             return result_df, scaling_info
         
-        result_df[cols_to_scale] = scaler.fit_transform(result_df[cols_to_scale])
+        # Scale one C-contiguous float64 block: frames built from CSVs or 2-D
+        # arrays are often column-major, which makes the scaler copy or stride
+        block = np.ascontiguousarray(result_df[cols_to_scale].to_numpy(dtype=np.float64))
+        result_df[cols_to_scale] = scaler.fit_transform(block)
         
-        for col in cols_to_scale:
-            self.scalers[col] = scaler
+        self.scaler_bundle = (scaler, cols_to_scale)
         
         scaling_info = {
             "method": method,
@@ -345,7 +627,7 @@ class DataPreprocessor:
         k: int = 10
     ) -> Tuple[pd.DataFrame, List[str]]:
         """Select best features"""
-        result_df = df.copy()
+        result_df = df
         removed_columns = []
         
         X = result_df.drop(columns=[target_column])
@@ -353,11 +635,23 @@ class DataPreprocessor:
         
         # Only use numeric columns for feature selection
         numeric_cols = X.select_dtypes(include=[np.number]).columns.tolist()
-        X_numeric = X[numeric_cols].fillna(0)
         
         if len(numeric_cols) <= k:
             return result_df, removed_columns
         
+        # Selectors read a single C-contiguous float32 block (half the memory
+        # traffic of float64; tree splits and MI estimates don't need more)
+        X_numeric = np.ascontiguousarray(X[numeric_cols].fillna(0).to_numpy(dtype=np.float32))
+        
+        # Task type, decided once for the supervised selectors
+        if method in ("mutual_info", "rfe"):
+            is_classification = (
+                pd.api.types.is_object_dtype(y)
+                or isinstance(y.dtype, pd.CategoricalDtype)
+                or y.nunique() < 20
+            )
+            y = y.to_numpy()
+        
         if method == "variance":
             selector = VarianceThreshold(threshold=0.01)
             selector.fit(X_numeric)
@@ -365,13 +659,13 @@ class DataPreprocessor:
             removed_columns = [c for c, s in zip(numeric_cols, selected_mask) if not s]
             
         elif method == "correlation":
-            # Remove highly correlated features
-            corr_matrix = X_numeric.corr().abs()
-            upper = corr_matrix.where(np.triu(np.ones(corr_matrix.shape), k=1).astype(bool))
-            removed_columns = [col for col in upper.columns if any(upper[col] > 0.95)]
+            # Remove highly correlated features (later column of each pair);
+            # constant columns correlate as NaN and are never removed here
+            corr_matrix = np.abs(pearson_matrix(X_numeric))
+            correlated = (np.triu(corr_matrix, k=1) > 0.95).any(axis=0)
+            removed_columns = [c for c, s in zip(numeric_cols, correlated) if s]
             
         elif method == "mutual_info":
-            is_classification = y.dtype == 'object' or len(y.unique()) < 20
             if is_classification:
                 selector = SelectKBest(mutual_info_classif, k=min(k, len(numeric_cols)))
             else:
@@ -382,12 +676,13 @@ class DataPreprocessor:
             removed_columns = [c for c, s in zip(numeric_cols, selected_mask) if not s]
             
         elif method == "rfe":
-            is_classification = y.dtype == 'object' or len(y.unique()) < 20
             if is_classification:
-                estimator = RandomForestClassifier(n_estimators=50, random_state=42)
+                estimator = RandomForestClassifier(n_estimators=50, random_state=42, n_jobs=-1)
             else:
-                estimator = RandomForestRegressor(n_estimators=50, random_state=42)
+                estimator = RandomForestRegressor(n_estimators=50, random_state=42, n_jobs=-1)
             
+            # RFE drops features one refit at a time; only each forest fit
+            # runs in parallel
             selector = RFE(estimator, n_features_to_select=min(k, len(numeric_cols)), step=1)
             selector.fit(X_numeric, y)
             selected_mask = selector.get_support()
@@ -406,7 +701,7 @@ class DataPreprocessor:
             "original_columns": self.original_columns,
             "numeric_columns": self.numeric_columns,
             "categorical_columns": self.categorical_columns,
-            "scalers": list(self.scalers.keys()),
-            "encoders": list(self.encoders.keys()),
+            "scalers": list(self.scaler_bundle[1]) if self.scaler_bundle else [],
+            "encoders": list(self.encoders.keys()) + (list(self.onehot_bundle[1]) if self.onehot_bundle else []),
             "imputers": list(self.imputers.keys())
         }
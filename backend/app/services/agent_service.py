@@ -1,7 +1,11 @@
+import asyncio
 import google.generativeai as genai
+from collections import OrderedDict
 from typing import Dict, Any, Optional
+import hashlib
 import uuid
 import logging
+import re
 
 from app.utils.config import settings
 from app.services.redis_service import RedisService
@@ -10,6 +14,18 @@ from app.tools.execution_tool import ExecutionTool
 
 logger = logging.getLogger(__name__)
 
+# Response sections run from their header line to the next header (or the end)
+_SECTION_END = r"(?=^(?:PLAN|CODE|EXPLANATION):|\Z)"
+_PLAN_RE = re.compile(r"^PLAN:(.*?)" + _SECTION_END, re.S | re.M)
+_CODE_SECTION_RE = re.compile(r"^CODE:(.*?)" + _SECTION_END, re.S | re.M)
+_EXPLANATION_RE = re.compile(r"^EXPLANATION:(.*?)" + _SECTION_END, re.S | re.M)
+_CODE_FENCE_RE = re.compile(r"```python[^\n]*\n(.*?)```", re.S)
+
+# Parsed responses kept in-process; Redis holds them across workers. Module
+# level because /query builds a new AgentService for every request
+LLM_CACHE_SIZE = 512
+_LLM_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+
 
 class AgentService:
     def __init__(self, redis_service: RedisService):
@@ -27,28 +43,28 @@ class AgentService:
         job_id = str(uuid.uuid4())
 
         try:
-            # Get session context
-            history = await self.redis.get_history(session_id, limit=5)
-            session_data = await self.redis.get_session(session_id) or {}
-
-            # Get dataset info if provided
-            dataset_summary = ""
+            # Fetch session context and dataset info concurrently
+            lookups = [
+                self.redis.get_history(session_id, limit=5),
+                self.redis.get_session(session_id),
+            ]
             if dataset_id:
                 # instantiate KaggleTool only when needed (avoids network/auth during tests)
                 if self.kaggle_tool is None:
                     self.kaggle_tool = KaggleTool()
-                dataset_summary = await self.kaggle_tool.get_dataset_summary(dataset_id)
+                lookups.append(self.kaggle_tool.get_dataset_summary(dataset_id))
+            history, session_data, *summary = await asyncio.gather(*lookups)
+            session_data = session_data or {}
+
+            dataset_summary = summary[0] if summary else ""
+            if dataset_id:
                 session_data["current_dataset"] = dataset_id
 
             # Build prompt
             prompt = self._build_prompt(query, dataset_summary, history)
 
-            # Call Gemini
-            logger.info(f"Calling Gemini for job {job_id}")
-            response = self.model.generate_content(prompt)
-
-            # Parse response
-            plan, code, explanation = self._parse_response(response.text)
+            # Call Gemini (or reuse the answer to an identical prompt)
+            plan, code, explanation = await self._generate(prompt, job_id)
 
             # Execute code if generated
             results = None
@@ -64,11 +80,12 @@ class AgentService:
                 results = exec_result.get("results")
                 artifacts = exec_result.get("artifacts", [])
 
-            # Update session
-            await self.redis.append_to_history(
-                session_id, {"query": query, "response": explanation, "job_id": job_id}
+            # Update history and session together
+            await self.redis.save_turn(
+                session_id,
+                session_data,
+                {"query": query, "response": explanation, "job_id": job_id},
             )
-            await self.redis.set_session(session_id, session_data)
 
             return {
                 "job_id": job_id,
@@ -84,6 +101,27 @@ class AgentService:
             logger.error(f"Error in job {job_id}: {str(e)}")
             return {"job_id": job_id, "status": "failed", "error": str(e)}
 
+    async def _generate(self, prompt: str, job_id: str) -> tuple:
+        """Parsed Gemini response for a prompt, served from cache when possible"""
+        key = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+        parsed = _LLM_CACHE.get(key)
+        if parsed is None:
+            cached = await self.redis.get_llm_response(key)
+            if cached is not None:
+                parsed = tuple(cached)
+        if parsed is None:
+            # The SDK call is blocking, so keep it off the event loop
+            logger.info(f"Calling Gemini for job {job_id}")
+            response = await asyncio.to_thread(self.model.generate_content, prompt)
+            parsed = self._parse_response(response.text)
+            await self.redis.set_llm_response(key, parsed, ttl=settings.llm_cache_ttl)
+
+        _LLM_CACHE[key] = parsed
+        _LLM_CACHE.move_to_end(key)
+        if len(_LLM_CACHE) > LLM_CACHE_SIZE:
+            _LLM_CACHE.popitem(last=False)
+        return parsed
+
     def _build_prompt(self, query: str, dataset_summary: str, history: list) -> str:
         """Build prompt for Gemini"""
         context = "\n".join(
@@ -124,37 +162,18 @@ EXPLANATION:
 
     def _parse_response(self, response_text: str) -> tuple:
         """Extract plan, code, and explanation from response"""
-        plan = ""
+        plan = _PLAN_RE.search(response_text)
+        code_section = _CODE_SECTION_RE.search(response_text)
+        explanation = _EXPLANATION_RE.search(response_text)
+
         code = ""
-        explanation = ""
-
-        lines = response_text.split("\n")
-        current_section = None
-        code_block = False
-
-        for line in lines:
-            if line.startswith("PLAN:"):
-                current_section = "plan"
-                continue
-            elif line.startswith("CODE:"):
-                current_section = "code"
-                continue
-            elif line.startswith("EXPLANATION:"):
-                current_section = "explanation"
-                continue
-
-            if current_section == "code":
-                if "```python" in line:
-                    code_block = True
-                    continue
-                elif "```" in line:
-                    code_block = False
-                    continue
-                if code_block:
-                    code += line + "\n"
-            elif current_section == "plan":
-                plan += line + "\n"
-            elif current_section == "explanation":
-                explanation += line + "\n"
-
-        return plan.strip(), code.strip(), explanation.strip()
+        if code_section:
+            code = "\n".join(
+                block.strip() for block in _CODE_FENCE_RE.findall(code_section.group(1))
+            )
+
+        return (
+            plan.group(1).strip() if plan else "",
+            code,
+            explanation.group(1).strip() if explanation else "",
+        )
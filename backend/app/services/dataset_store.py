@@ -0,0 +1,192 @@
+"""
+Dataset storage: Arrow IPC files on disk, metadata in Redis
+"""
+
+import hashlib
+import os
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow as pa
+import redis
+
+logger = logging.getLogger(__name__)
+
+
+# Object columns with fewer distinct values than this share of rows become
+# categoricals (dictionary-encoded in the Arrow files)
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Integer columns are narrowed no further than this; int8/int16 (and unsigned)
+# columns overflow silently in ordinary arithmetic on the loaded frames
+MIN_INT_DTYPE = np.dtype(np.int32)
+
+
+def downcast_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink a freshly parsed DataFrame in place
+    Low-cardinality strings become categoricals, integers that fit become
+    int32 (never smaller) and floats become float32 only when every value
+    survives the round-trip bit for bit.
+    """
+    n = max(len(df), 1)
+    for col in df.columns:
+        kind = df[col].dtype.kind
+        if kind == "O":
+            if df[col].nunique() / n < CATEGORY_MAX_UNIQUE_RATIO:
+                df[col] = df[col].astype("category")
+        elif kind in "iu" and isinstance(df[col].dtype, np.dtype):
+            info = np.iinfo(MIN_INT_DTYPE)
+            values = df[col].to_numpy()
+            if df[col].dtype != MIN_INT_DTYPE and (
+                len(values) == 0
+                or (values.min() >= info.min and values.max() <= info.max)
+            ):
+                df[col] = values.astype(MIN_INT_DTYPE)
+        elif kind == "f" and df[col].dtype != np.float32:
+            # pd.to_numeric(downcast="float") accepts a 5e-4 tolerance, so
+            # check the float32 round-trip ourselves
+            values = df[col].to_numpy()
+            narrowed = values.astype(np.float32)
+            if np.array_equal(narrowed.astype(values.dtype), values, equal_nan=True):
+                df[col] = narrowed
+    return df
+
+
+# Serialization options for cached analysis results (numpy scalars, int keys)
+_RESULT_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class DatasetStore:
+    """
+    Uploaded datasets shared by every worker process
+
+    Each DataFrame is written once as an Arrow IPC (Feather v2) file and read
+    back through a memory map, so the data lives in the OS page cache rather
+    than in each worker's heap. Redis only holds the path and shape metadata.
+    """
+
+    def __init__(
+        self, data_dir: Optional[str] = None, redis_url: Optional[str] = None
+    ):
+        self.data_dir = data_dir or os.getenv("DATASET_DIR", "/tmp/datasets")
+        os.makedirs(self.data_dir, exist_ok=True)
+        redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379")
+        self.redis = redis.Redis.from_url(redis_url, decode_responses=True)
+        # Binary values (Arrow buffers) must not go through response decoding
+        self.raw_redis = redis.Redis.from_url(redis_url)
+
+    def next_id(self) -> int:
+        """Cluster-wide upload counter used to build dataset ids"""
+        return self.redis.incr("datasets:seq") - 1
+
+    def save(self, dataset_id: str, df: pd.DataFrame) -> Dict[str, Any]:
+        """Persist a DataFrame and register its metadata"""
+        table = pa.Table.from_pandas(df)
+        path = os.path.join(self.data_dir, f"{dataset_id}.arrow")
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+        meta = {
+            "path": path,
+            "nrows": len(df),
+            "ncols": len(df.columns),
+            "columns": orjson.dumps([str(c) for c in df.columns]).decode(),
+            "dtypes": orjson.dumps(df.dtypes.astype(str).to_dict()).decode(),
+        }
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hset(f"dataset:{dataset_id}", mapping=meta)
+        pipe.sadd("datasets", dataset_id)
+        pipe.execute()
+
+        logger.info(f"Stored dataset {dataset_id} at {path}")
+        return meta
+
+    def exists(self, dataset_id: str) -> bool:
+        """Whether a dataset has been stored"""
+        return bool(self.redis.exists(f"dataset:{dataset_id}"))
+
+    def meta(self, dataset_id: str) -> Optional[Dict[str, Any]]:
+        """Stored metadata for a dataset, or None if unknown"""
+        meta = self.redis.hgetall(f"dataset:{dataset_id}")
+        if not meta:
+            return None
+        meta["nrows"] = int(meta["nrows"])
+        meta["ncols"] = int(meta["ncols"])
+        meta["columns"] = orjson.loads(meta["columns"])
+        meta["dtypes"] = orjson.loads(meta["dtypes"])
+        return meta
+
+    def load(
+        self, dataset_id: str, rows: Optional[int] = None, path: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Load a dataset from its memory-mapped Arrow file
+        With rows set, only that prefix is converted to pandas. Callers that
+        already hold the metadata can pass its path to skip the Redis lookup.
+        Raises KeyError for unknown datasets.
+        """
+        if path is None:
+            path = self.redis.hget(f"dataset:{dataset_id}", "path")
+        if path is None:
+            raise KeyError(dataset_id)
+
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        if rows is not None:
+            table = table.slice(0, rows)
+        return table.to_pandas()
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Id and shape of every stored dataset"""
+        ids = sorted(self.redis.smembers("datasets"))
+        pipe = self.redis.pipeline(transaction=False)
+        for dataset_id in ids:
+            pipe.hmget(f"dataset:{dataset_id}", "nrows", "ncols")
+        shapes = pipe.execute()
+
+        return [
+            {"id": dataset_id, "rows": int(nrows), "cols": int(ncols)}
+            for dataset_id, (nrows, ncols) in zip(ids, shapes)
+            if nrows is not None
+        ]
+
+    @staticmethod
+    def content_hash(df: pd.DataFrame) -> str:
+        """Fingerprint of a DataFrame's values, index and column labels"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        digest.update(orjson.dumps([str(c) for c in df.columns]))
+        return digest.hexdigest()
+
+    def get_cached_result(self, kind: str, digest: str) -> Optional[str]:
+        """Serialized JSON of a cached analysis, or None on a miss"""
+        return self.redis.get(f"{kind}:{digest}")
+
+    def cache_result(
+        self, kind: str, digest: str, result: Any, ttl: int = 3600
+    ) -> bytes:
+        """Cache an analysis result as JSON and return the serialized bytes"""
+        payload = orjson.dumps(result, option=_RESULT_OPTS)
+        self.redis.set(f"{kind}:{digest}", payload, ex=ttl)
+        return payload
+
+    def cache_frame(
+        self, kind: str, dataset_id: str, frame: pd.DataFrame, ttl: int = 86400
+    ):
+        """Cache a derived DataFrame (e.g. a correlation matrix) as an Arrow buffer"""
+        table = pa.Table.from_pandas(frame)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        self.raw_redis.set(f"{kind}:{dataset_id}", sink.getvalue().to_pybytes(), ex=ttl)
+
+    def get_cached_frame(self, kind: str, dataset_id: str) -> Optional[pd.DataFrame]:
+        """A DataFrame stored by cache_frame, or None on a miss"""
+        raw = self.raw_redis.get(f"{kind}:{dataset_id}")
+        if raw is None:
+            return None
+        return pa.ipc.open_stream(raw).read_all().to_pandas()
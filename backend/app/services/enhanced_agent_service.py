@@ -8,6 +8,7 @@ import pandas as pd
 
 from app.utils.config import settings
 from app.services.redis_service import RedisService
+from app.services.dataset_store import downcast_dtypes
 from app.tools.kaggle_tool import KaggleTool
 from app.tools.execution_tool import ExecutionTool
 from app.tools.eda_tool import EDATool
@@ -56,7 +57,12 @@ class EnhancedAgentService:
 
                 csv_files = [f for f in os.listdir(dataset_path) if f.endswith(".csv")]
                 if csv_files:
-                    df = pd.read_csv(os.path.join(dataset_path, csv_files[0]))
+                    # Multithreaded Arrow parser, then the same downcast as uploads
+                    # so every EDA/ML pass moves fewer bytes
+                    df = pd.read_csv(
+                        os.path.join(dataset_path, csv_files[0]), engine="pyarrow"
+                    )
+                    df = downcast_dtypes(df)
 
             results = {"job_id": job_id, "status": "completed", "query": query}
 
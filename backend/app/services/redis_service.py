@@ -1,37 +1,76 @@
 import redis.asyncio as redis
-import json
-from typing import Optional, Dict, Any
+import orjson
+from typing import Optional, Dict, Any, Sequence
 from app.utils.config import settings
 
+# json.dumps parity: non-string dict keys are stringified rather than rejected
+_JSON_OPTS = orjson.OPT_NON_STR_KEYS
+
 
 class RedisService:
     def __init__(self):
         self.client: Optional[redis.Redis] = None
 
     async def connect(self):
-        self.client = await redis.from_url(
-            settings.redis_url, encoding="utf-8", decode_responses=True
-        )
+        # Values are orjson bytes in and out; no UTF-8 decode round-trip
+        self.client = await redis.from_url(settings.redis_url, decode_responses=False)
 
     async def close(self):
         if self.client:
             await self.client.close()
 
+    def pipeline(self):
+        """Non-transactional pipeline for batching commands into one round-trip"""
+        return self.client.pipeline(transaction=False)
+
     async def set_session(self, session_id: str, data: Dict[str, Any], ttl: int = 3600):
         """Store session data with TTL"""
-        await self.client.setex(f"session:{session_id}", ttl, json.dumps(data))
+        await self.client.setex(
+            f"session:{session_id}", ttl, orjson.dumps(data, option=_JSON_OPTS)
+        )
 
     async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve session data"""
         data = await self.client.get(f"session:{session_id}")
-        return json.loads(data) if data else None
+        return orjson.loads(data) if data else None
 
     async def append_to_history(self, session_id: str, message: Dict[str, Any]):
-        """Append message to session history"""
-        await self.client.rpush(f"history:{session_id}", json.dumps(message))
-        await self.client.expire(f"history:{session_id}", 3600)
+        """Append message to session history and refresh its TTL atomically"""
+        key = f"history:{session_id}"
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, orjson.dumps(message, option=_JSON_OPTS))
+            pipe.expire(key, 3600)
+            await pipe.execute()
 
     async def get_history(self, session_id: str, limit: int = 10) -> list:
         """Get recent session history"""
         messages = await self.client.lrange(f"history:{session_id}", -limit, -1)
-        return [json.loads(msg) for msg in messages]
+        return [orjson.loads(msg) for msg in messages]
+
+    async def save_turn(
+        self,
+        session_id: str,
+        session_data: Dict[str, Any],
+        message: Dict[str, Any],
+        ttl: int = 3600,
+    ):
+        """Append a history message and store session data in one round-trip"""
+        async with self.pipeline() as pipe:
+            history_key = f"history:{session_id}"
+            pipe.rpush(history_key, orjson.dumps(message, option=_JSON_OPTS))
+            pipe.expire(history_key, ttl)
+            pipe.setex(
+                f"session:{session_id}",
+                ttl,
+                orjson.dumps(session_data, option=_JSON_OPTS),
+            )
+            await pipe.execute()
+
+    async def get_llm_response(self, key: str) -> Optional[list]:
+        """Cached parsed LLM response for a prompt digest"""
+        data = await self.client.get(f"llm:{key}")
+        return orjson.loads(data) if data else None
+
+    async def set_llm_response(self, key: str, parsed: Sequence[str], ttl: int = 3600):
+        """Cache a parsed LLM response under its prompt digest"""
+        await self.client.setex(f"llm:{key}", ttl, orjson.dumps(list(parsed)))
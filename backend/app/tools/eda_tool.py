@@ -2,23 +2,172 @@
 Automated EDA Tool - Comprehensive exploratory data analysis
 """
 
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Dict, Any, List
-from pathlib import Path
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+import seaborn as sns  # noqa: E402
+from typing import Dict, Any, List, Optional, Tuple  # noqa: E402
+from pathlib import Path  # noqa: E402
+
+from app.utils.kernels import correlation_matrix, count_outliers  # noqa: E402
 
 
 class EDAToolError(Exception):
     pass
 
 
+def _init_plot_worker():
+    """Plot styling for worker processes (spawned workers start unstyled)"""
+    sns.set_style("whitegrid")
+
+
+# Below this many numeric cells the figures are drawn in-process; pickling the
+# arrays to worker processes costs more than the rendering it parallelizes
+PARALLEL_PLOT_MIN_CELLS = 200_000
+
+# At most one job per figure kind is submitted per EDA run
+_MAX_PLOT_WORKERS = 5
+
+_PLOT_POOL: Optional[ProcessPoolExecutor] = None
+_PLOT_POOL_LOCK = threading.Lock()
+
+# In-process rendering shares one module-level Figure, so it is serialized
+_SERIAL_PLOT_LOCK = threading.Lock()
+
+
+def _plot_pool() -> ProcessPoolExecutor:
+    """Long-lived plotting pool, started on first use and shared by all runs"""
+    global _PLOT_POOL
+    with _PLOT_POOL_LOCK:
+        if _PLOT_POOL is None:
+            _PLOT_POOL = ProcessPoolExecutor(
+                max_workers=min(_MAX_PLOT_WORKERS, os.cpu_count() or 1),
+                initializer=_init_plot_worker,
+            )
+        return _PLOT_POOL
+
+
+def _discard_plot_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next run starts a fresh one"""
+    global _PLOT_POOL
+    with _PLOT_POOL_LOCK:
+        if _PLOT_POOL is pool:
+            _PLOT_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Each worker process draws every figure on one Figure, cleared and resized
+# between plots, instead of allocating and closing a new one per plot
+_FIG = None
+
+
+def _figure(figsize: Tuple[float, float]) -> Figure:
+    """The worker's reusable figure, cleared and resized"""
+    global _FIG
+    if _FIG is None:
+        _FIG = plt.figure()
+    _FIG.clear()
+    _FIG.set_size_inches(*figsize)
+    return _FIG
+
+
+def _plot_heatmap(corr: np.ndarray, names: List[str], path: str, dpi: int) -> str:
+    """Correlation heatmap"""
+    fig = _figure((12, 10))
+    ax = fig.add_subplot()
+    sns.heatmap(
+        pd.DataFrame(corr, index=names, columns=names),
+        annot=True,
+        cmap="coolwarm",
+        center=0,
+        fmt=".2f",
+        ax=ax,
+    )
+    ax.set_title("Correlation Heatmap")
+    fig.savefig(path, dpi=dpi, bbox_inches="tight")
+    return path
+
+
+def _plot_distributions(
+    values: np.ndarray, names: List[str], path: str, dpi: int
+) -> str:
+    """Histogram grid, one panel per numeric column"""
+    n_cols = min(4, len(names))
+    n_rows = (len(names) + n_cols - 1) // n_cols
+    fig = _figure((20, 5 * n_rows))
+    axes = np.atleast_1d(fig.subplots(n_rows, n_cols)).ravel()
+
+    for idx, col in enumerate(names):
+        column = values[:, idx]
+        axes[idx].hist(column[~np.isnan(column)], bins=30, edgecolor="black")
+        axes[idx].set_title(f"Distribution of {col}")
+        axes[idx].set_xlabel(col)
+        axes[idx].set_ylabel("Frequency")
+
+    # Hide empty subplots
+    for idx in range(len(names), len(axes)):
+        axes[idx].axis("off")
+
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi, bbox_inches="tight")
+    return path
+
+
+def _plot_boxplots(values: np.ndarray, names: List[str], path: str, dpi: int) -> str:
+    """Side-by-side box plots"""
+    fig = _figure((15, 6))
+    ax = fig.add_subplot()
+    pd.DataFrame(values, columns=names).boxplot(ax=ax)
+    ax.set_title("Box Plots - Outlier Detection")
+    plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+    fig.savefig(path, dpi=dpi, bbox_inches="tight")
+    return path
+
+
+def _plot_missing(counts: np.ndarray, names: List[str], path: str, dpi: int) -> str:
+    """Missing-value counts per column, largest first"""
+    fig = _figure((12, 6))
+    ax = fig.add_subplot()
+    pd.Series(counts, index=names).plot(kind="bar", ax=ax)
+    ax.set_title("Missing Data by Column")
+    ax.set_xlabel("Columns")
+    ax.set_ylabel("Number of Missing Values")
+    plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+    fig.savefig(path, dpi=dpi, bbox_inches="tight")
+    return path
+
+
+def _plot_pairplot(
+    sample: np.ndarray, names: List[str], path: str, dpi: int
+) -> Optional[str]:
+    """Pairplot of a row sample; None if seaborn fails"""
+    # seaborn builds its own grid figure, so this one is not reused
+    try:
+        pairplot = sns.pairplot(pd.DataFrame(sample, columns=names))
+        pairplot.savefig(path, dpi=dpi, bbox_inches="tight")
+        plt.close(pairplot.figure)
+        return path
+    except Exception as e:
+        print(f"Pairplot generation failed: {e}")
+        return None
+
+
 class EDATool:
     """Automated Exploratory Data Analysis"""
 
-    def __init__(self, output_dir: str = "/outputs"):
+    def __init__(self, output_dir: str = "/outputs", preview_dpi: int = 120):
         self.output_dir = Path(output_dir)
+        # EDA figures are previews; 300 dpi rasterized ~6x the pixels of 120
+        self.preview_dpi = preview_dpi
         self.output_dir.mkdir(parents=True, exist_ok=True)
         sns.set_style("whitegrid")
 
@@ -27,19 +176,26 @@ class EDATool:
         Comprehensive EDA pipeline
         Returns insights and saves visualizations
         """
+        # Numeric columns are selected once and every per-column statistic
+        # comes from one aggregation pass plus one quantile pass
+        numeric_df = df.select_dtypes(include=[np.number])
+        agg, q = self._numeric_stats(numeric_df)
+        # One correlation matrix for both the report and the heatmap
+        corr = self._correlation_matrix(numeric_df, agg)
+
         results = {
             "basic_info": self._get_basic_info(df),
-            "summary_stats": self._get_summary_stats(df),
+            "summary_stats": self._get_summary_stats(agg, q),
             "missing_data": self._analyze_missing_data(df),
-            "correlations": self._analyze_correlations(df),
-            "distributions": self._analyze_distributions(df, job_id),
-            "outliers": self._detect_outliers(df),
+            "correlations": self._analyze_correlations(corr),
+            "distributions": self._analyze_distributions(agg),
+            "outliers": self._detect_outliers(numeric_df, q),
             "categorical_analysis": self._analyze_categorical(df, job_id),
             "visualizations": [],
         }
 
         # Generate visualizations
-        viz_paths = self._generate_visualizations(df, job_id)
+        viz_paths = self._generate_visualizations(df, numeric_df, corr, job_id)
         results["visualizations"] = viz_paths
 
         return results
@@ -53,20 +209,42 @@ class EDATool:
             "memory_usage_mb": df.memory_usage(deep=True).sum() / 1024**2,
         }
 
-    def _get_summary_stats(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Summary statistics for numeric columns"""
-        numeric_df = df.select_dtypes(include=[np.number])
+    def _numeric_stats(
+        self, numeric_df: pd.DataFrame
+    ) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+        """Per-column aggregates and quartiles, as small stats-by-column frames"""
         if numeric_df.empty:
-            return {}
+            return None, None
 
-        stats = numeric_df.describe().to_dict()
+        agg = numeric_df.agg(
+            ["count", "mean", "median", "std", "min", "max", "nunique", "skew", "kurt"]
+        )
+        q = numeric_df.quantile([0.25, 0.5, 0.75])
+        return agg, q
 
-        # Add additional stats
-        for col in numeric_df.columns:
-            stats[col]["skewness"] = float(numeric_df[col].skew())
-            stats[col]["kurtosis"] = float(numeric_df[col].kurtosis())
+    def _get_summary_stats(
+        self, agg: Optional[pd.DataFrame], q: Optional[pd.DataFrame]
+    ) -> Dict[str, Any]:
+        """Summary statistics for numeric columns"""
+        if agg is None:
+            return {}
 
-        return stats
+        # Same keys as describe(), plus skewness and kurtosis
+        return {
+            col: {
+                "count": float(agg.at["count", col]),
+                "mean": float(agg.at["mean", col]),
+                "std": float(agg.at["std", col]),
+                "min": float(agg.at["min", col]),
+                "25%": float(q.at[0.25, col]),
+                "50%": float(q.at[0.5, col]),
+                "75%": float(q.at[0.75, col]),
+                "max": float(agg.at["max", col]),
+                "skewness": float(agg.at["skew", col]),
+                "kurtosis": float(agg.at["kurt", col]),
+            }
+            for col in agg.columns
+        }
 
     def _analyze_missing_data(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Analyze missing data patterns"""
@@ -81,69 +259,88 @@ class EDATool:
             },
         }
 
-    def _analyze_correlations(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _correlation_matrix(
+        self, numeric_df: pd.DataFrame, agg: Optional[pd.DataFrame]
+    ) -> Optional[pd.DataFrame]:
+        """
+        Pearson correlations between the non-constant numeric columns
+        Constant columns (all-NaN correlations) are dropped up front.
+        """
+        if agg is None:
+            return None
+        cols = agg.columns[agg.loc["std"].to_numpy(dtype=np.float64) > 0]
+        if len(cols) < 2:
+            return None
+        return correlation_matrix(numeric_df[cols]).astype(np.float64)
+
+    def _analyze_correlations(self, corr: Optional[pd.DataFrame]) -> Dict[str, Any]:
         """Correlation analysis for numeric features"""
-        numeric_df = df.select_dtypes(include=[np.number])
-        if numeric_df.shape[1] < 2:
+        if corr is None:
             return {}
 
-        corr_matrix = numeric_df.corr()
-
-        # Find high correlations
-        high_corr = []
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i + 1, len(corr_matrix.columns)):
-                if abs(corr_matrix.iloc[i, j]) > 0.7:
-                    high_corr.append(
-                        {
-                            "feature1": corr_matrix.columns[i],
-                            "feature2": corr_matrix.columns[j],
-                            "correlation": float(corr_matrix.iloc[i, j]),
-                        }
-                    )
+        # Find high correlations over the upper triangle in one pass
+        values = corr.to_numpy()
+        i, j = np.triu_indices(len(corr.columns), k=1)
+        pairs = values[i, j]
+        strong = np.abs(pairs) > 0.7
+        high_corr = [
+            {
+                "feature1": corr.columns[a],
+                "feature2": corr.columns[b],
+                "correlation": float(r),
+            }
+            for a, b, r in zip(i[strong], j[strong], pairs[strong])
+        ]
 
         return {
-            "correlation_matrix": corr_matrix.to_dict(),
+            "correlation_matrix": corr.to_dict(),
             "high_correlations": high_corr,
         }
 
-    def _analyze_distributions(self, df: pd.DataFrame, job_id: str) -> Dict[str, Any]:
+    def _analyze_distributions(self, agg: Optional[pd.DataFrame]) -> Dict[str, Any]:
         """Analyze distributions of numeric features"""
-        numeric_df = df.select_dtypes(include=[np.number])
-        distributions = {}
-
-        for col in numeric_df.columns:
-            distributions[col] = {
-                "mean": float(numeric_df[col].mean()),
-                "median": float(numeric_df[col].median()),
-                "std": float(numeric_df[col].std()),
-                "min": float(numeric_df[col].min()),
-                "max": float(numeric_df[col].max()),
-                "unique_values": int(numeric_df[col].nunique()),
-            }
+        if agg is None:
+            return {}
 
-        return distributions
+        return {
+            col: {
+                "mean": float(agg.at["mean", col]),
+                "median": float(agg.at["median", col]),
+                "std": float(agg.at["std", col]),
+                "min": float(agg.at["min", col]),
+                "max": float(agg.at["max", col]),
+                "unique_values": int(agg.at["nunique", col]),
+            }
+            for col in agg.columns
+        }
 
-    def _detect_outliers(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _detect_outliers(
+        self, numeric_df: pd.DataFrame, q: Optional[pd.DataFrame]
+    ) -> Dict[str, Any]:
         """Detect outliers using IQR method"""
-        numeric_df = df.select_dtypes(include=[np.number])
         outliers = {}
-
-        for col in numeric_df.columns:
-            Q1 = numeric_df[col].quantile(0.25)
-            Q3 = numeric_df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-
-            outlier_count = (
-                (numeric_df[col] < lower_bound) | (numeric_df[col] > upper_bound)
-            ).sum()
-
+        if numeric_df.empty:
+            return outliers
+
+        # Bounds and counts for every column at once over one float64 block
+        Q1 = q.loc[0.25].to_numpy()
+        Q3 = q.loc[0.75].to_numpy()
+        IQR = Q3 - Q1
+        lower = Q1 - 1.5 * IQR
+        upper = Q3 + 1.5 * IQR
+
+        # Column-major so the kernel sweeps each column contiguously; one fused
+        # compare-and-count pass (parallel numba when available)
+        arr = np.asfortranarray(numeric_df.to_numpy(dtype=np.float64))
+        counts = count_outliers(arr, lower, upper)
+
+        for col, outlier_count, lower_bound, upper_bound in zip(
+            numeric_df.columns, counts, lower, upper
+        ):
             if outlier_count > 0:
                 outliers[col] = {
                     "count": int(outlier_count),
-                    "percentage": float((outlier_count / len(df)) * 100),
+                    "percentage": float((outlier_count / len(numeric_df)) * 100),
                     "lower_bound": float(lower_bound),
                     "upper_bound": float(upper_bound),
                 }
@@ -165,85 +362,85 @@ class EDATool:
 
         return analysis
 
-    def _generate_visualizations(self, df: pd.DataFrame, job_id: str) -> List[str]:
-        """Generate comprehensive visualizations"""
-        viz_paths = []
+    def _generate_visualizations(
+        self,
+        df: pd.DataFrame,
+        numeric_df: pd.DataFrame,
+        corr: Optional[pd.DataFrame],
+        job_id: str,
+    ) -> List[str]:
+        """
+        Generate comprehensive visualizations
+        The figures are independent and dominated by Agg rasterization, so on
+        large frames each one is rendered in a worker of a shared process pool.
+        Small frames are drawn in-process. Either way the plot functions get
+        plain arrays and column names rather than the full DataFrame.
+        """
+        names = [str(c) for c in numeric_df.columns]
+        values = numeric_df.to_numpy(dtype=np.float64)
+        jobs = []
 
         # 1. Correlation heatmap
-        numeric_df = df.select_dtypes(include=[np.number])
-        if numeric_df.shape[1] >= 2:
-            plt.figure(figsize=(12, 10))
-            sns.heatmap(
-                numeric_df.corr(), annot=True, cmap="coolwarm", center=0, fmt=".2f"
-            )
-            plt.title("Correlation Heatmap")
+        if corr is not None:
             path = self.output_dir / f"{job_id}_correlation_heatmap.png"
-            plt.savefig(path, dpi=300, bbox_inches="tight")
-            plt.close()
-            viz_paths.append(str(path))
+            jobs.append(
+                (
+                    _plot_heatmap,
+                    corr.to_numpy(),
+                    [str(c) for c in corr.columns],
+                    str(path),
+                )
+            )
 
         # 2. Distribution plots for numeric features
         if not numeric_df.empty:
-            n_cols = min(4, len(numeric_df.columns))
-            n_rows = (len(numeric_df.columns) + n_cols - 1) // n_cols
-            fig, axes = plt.subplots(n_rows, n_cols, figsize=(20, 5 * n_rows))
-            axes = axes.flatten() if n_rows > 1 else [axes]
-
-            for idx, col in enumerate(numeric_df.columns):
-                if idx < len(axes):
-                    numeric_df[col].hist(bins=30, ax=axes[idx], edgecolor="black")
-                    axes[idx].set_title(f"Distribution of {col}")
-                    axes[idx].set_xlabel(col)
-                    axes[idx].set_ylabel("Frequency")
-
-            # Hide empty subplots
-            for idx in range(len(numeric_df.columns), len(axes)):
-                axes[idx].axis("off")
-
-            plt.tight_layout()
             path = self.output_dir / f"{job_id}_distributions.png"
-            plt.savefig(path, dpi=300, bbox_inches="tight")
-            plt.close()
-            viz_paths.append(str(path))
+            jobs.append((_plot_distributions, values, names, str(path)))
 
         # 3. Box plots for outlier detection
         if not numeric_df.empty and len(numeric_df.columns) <= 10:
-            plt.figure(figsize=(15, 6))
-            numeric_df.boxplot()
-            plt.title("Box Plots - Outlier Detection")
-            plt.xticks(rotation=45, ha="right")
             path = self.output_dir / f"{job_id}_boxplots.png"
-            plt.savefig(path, dpi=300, bbox_inches="tight")
-            plt.close()
-            viz_paths.append(str(path))
+            jobs.append((_plot_boxplots, values, names, str(path)))
 
         # 4. Missing data visualization
-        if df.isnull().sum().sum() > 0:
-            plt.figure(figsize=(12, 6))
-            missing_data = df.isnull().sum()
-            missing_data = missing_data[missing_data > 0].sort_values(ascending=False)
-            missing_data.plot(kind="bar")
-            plt.title("Missing Data by Column")
-            plt.xlabel("Columns")
-            plt.ylabel("Number of Missing Values")
-            plt.xticks(rotation=45, ha="right")
+        missing_data = df.isnull().sum()
+        missing_data = missing_data[missing_data > 0].sort_values(ascending=False)
+        if not missing_data.empty:
             path = self.output_dir / f"{job_id}_missing_data.png"
-            plt.savefig(path, dpi=300, bbox_inches="tight")
-            plt.close()
-            viz_paths.append(str(path))
+            jobs.append(
+                (
+                    _plot_missing,
+                    missing_data.to_numpy(),
+                    [str(c) for c in missing_data.index],
+                    str(path),
+                )
+            )
 
         # 5. Pairplot for top numeric features (if not too many)
         if 2 <= numeric_df.shape[1] <= 5 and len(df) <= 1000:
+            sample = numeric_df.sample(min(500, len(df))).to_numpy(dtype=np.float64)
+            path = self.output_dir / f"{job_id}_pairplot.png"
+            jobs.append((_plot_pairplot, sample, names, str(path)))
+
+        if not jobs:
+            return []
+
+        paths = None
+        if len(jobs) > 1 and values.size >= PARALLEL_PLOT_MIN_CELLS:
+            pool = _plot_pool()
             try:
-                pairplot = sns.pairplot(numeric_df.sample(min(500, len(df))))
-                path = self.output_dir / f"{job_id}_pairplot.png"
-                pairplot.savefig(path, dpi=300, bbox_inches="tight")
-                plt.close()
-                viz_paths.append(str(path))
-            except Exception as e:
-                print(f"Pairplot generation failed: {e}")
-
-        return viz_paths
+                futures = [
+                    pool.submit(fn, *args, self.preview_dpi) for fn, *args in jobs
+                ]
+                paths = [future.result() for future in futures]
+            except BrokenProcessPool:
+                _discard_plot_pool(pool)
+
+        if paths is None:
+            with _SERIAL_PLOT_LOCK:
+                paths = [fn(*args, self.preview_dpi) for fn, *args in jobs]
+
+        return [path for path in paths if path is not None]
 
     def generate_eda_summary(self, results: Dict[str, Any]) -> str:
         """Generate human-readable EDA summary"""
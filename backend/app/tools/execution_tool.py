@@ -1,4 +1,4 @@
-import subprocess
+import asyncio
 import os
 import json
 import tempfile
@@ -33,34 +33,40 @@ class ExecutionTool:
             with open(script_path, "w") as f:
                 f.write(wrapped_code)
 
-            # Execute with timeout
+            # Execute with timeout without blocking the event loop
             try:
-                result = subprocess.run(
-                    ["python", script_path],
-                    capture_output=True,
-                    text=True,
-                    timeout=self.max_time,
+                proc = await asyncio.create_subprocess_exec(
+                    "python",
+                    script_path,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
                     cwd=workdir,
                 )
+                try:
+                    stdout, stderr = await asyncio.wait_for(
+                        proc.communicate(), timeout=self.max_time
+                    )
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    await proc.wait()
+                    logger.error(f"Execution timeout for job {job_id}")
+                    return {
+                        "status": "timeout",
+                        "error": f"Execution exceeded {self.max_time}s limit",
+                    }
 
                 # Collect results
                 results = self._collect_results(outputs_dir)
                 artifacts = self._collect_artifacts(outputs_dir)
 
                 return {
-                    "status": "success" if result.returncode == 0 else "error",
-                    "stdout": result.stdout,
-                    "stderr": result.stderr,
+                    "status": "success" if proc.returncode == 0 else "error",
+                    "stdout": stdout.decode(errors="replace"),
+                    "stderr": stderr.decode(errors="replace"),
                     "results": results,
                     "artifacts": artifacts,
                 }
 
-            except subprocess.TimeoutExpired:
-                logger.error(f"Execution timeout for job {job_id}")
-                return {
-                    "status": "timeout",
-                    "error": f"Execution exceeded {self.max_time}s limit",
-                }
             except Exception as e:
                 logger.error(f"Execution error for job {job_id}: {str(e)}")
                 return {"status": "error", "error": str(e)}
@@ -21,6 +21,9 @@ class Settings(BaseSettings):
     max_execution_time: int = 45
     max_memory_mb: int = 1536
 
+    # LLM response cache
+    llm_cache_ttl: int = 3600
+
     # Vector DB
     vector_db_url: Optional[str] = None
     vector_db_api_key: Optional[str] = None
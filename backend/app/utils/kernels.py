@@ -0,0 +1,58 @@
+"""Numeric kernels shared by the EDA engine, preprocessing and tools"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, cache=True)
+    def count_outliers(A, lo, hi):
+        """Per-column count of values outside [lo, hi]; NaNs are never counted"""
+        n, k = A.shape
+        out = np.zeros(k, np.int64)
+        for j in prange(k):
+            c = 0
+            for i in range(n):
+                v = A[i, j]
+                if v < lo[j] or v > hi[j]:
+                    c += 1
+            out[j] = c
+        return out
+
+else:
+
+    def count_outliers(A, lo, hi):
+        """Per-column count of values outside [lo, hi]; NaNs are never counted"""
+        return ((A < lo) | (A > hi)).sum(axis=0)
+
+
+def pearson_matrix(X: np.ndarray) -> np.ndarray:
+    """
+    Pearson correlations between the columns of a NaN-free matrix
+    One float32 BLAS product over the centered columns; constant columns get
+    NaN rows and columns, as in DataFrame.corr().
+    """
+    # Not in place: to_numpy may return a read-only view of a DataFrame block
+    X = np.asarray(X, dtype=np.float32)
+    X = X - X.mean(axis=0)
+    std = X.std(axis=0, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = (X.T @ X) / (len(X) - 1) / np.outer(std, std)
+    np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+    return np.clip(corr, -1.0, 1.0)
+
+
+def correlation_matrix(frame: pd.DataFrame) -> pd.DataFrame:
+    """Pearson correlation matrix of an all-numeric frame"""
+    X = frame.to_numpy(dtype=np.float32)
+    if len(X) < 2 or np.isnan(X).any():
+        # Pairwise-complete handling of missing values needs pandas
+        return frame.corr()
+    return pd.DataFrame(pearson_matrix(X), index=frame.columns, columns=frame.columns)
@@ -0,0 +1,21 @@
+"""orjson-backed JSON response used as the API's default response class"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson
+
+    Unlike fastapi.responses.ORJSONResponse this also accepts non-string
+    dict keys and numpy arrays/scalars, which show up in EDA and ML payloads.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
@@ -4,11 +4,18 @@ Tool Registry - MCP-style tool discovery and invocation
 
 import json
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Manifest input types that are checked, mapped to (python type, type name)
+_INPUT_TYPES = {
+    "string": (str, "string"),
+    "integer": (int, "integer"),
+    "boolean": (bool, "boolean"),
+}
+
 
 class ToolRegistry:
     """Registry for MCP-style tool manifests"""
@@ -16,6 +23,10 @@ class ToolRegistry:
     def __init__(self, manifests_dir: str = "backend/mcp/manifests"):
         self.manifests_dir = Path(manifests_dir)
         self.tools: Dict[str, dict] = {}
+        # Precompiled (required params, {param: expected type}) per tool
+        self._validators: Dict[str, Tuple[List[str], Dict[str, tuple]]] = {}
+        # Bumped whenever the set of tools changes so callers can drop caches
+        self.version = 0
         self.load_manifests()
 
     def load_manifests(self):
@@ -31,10 +42,28 @@ class ToolRegistry:
                     tool_id = manifest.get("tool_id")
                     if tool_id:
                         self.tools[tool_id] = manifest
+                        self._validators[tool_id] = self._compile_validator(manifest)
                         logger.info(f"Loaded tool: {tool_id}")
             except Exception as e:
                 logger.error(f"Failed to load manifest {manifest_file}: {e}")
 
+        self.version += 1
+
+    @staticmethod
+    def _compile_validator(manifest: dict) -> Tuple[List[str], Dict[str, tuple]]:
+        """Precompute required params and type checks from a manifest"""
+        manifest_inputs = manifest.get("inputs", {})
+        required = [
+            name
+            for name, spec in manifest_inputs.items()
+            if spec.get("required", False)
+        ]
+        types = {
+            name: _INPUT_TYPES.get(spec.get("type"))
+            for name, spec in manifest_inputs.items()
+        }
+        return required, types
+
     def get_tool(self, tool_id: str) -> Optional[dict]:
         """Get tool manifest by ID"""
         return self.tools.get(tool_id)
@@ -54,29 +83,24 @@ class ToolRegistry:
 
     def validate_inputs(self, tool_id: str, inputs: dict) -> tuple[bool, Optional[str]]:
         """Validate inputs against tool manifest"""
-        tool = self.get_tool(tool_id)
-        if not tool:
+        if tool_id not in self._validators:
             return False, f"Tool not found: {tool_id}"
 
-        manifest_inputs = tool.get("inputs", {})
+        required, types = self._validators[tool_id]
 
         # Check required inputs
-        for param_name, param_spec in manifest_inputs.items():
-            if param_spec.get("required", False) and param_name not in inputs:
+        for param_name in required:
+            if param_name not in inputs:
                 return False, f"Missing required parameter: {param_name}"
 
         # Check types (basic validation)
         for param_name, value in inputs.items():
-            if param_name not in manifest_inputs:
+            if param_name not in types:
                 return False, f"Unknown parameter: {param_name}"
 
-            expected_type = manifest_inputs[param_name].get("type")
-            if expected_type == "string" and not isinstance(value, str):
-                return False, f"Parameter {param_name} must be string"
-            elif expected_type == "integer" and not isinstance(value, int):
-                return False, f"Parameter {param_name} must be integer"
-            elif expected_type == "boolean" and not isinstance(value, bool):
-                return False, f"Parameter {param_name} must be boolean"
+            expected = types[param_name]
+            if expected and not isinstance(value, expected[0]):
+                return False, f"Parameter {param_name} must be {expected[1]}"
 
         return True, None
 
@@ -0,0 +1,45 @@
+from a2a.protocol import (
+    A2AMessage,
+    MessageType,
+    TaskRequest,
+    TaskResult,
+    TaskStatus,
+    create_task_request,
+    create_task_result,
+    create_task_status,
+)
+
+
+def test_helper_payloads_match_models():
+    """Hand-built payloads must stay in sync with the payload models"""
+    request = create_task_request("a", "b", "t1", "analyzer.eda", {"x": 1})
+    status = create_task_status("a", "b", "t1", "running", progress=0.5)
+    result = create_task_result("a", "b", "t1", "completed", outputs={"y": 2})
+
+    assert request.payload == TaskRequest(**request.payload).model_dump()
+    assert status.payload == TaskStatus(**status.payload).model_dump()
+    assert result.payload == TaskResult(**result.payload).model_dump()
+
+
+def test_message_json_roundtrip():
+    """Messages survive both the str and bytes encodings"""
+    message = create_task_request("a", "b", "t1", "analyzer.eda", {"x": 1})
+
+    from_str = A2AMessage.from_json(message.to_json())
+    from_bytes = A2AMessage.from_json_bytes(message.to_json_bytes())
+
+    assert from_str == from_bytes
+    assert from_bytes.type == MessageType.TASK_REQUEST
+    assert from_bytes.payload["inputs"] == {"x": 1}
+
+
+def test_message_msgpack_roundtrip():
+    """msgpack-encoded results decode back to the same message"""
+    message = create_task_result(
+        "a", "b", "t1", "completed", outputs={"values": [1.5, 2.5]}, encoding="msgpack"
+    )
+
+    decoded = A2AMessage.decode(message.encode(), "msgpack")
+
+    assert decoded.encoding == "msgpack"
+    assert decoded.payload["outputs"] == {"values": [1.5, 2.5]}
@@ -1,7 +1,15 @@
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
+from app.services import agent_service
 from app.services.agent_service import AgentService
 from app.services.redis_service import RedisService
+from app.schemas.query import QueryResponse
+
+
+@pytest.fixture(autouse=True)
+def clear_llm_cache():
+    """Each test starts with an empty in-process response cache"""
+    agent_service._LLM_CACHE.clear()
 
 
 @pytest.fixture
@@ -11,6 +19,9 @@ def mock_redis():
     redis.get_session = AsyncMock(return_value={})
     redis.append_to_history = AsyncMock()
     redis.set_session = AsyncMock()
+    redis.save_turn = AsyncMock()
+    redis.get_llm_response = AsyncMock(return_value=None)
+    redis.set_llm_response = AsyncMock()
     return redis
 
 
@@ -40,6 +51,46 @@ Test explanation
         assert "job_id" in result
         assert result["plan"] == "Test plan"
         assert 'print("test")' in result["code"]
+        mock_redis.save_turn.assert_awaited_once()
+        # /query returns this dict without revalidating it at runtime
+        assert set(result) <= set(QueryResponse.model_fields)
+        QueryResponse(**result)
+
+
+@pytest.mark.asyncio
+async def test_handle_query_reuses_cached_response(mock_redis):
+    """Identical prompts are answered from the response cache"""
+    with patch("google.generativeai.GenerativeModel") as mock_model:
+        mock_response = Mock()
+        mock_response.text = "PLAN:\nCached plan\n\nEXPLANATION:\nCached explanation\n"
+        mock_model.return_value.generate_content.return_value = mock_response
+
+        # /query builds a fresh AgentService per request
+        first = await AgentService(mock_redis).handle_query(
+            session_id="test-session", query="Same query"
+        )
+        second = await AgentService(mock_redis).handle_query(
+            session_id="test-session", query="Same query"
+        )
+
+        assert first["plan"] == second["plan"] == "Cached plan"
+        mock_model.return_value.generate_content.assert_called_once()
+        mock_redis.set_llm_response.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_handle_query_failure_matches_schema(mock_redis):
+    """Failed queries still produce a QueryResponse-shaped payload"""
+    with patch("google.generativeai.GenerativeModel") as mock_model:
+        mock_model.return_value.generate_content.side_effect = RuntimeError("boom")
+
+        agent = AgentService(mock_redis)
+        result = await agent.handle_query(session_id="test-session", query="Test query")
+
+        assert result["status"] == "failed"
+        assert result["error"] == "boom"
+        assert set(result) <= set(QueryResponse.model_fields)
+        QueryResponse(**result)
 
 
 @pytest.mark.asyncio
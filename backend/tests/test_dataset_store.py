@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+from app.services.dataset_store import downcast_dtypes
+
+
+def test_downcast_keeps_an_int32_floor():
+    """Small integers stop at int32, so downstream arithmetic can't wrap"""
+    df = pd.DataFrame(
+        {
+            "small": np.array([1, 2, 100], dtype=np.int64),
+            "unsigned": np.array([0, 200, 255], dtype=np.uint8),
+            "large": np.array([0, 1, 2**40], dtype=np.int64),
+            "exact": [0.5, 1.25, np.nan],
+            "lossy": [0.1, 0.2, 0.3],
+        }
+    )
+
+    downcast_dtypes(df)
+
+    assert df["small"].dtype == np.int32
+    assert df["unsigned"].dtype == np.int32
+    assert df["large"].dtype == np.int64
+    assert df["exact"].dtype == np.float32
+    assert df["lossy"].dtype == np.float64
+    assert (df["small"] * 1000).max() == 100_000
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.eda_engine import EDAEngine
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 200
+    df = pd.DataFrame(
+        {
+            "num": rng.normal(size=n),
+            "skewed": rng.exponential(size=n) ** 3,
+            "const": np.ones(n),
+            "color": rng.choice(["red", "green", "blue"], n).astype(object),
+            "mostly_missing": np.where(rng.random(n) < 0.8, np.nan, 1.0),
+        }
+    )
+    df.loc[::10, "num"] = np.nan
+    return df
+
+
+def test_full_analysis_runs_every_section(frame):
+    """Every sub-analysis exists and the report keeps its documented order"""
+    results = EDAEngine(max_workers=2).full_analysis(frame)
+
+    assert list(results) == [
+        "summary",
+        "data_types",
+        "missing_data",
+        "statistics",
+        "distributions",
+        "correlations",
+        "categorical_analysis",
+        "outliers",
+        "data_quality",
+        "normality_tests",
+        "recommendations",
+    ]
+    assert results["summary"]["rows"] == len(frame)
+    assert results["missing_data"]["columns"][0]["column"] == "mostly_missing"
+    assert results["statistics"]["num"]["count"] == 180
+    assert results["distributions"]["skewed"]["shape"] == "right_skewed"
+    assert results["categorical_analysis"]["color"]["unique_values"] == 3
+    assert "const" not in results["normality_tests"]
+    assert not results["normality_tests"]["skewed"]["is_normal"]
+
+    issues = {(i["column"], i["issue"]) for i in results["data_quality"]["issues"]}
+    assert ("const", "constant") in issues
+    assert ("mostly_missing", "high_missing") in issues
+    assert (
+        "Apply a log or power transform to skewed columns: skewed"
+        in results["recommendations"]
+    )
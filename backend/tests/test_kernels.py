@@ -0,0 +1,15 @@
+import numpy as np
+import pandas as pd
+from app.utils.kernels import correlation_matrix
+
+
+def test_correlation_matrix_matches_pandas():
+    """The GEMM path agrees with DataFrame.corr(), constant columns included"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(300, 4)), columns=list("abcd"))
+    df["e"] = 2 * df["a"] + rng.normal(scale=0.1, size=len(df))
+    df["const"] = 3.0
+
+    pd.testing.assert_frame_equal(
+        correlation_matrix(df), df.corr(), check_dtype=False, atol=1e-5
+    )
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.ml_engine import MLEngine
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setenv("ML_CACHE_DIR", str(tmp_path / "cache"))
+    return MLEngine()
+
+
+@pytest.mark.parametrize("task_type", ["classification", "regression"])
+def test_train_all_models_on_mostly_zero_features(engine, task_type):
+    """Mostly-zero feature matrices train as CSR without aborting the run"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        (rng.random((120, 8)) < 0.2).astype(int), columns=[f"f{i}" for i in range(8)]
+    )
+    if task_type == "classification":
+        df["target"] = (df["f0"] | df["f1"]).astype(int)
+    else:
+        df["target"] = df.sum(axis=1) + rng.normal(0, 0.1, len(df))
+
+    result = engine.train_all_models(
+        df, "target", task_type=task_type, use_gpu=False, cv_folds=3
+    )
+
+    assert result["models"]
+    assert result["best_model_name"] is not None
+    # Linear-kernel SVMs fitted on CSR expose a sparse coef_
+    svm = "SVM (Linear)" if task_type == "classification" else "SVR (Linear)"
+    entry = next(m for m in result["models"] if m["type"] == svm)
+    assert entry["feature_importance"]
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.preprocessing import DataPreprocessor
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 80
+    df = pd.DataFrame(
+        {
+            "num": rng.normal(size=n),
+            "count": rng.integers(0, 10, n).astype(float),
+            "color": rng.choice(["red", "green", "blue"], n).astype(object),
+            "city": rng.choice([f"c{i}" for i in range(15)], n).astype(object),
+            "target": rng.integers(0, 2, n),
+        }
+    )
+    df.loc[::7, "num"] = np.nan
+    df.loc[::5, "color"] = np.nan
+    df.loc[::9, "city"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize(
+    "handle_missing", ["none", "auto", "mean", "median", "most_frequent"]
+)
+@pytest.mark.parametrize("encode", ["auto", "label", "onehot", "frequency", "target"])
+def test_compiled_transform_matches_transform(frame, handle_missing, encode):
+    """The specialized transform reproduces transform(), NaN categories included"""
+    preprocessor = DataPreprocessor()
+    preprocessor.fit_transform(
+        frame,
+        target_column="target",
+        handle_missing=handle_missing,
+        encode_categorical=encode,
+    )
+
+    new = frame.head(30)
+    pd.testing.assert_frame_equal(
+        preprocessor.compiled_transform()(new),
+        preprocessor.transform(new),
+        check_dtype=False,
+    )
+
+
+def test_clip_outliers_on_float_frame():
+    """Clipping works when the numeric block comes back as a read-only view"""
+    df = pd.DataFrame({"a": [1.0, 2.0, 3.0, 100.0], "b": [0.5, 0.6, 0.7, -50.0]})
+
+    result = DataPreprocessor().fit_transform(
+        df, handle_missing="none", handle_outliers="clip", scale_features="none"
+    )
+
+    assert result["data"]["a"].max() < 100.0
+    assert result["data"]["b"].min() > -50.0